@@ -0,0 +1,31 @@
+"""add_user_words_due_review_index
+
+Revision ID: 4c1e9a7d2b10
+Revises: 7f8ff49b838b
+Create Date: 2026-10-17 09:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4c1e9a7d2b10"
+down_revision: Union[str, None] = "7f8ff49b838b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Btree ASC order puts NULLs last, matching ORDER BY next_review ASC NULLS LAST, id
+    op.create_index(
+        "ix_user_words_user_id_next_review",
+        "user_words",
+        ["user_id", "next_review", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_user_words_user_id_next_review", table_name="user_words")
@@ -0,0 +1,36 @@
+"""add_words_trigram_search_indexes
+
+Revision ID: 8d2f6b3e1a47
+Revises: 4c1e9a7d2b10
+Create Date: 2026-10-17 09:30:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8d2f6b3e1a47"
+down_revision: Union[str, None] = "4c1e9a7d2b10"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match src.db.functions.folded() exactly, or the planner will not use the indexes
+FOLDED_SWEDISH = "translate(lower(swedish), 'åäöéü', 'aaoeu')"
+FOLDED_ENGLISH = "translate(lower(english), 'åäöéü', 'aaoeu')"
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        f"CREATE INDEX ix_words_swedish_trgm ON words USING gin ({FOLDED_SWEDISH} gin_trgm_ops)"
+    )
+    op.execute(
+        f"CREATE INDEX ix_words_english_trgm ON words USING gin ({FOLDED_ENGLISH} gin_trgm_ops)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_words_english_trgm", table_name="words")
+    op.drop_index("ix_words_swedish_trgm", table_name="words")
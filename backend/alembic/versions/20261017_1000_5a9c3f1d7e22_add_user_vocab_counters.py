@@ -0,0 +1,46 @@
+"""add_user_vocab_counters
+
+Revision ID: 5a9c3f1d7e22
+Revises: 8d2f6b3e1a47
+Create Date: 2026-10-17 10:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5a9c3f1d7e22"
+down_revision: Union[str, None] = "8d2f6b3e1a47"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "user_vocab_counters",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("word_count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("user_id", "status"),
+    )
+
+    # Backfill from the existing vocabulary
+    op.execute(
+        """
+        INSERT INTO user_vocab_counters (user_id, status, word_count)
+        SELECT user_id, status, count(*)
+        FROM user_words
+        GROUP BY user_id, status
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("user_vocab_counters")
@@ -0,0 +1,58 @@
+"""add_words_natural_key_index
+
+Revision ID: 2e7b9d4c6f18
+Revises: 5a9c3f1d7e22
+Create Date: 2026-10-17 10:30:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "2e7b9d4c6f18"
+down_revision: Union[str, None] = "5a9c3f1d7e22"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Groups of words that would collide on the new unique index
+DUPLICATE_WORDS = """
+    SELECT swedish, coalesce(part_of_speech, '') AS part_of_speech, count(*) AS copies,
+        min(id) AS first_id
+    FROM words
+    GROUP BY swedish, coalesce(part_of_speech, '')
+    HAVING count(*) > 1
+    ORDER BY swedish
+"""
+REPORTED_DUPLICATES = 50
+
+
+def upgrade() -> None:
+    # Homographs and their review history are real data: refuse rather than
+    # merge them, and let the operator decide
+    duplicates = op.get_bind().execute(sa.text(DUPLICATE_WORDS)).all()
+    if duplicates:
+        report = "\n".join(
+            f"  {swedish!r} ({part_of_speech or 'no part of speech'}): "
+            f"{copies} rows, first id {first_id}"
+            for swedish, part_of_speech, copies, first_id in duplicates[:REPORTED_DUPLICATES]
+        )
+        more = len(duplicates) - REPORTED_DUPLICATES
+        if more > 0:
+            report += f"\n  ... and {more} more"
+        raise RuntimeError(
+            f"{len(duplicates)} (swedish, part_of_speech) pairs are used by more than one "
+            f"word; resolve them before creating ix_words_swedish_part_of_speech:\n{report}"
+        )
+    op.create_index(
+        "ix_words_swedish_part_of_speech",
+        "words",
+        ["swedish", sa.text("coalesce(part_of_speech, '')")],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_words_swedish_part_of_speech", table_name="words")
@@ -0,0 +1,53 @@
+"""add_user_words_user_id_word_id_unique
+
+Revision ID: 9b4e1f7a3c05
+Revises: 2e7b9d4c6f18
+Create Date: 2026-10-17 11:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9b4e1f7a3c05"
+down_revision: Union[str, None] = "2e7b9d4c6f18"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (user_id, word_id) pairs that would collide on the new constraint
+DUPLICATE_USER_WORDS = """
+    SELECT user_id, word_id, count(*) AS copies, min(id) AS first_id
+    FROM user_words
+    GROUP BY user_id, word_id
+    HAVING count(*) > 1
+    ORDER BY user_id, word_id
+"""
+REPORTED_DUPLICATES = 50
+
+
+def upgrade() -> None:
+    # Each copy carries its own review counters and SRS state: refuse rather
+    # than pick one, and let the operator merge them
+    duplicates = op.get_bind().execute(sa.text(DUPLICATE_USER_WORDS)).all()
+    if duplicates:
+        report = "\n".join(
+            f"  user {user_id}, word {word_id}: {copies} rows, first id {first_id}"
+            for user_id, word_id, copies, first_id in duplicates[:REPORTED_DUPLICATES]
+        )
+        more = len(duplicates) - REPORTED_DUPLICATES
+        if more > 0:
+            report += f"\n  ... and {more} more"
+        raise RuntimeError(
+            f"{len(duplicates)} (user_id, word_id) pairs have more than one user_words row; "
+            f"resolve them before creating user_words_user_id_word_id_unique:\n{report}"
+        )
+    op.create_unique_constraint(
+        "user_words_user_id_word_id_unique", "user_words", ["user_id", "word_id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("user_words_user_id_word_id_unique", "user_words", type_="unique")
@@ -0,0 +1,88 @@
+"""add_review_events
+
+Revision ID: 6f2a8c4e9d13
+Revises: 9b4e1f7a3c05
+Create Date: 2026-10-17 11:30:00.000000
+"""
+
+from datetime import date, datetime, timezone
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "6f2a8c4e9d13"
+down_revision: Union[str, None] = "9b4e1f7a3c05"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Monthly partitions created up front; the maintenance job keeps creating
+# them ahead (python -m src.scripts.maintain_review_events)
+INITIAL_PARTITION_MONTHS = 3
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "review_events",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("word_id", sa.Integer(), nullable=False),
+        sa.Column("reviewed_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("quality", sa.Integer(), nullable=False),
+        sa.Column("response_ms", sa.Integer(), nullable=True),
+        sa.Column("prev_status", sa.String(length=20), nullable=False),
+        sa.Column("prev_ease_factor", sa.Float(), nullable=False),
+        sa.Column("prev_interval_days", sa.Integer(), nullable=False),
+        sa.Column("prev_repetition_number", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("ease_factor", sa.Float(), nullable=False),
+        sa.Column("interval_days", sa.Integer(), nullable=False),
+        sa.Column("repetition_number", sa.Integer(), nullable=False),
+        postgresql_partition_by="RANGE (reviewed_at)",
+    )
+    op.create_index(
+        "ix_review_events_user_id_reviewed_at",
+        "review_events",
+        ["user_id", "reviewed_at"],
+    )
+
+    if op.get_bind().dialect.name == "postgresql":
+        # Catches events outside every monthly partition instead of failing the insert
+        op.execute("CREATE TABLE review_events_default PARTITION OF review_events DEFAULT")
+        current = datetime.now(timezone.utc).date().replace(day=1)
+        for offset in range(INITIAL_PARTITION_MONTHS):
+            month = _add_months(current, offset)
+            op.execute(
+                f"CREATE TABLE review_events_p{month:%Y_%m} PARTITION OF review_events "
+                f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') "
+                f"TO ('{_add_months(month, 1).isoformat()} 00:00:00+00')"
+            )
+
+    op.create_table(
+        "review_daily_rollups",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("reviews", sa.Integer(), nullable=False),
+        sa.Column("correct", sa.Integer(), nullable=False),
+        sa.Column("quality_sum", sa.Integer(), nullable=False),
+        sa.Column("timed_reviews", sa.Integer(), nullable=False),
+        sa.Column("response_ms_sum", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["user_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("user_id", "day"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("review_daily_rollups")
+    # Dropping the partitioned parent drops every partition with it
+    op.drop_index("ix_review_events_user_id_reviewed_at", table_name="review_events")
+    op.drop_table("review_events")
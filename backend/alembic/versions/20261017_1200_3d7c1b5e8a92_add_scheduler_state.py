@@ -0,0 +1,33 @@
+"""add_scheduler_state
+
+Revision ID: 3d7c1b5e8a92
+Revises: 6f2a8c4e9d13
+Create Date: 2026-10-17 12:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3d7c1b5e8a92"
+down_revision: Union[str, None] = "6f2a8c4e9d13"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Nullable columns without defaults: no table rewrite on PostgreSQL
+    op.add_column("users", sa.Column("scheduler", sa.String(length=10), nullable=True))
+    op.add_column("users", sa.Column("scheduler_weights", sa.JSON(), nullable=True))
+    op.add_column("user_words", sa.Column("stability", sa.Float(), nullable=True))
+    op.add_column("user_words", sa.Column("difficulty", sa.Float(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("user_words", "difficulty")
+    op.drop_column("user_words", "stability")
+    op.drop_column("users", "scheduler_weights")
+    op.drop_column("users", "scheduler")
@@ -0,0 +1,37 @@
+"""add_chat_context_window
+
+Revision ID: 1f6d4a8b2c37
+Revises: 3d7c1b5e8a92
+Create Date: 2026-10-17 12:30:00.000000
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "1f6d4a8b2c37"
+down_revision: Union[str, None] = "3d7c1b5e8a92"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Nullable columns without defaults: no table rewrite on PostgreSQL
+    op.add_column("chat_sessions", sa.Column("summary", sa.Text(), nullable=True))
+    op.add_column("chat_sessions", sa.Column("summary_through_id", sa.Integer(), nullable=True))
+    # Latest messages of a session by keyset on id
+    op.create_index(
+        "ix_chat_messages_session_id_id",
+        "chat_messages",
+        ["session_id", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_chat_messages_session_id_id", table_name="chat_messages")
+    op.drop_column("chat_sessions", "summary_through_id")
+    op.drop_column("chat_sessions", "summary")
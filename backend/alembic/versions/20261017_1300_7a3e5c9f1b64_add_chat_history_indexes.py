@@ -0,0 +1,39 @@
+"""add_chat_history_indexes
+
+Revision ID: 7a3e5c9f1b64
+Revises: 1f6d4a8b2c37
+Create Date: 2026-10-17 13:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7a3e5c9f1b64"
+down_revision: Union[str, None] = "1f6d4a8b2c37"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Message history pages: equality on session_id, then (created_at, id) DESC
+    op.create_index(
+        "ix_chat_messages_session_id_created_at_id",
+        "chat_messages",
+        ["session_id", "created_at", "id"],
+        unique=False,
+    )
+    # Session list: equality on user_id, then (updated_at, id) DESC
+    op.create_index(
+        "ix_chat_sessions_user_id_updated_at",
+        "chat_sessions",
+        ["user_id", "updated_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_chat_sessions_user_id_updated_at", table_name="chat_sessions")
+    op.drop_index("ix_chat_messages_session_id_created_at_id", table_name="chat_messages")
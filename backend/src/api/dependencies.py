@@ -2,6 +2,7 @@
 API dependencies for authentication and database access.
 """
 
+from collections.abc import AsyncGenerator
 from typing import Annotated
 
 from fastapi import Depends, Header
@@ -9,9 +10,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.exceptions import CredentialsException
 from src.core.security import decode_token
-from src.db.session import get_db
+from src.db.routing import bind_session_user
+from src.db.session import get_db, read_session_maker_for
 from src.models.user import User
-from src.services.auth import get_user_by_id
+from src.services.auth import get_cached_user
 
 
 async def get_current_user(
@@ -39,16 +41,49 @@ async def get_current_user(
     if not user_id:
         raise CredentialsException("Invalid token payload")
 
-    user = await get_user_by_id(db, int(user_id))
+    user = await get_cached_user(db, str(user_id))
     if not user:
         raise CredentialsException("User not found")
 
     if not user.is_active:
         raise CredentialsException("User account is disabled")
 
+    # Writes made through this session pin the user to the primary
+    bind_session_user(db, str(user.id))
     return user
 
 
+def get_token_subject(
+    authorization: Annotated[str | None, Header()] = None,
+) -> str | None:
+    """User id from a valid access token, or None (never raises)."""
+    if not authorization:
+        return None
+    parts = authorization.split()
+    if len(parts) != 2 or parts[0].lower() != "bearer":
+        return None
+    payload = decode_token(parts[1])
+    if not payload or payload.get("type") != "access":
+        return None
+    subject = payload.get("sub")
+    return str(subject) if subject else None
+
+
+async def get_read_db(
+    user_id: Annotated[str | None, Depends(get_token_subject)],
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Read-only session for the caller, on the replica when one is configured.
+
+    Users who wrote within the read-your-writes window stay on the primary.
+    The session is never committed.
+    """
+    session_maker = await read_session_maker_for(user_id)
+    async with session_maker() as session:
+        yield session
+
+
 # Type alias for dependency injection
 CurrentUser = Annotated[User, Depends(get_current_user)]
 DbSession = Annotated[AsyncSession, Depends(get_db)]
+ReadDbSession = Annotated[AsyncSession, Depends(get_read_db)]
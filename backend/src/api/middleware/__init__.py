@@ -1 +1,4 @@
 # API middleware
+from src.api.middleware.timing import RequestTimingMiddleware, query_budget, route_metrics
+
+__all__ = ["RequestTimingMiddleware", "query_budget", "route_metrics"]
@@ -0,0 +1,176 @@
+"""
+Request timing middleware: Server-Timing headers and per-route metrics.
+
+Every HTTP request is timed end to end together with the SQL statements it
+issues (see src.db.query_stats). The totals are sent back as a Server-Timing
+header and aggregated per route template in route_metrics, served by
+/health/routes.
+"""
+
+import logging
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.config import get_settings
+from src.core.metrics import Counter, Histogram
+from src.core.prometheus import REQUESTS_IN_PROGRESS, observe_request
+from src.db.query_stats import QueryStats, current_query_stats, track_queries
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+class RouteMetrics:
+    """Latency, DB time and statement counts for one route."""
+
+    def __init__(self) -> None:
+        self.requests = Counter()
+        self.errors = Counter()
+        self.statements = Counter()
+        self.duration = Histogram()
+        self.db_time = Histogram()
+        self.max_statements = 0
+
+    def observe(self, duration: float, stats: QueryStats, status_code: int) -> None:
+        """Record one finished request."""
+        self.requests.inc()
+        if status_code >= 500:
+            self.errors.inc()
+        self.statements.inc(stats.statements)
+        self.duration.observe(duration)
+        self.db_time.observe(stats.db_seconds)
+        self.max_statements = max(self.max_statements, stats.statements)
+
+    def report(self) -> dict[str, Any]:
+        """Counters plus duration and DB time histograms."""
+        requests = self.requests.value
+        return {
+            "requests": requests,
+            "errors": self.errors.value,
+            "statements_per_request": self.statements.value / requests if requests else 0.0,
+            "max_statements": self.max_statements,
+            "duration_seconds": self.duration.snapshot(),
+            "db_seconds": self.db_time.snapshot(),
+        }
+
+
+class RouteMetricsRegistry:
+    """RouteMetrics keyed by "METHOD /route/template"."""
+
+    def __init__(self) -> None:
+        self._routes: dict[str, RouteMetrics] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> RouteMetrics:
+        """Metrics for a route, created on first use."""
+        metrics = self._routes.get(key)
+        if metrics is None:
+            with self._lock:
+                metrics = self._routes.setdefault(key, RouteMetrics())
+        return metrics
+
+    def report(self) -> dict[str, dict[str, Any]]:
+        """Report of every route seen so far."""
+        return {key: metrics.report() for key, metrics in sorted(self._routes.items())}
+
+    def clear(self) -> None:
+        """Forget all collected metrics."""
+        with self._lock:
+            self._routes.clear()
+
+
+route_metrics = RouteMetricsRegistry()
+
+
+def route_template(scope: Scope) -> str:
+    """Route template of a handled request, e.g. "/api/v1/vocabulary/review/{user_word_id}"."""
+    route = scope.get("route")
+    path_format: str | None = getattr(route, "path_format", None)
+    if route is None or path_format is None:
+        return UNMATCHED_ROUTE
+    # Depending on the FastAPI version, routes of included routers know their
+    # path with or without the router prefixes; the prefix is whatever part of
+    # the requested path the route's own pattern does not match
+    path: str = scope["path"]
+    for start in range(len(path)):
+        if path[start] == "/" and route.path_regex.match(path[start:]):
+            return path[:start] + path_format
+    return path_format
+
+
+def server_timing(duration: float, stats: QueryStats) -> str:
+    """Server-Timing header value for the app and DB time."""
+    return (
+        f"app;dur={duration * 1000:.1f}, "
+        f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.statements} queries"'
+    )
+
+
+def query_budget(statements: int) -> Callable[[], Awaitable[None]]:
+    """
+    Route dependency overriding the request query budget.
+
+    Usage: @router.get(..., dependencies=[Depends(query_budget(50))])
+    """
+
+    async def set_query_budget() -> None:
+        stats = current_query_stats.get()
+        if stats is not None:
+            stats.budget = statements
+
+    return set_query_budget
+
+
+class RequestTimingMiddleware:
+    """Time requests and their SQL, add Server-Timing and record route metrics."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        with track_queries(settings.request_query_budget) as stats:
+
+            async def send_with_timing(message: Message) -> None:
+                nonlocal status_code
+                if message["type"] == "http.response.start":
+                    status_code = message["status"]
+                    headers = list(message.get("headers", []))
+                    headers.append(
+                        (
+                            b"server-timing",
+                            server_timing(time.perf_counter() - started, stats).encode(),
+                        )
+                    )
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            REQUESTS_IN_PROGRESS.inc()
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                REQUESTS_IN_PROGRESS.dec()
+                duration = time.perf_counter() - started
+                method, route = scope["method"], route_template(scope)
+                key = f"{method} {route}"
+                route_metrics.get(key).observe(duration, stats, status_code)
+                observe_request(method, route, status_code, duration, stats.db_seconds)
+                if stats.budget is not None and stats.statements > stats.budget:
+                    logger.warning(
+                        "%s issued %d SQL statements (budget %d)",
+                        key,
+                        stats.statements,
+                        stats.budget,
+                    )
@@ -1,6 +1,8 @@
 # API routes
 from src.api.routes.auth import router as auth_router
+from src.api.routes.chat import router as chat_router
 from src.api.routes.health import router as health_router
+from src.api.routes.metrics import router as metrics_router
 from src.api.routes.vocabulary import router as vocabulary_router
 
-__all__ = ["auth_router", "health_router", "vocabulary_router"]
+__all__ = ["auth_router", "chat_router", "health_router", "metrics_router", "vocabulary_router"]
@@ -18,6 +18,7 @@ from src.services.auth import (
     authenticate_user,
     create_tokens,
     create_user,
+    deactivate_user,
     refresh_access_token,
     update_user,
 )
@@ -62,6 +63,13 @@ async def update_current_user(
     return UserResponse.model_validate(updated_user)
 
 
+@router.delete("/me")
+async def deactivate_current_user(current_user: CurrentUser, db: DbSession) -> dict[str, str]:
+    """Deactivate current user's account."""
+    await deactivate_user(db, current_user)
+    return {"message": "Account deactivated"}
+
+
 @router.get("/settings/options", response_model=SettingsOptions)
 async def get_settings_options() -> SettingsOptions:
     """Get available settings options (AI providers, timezones)."""
@@ -0,0 +1,154 @@
+"""
+Chat API routes.
+"""
+
+from collections.abc import AsyncIterator
+
+from fastapi import APIRouter, Query, Response
+from fastapi.responses import StreamingResponse
+
+from src.api.dependencies import CurrentUser, DbSession
+from src.schemas.chat import (
+    BotInfo,
+    ChatResponse,
+    ChatSessionCreate,
+    ChatSessionResponse,
+    MessageCreate,
+    MessageResponse,
+)
+from src.services.ai_client import ai_provider_for_user
+from src.services.chat import (
+    BOTS,
+    ChatCursor,
+    complete_chat_reply,
+    create_chat_session,
+    get_chat_session,
+    list_chat_messages,
+    list_chat_sessions,
+    stream_chat_reply,
+)
+
+router = APIRouter(prefix="/chat", tags=["Chat"])
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    # Keep reverse proxies (nginx) from buffering the stream
+    "X-Accel-Buffering": "no",
+}
+
+
+@router.get("/bots", response_model=list[BotInfo])
+async def list_bots() -> list[BotInfo]:
+    """Available chatbots."""
+    return list(BOTS.values())
+
+
+@router.get("/sessions", response_model=list[ChatSessionResponse])
+async def list_my_chat_sessions(
+    db: DbSession,
+    current_user: CurrentUser,
+    response: Response,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None, description="X-Next-Cursor value from the previous page"),
+) -> list[ChatSessionResponse]:
+    """
+    Current user's chat sessions, most recently active first.
+
+    When more sessions may follow, the X-Next-Cursor response header holds
+    the cursor for the next page.
+    """
+    before = ChatCursor.decode(cursor) if cursor else None
+    sessions = await list_chat_sessions(db, current_user.id, limit=limit, before=before)
+    if len(sessions) == limit:
+        last = sessions[-1]
+        response.headers[NEXT_CURSOR_HEADER] = ChatCursor(at=last.updated_at, id=last.id).encode()
+    return [ChatSessionResponse.model_validate(chat_session) for chat_session in sessions]
+
+
+@router.post("/sessions", response_model=ChatSessionResponse)
+async def start_chat_session(
+    session_data: ChatSessionCreate,
+    db: DbSession,
+    current_user: CurrentUser,
+) -> ChatSessionResponse:
+    """Start a chat session with a bot."""
+    chat_session = await create_chat_session(db, current_user.id, session_data)
+    return ChatSessionResponse.model_validate(chat_session)
+
+
+@router.get("/sessions/{session_id}", response_model=ChatSessionResponse)
+async def get_my_chat_session(
+    session_id: int,
+    db: DbSession,
+    current_user: CurrentUser,
+) -> ChatSessionResponse:
+    """A chat session (messages are paged via /sessions/{id}/messages)."""
+    chat_session = await get_chat_session(db, current_user.id, session_id)
+    return ChatSessionResponse.model_validate(chat_session)
+
+
+@router.get("/sessions/{session_id}/messages", response_model=list[MessageResponse])
+async def list_my_chat_messages(
+    session_id: int,
+    db: DbSession,
+    current_user: CurrentUser,
+    response: Response,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = Query(None, description="X-Next-Cursor value from the previous page"),
+) -> list[MessageResponse]:
+    """
+    A chat session's messages, newest first.
+
+    When older messages may follow, the X-Next-Cursor response header holds
+    the cursor for the next page.
+    """
+    await get_chat_session(db, current_user.id, session_id)
+    before = ChatCursor.decode(cursor) if cursor else None
+    messages = await list_chat_messages(db, session_id, limit=limit, before=before)
+    if len(messages) == limit:
+        last = messages[-1]
+        response.headers[NEXT_CURSOR_HEADER] = ChatCursor(at=last.created_at, id=last.id).encode()
+    return [MessageResponse.model_validate(message) for message in messages]
+
+
+@router.post("/sessions/{session_id}/messages", response_model=ChatResponse)
+async def send_chat_message(
+    session_id: int,
+    message: MessageCreate,
+    current_user: CurrentUser,
+) -> ChatResponse:
+    """Send a message and wait for the whole reply."""
+    return await complete_chat_reply(
+        current_user, session_id, message.content, ai_provider_for_user(current_user)
+    )
+
+
+@router.post("/sessions/{session_id}/messages/stream")
+async def stream_chat_message(
+    session_id: int,
+    message: MessageCreate,
+    db: DbSession,
+    current_user: CurrentUser,
+) -> StreamingResponse:
+    """
+    Send a message and stream the reply as Server-Sent Events.
+
+    Events: start (message ids), token (text chunk), then done (the stored
+    assistant message) or error.
+    """
+    # Fail with a plain 404 before the stream starts
+    await get_chat_session(db, current_user.id, session_id)
+    # The reply uses its own session; release this one's connection now
+    # instead of holding it for the whole stream
+    await db.commit()
+    replies = stream_chat_reply(
+        current_user, session_id, message.content, ai_provider_for_user(current_user)
+    )
+
+    async def encode() -> AsyncIterator[str]:
+        async for reply_event in replies:
+            yield reply_event.to_sse()
+
+    return StreamingResponse(encode(), media_type="text/event-stream", headers=SSE_HEADERS)
@@ -2,7 +2,18 @@
 Health check routes.
 """
 
-from fastapi import APIRouter
+import logging
+import time
+from typing import Any
+
+from fastapi import APIRouter, Response, status
+from sqlalchemy import text
+
+from src.api.middleware import route_metrics
+from src.db.metrics import metrics_report
+from src.db.session import engine, pool_metrics, read_engine, read_pool_metrics
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["Health"])
 
@@ -11,3 +22,32 @@ router = APIRouter(tags=["Health"])
 async def health_check() -> dict:
     """Health check endpoint."""
     return {"status": "healthy", "service": "svenska-lara-api"}
+
+
+@router.get("/health/db")
+async def database_health_check(response: Response) -> dict[str, Any]:
+    """Database connectivity, connection pool state and checkout latency."""
+    started = time.perf_counter()
+    try:
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+        db_status = "healthy"
+    except Exception:
+        logger.exception("Database health check failed")
+        db_status = "unhealthy"
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+
+    report = {
+        "status": db_status,
+        "ping_seconds": time.perf_counter() - started,
+        **metrics_report(engine, pool_metrics),
+    }
+    if read_engine is not engine:
+        report["replica"] = metrics_report(read_engine, read_pool_metrics)
+    return report
+
+
+@router.get("/health/routes")
+async def route_metrics_report() -> dict[str, dict[str, Any]]:
+    """Per-route request latency, DB time and SQL statement counts."""
+    return route_metrics.report()
@@ -0,0 +1,77 @@
+"""
+Prometheus scrape endpoint.
+"""
+
+from fastapi import APIRouter, Response
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import QueuePool
+
+from src.core.cache import CacheStats
+from src.core.prometheus import (
+    CACHE_ENTRIES,
+    CACHE_HIT_RATIO,
+    CACHE_HITS,
+    CACHE_MISSES,
+    DB_POOL_CONNECTIONS,
+    METRICS_CONTENT_TYPE,
+    PASSWORD_HASH_QUEUE_DEPTH,
+    gauge_sampler,
+    render_metrics,
+)
+from src.core.security import password_hash_pool, verified_token_cache
+from src.db.routing import primary_pins
+from src.db.session import engine, read_engine
+from src.services.auth import user_cache
+from src.services.forecast import forecast_cache
+from src.services.reply_cache import reply_cache
+from src.services.review_session import review_sessions
+
+router = APIRouter(tags=["Metrics"])
+
+
+def _sample_pool(name: str, pool_engine: AsyncEngine) -> None:
+    pool = pool_engine.sync_engine.pool
+    if not isinstance(pool, QueuePool):
+        return
+    DB_POOL_CONNECTIONS.labels(name, "checked_out").set(pool.checkedout())
+    DB_POOL_CONNECTIONS.labels(name, "idle").set(pool.checkedin())
+    DB_POOL_CONNECTIONS.labels(name, "overflow").set(max(pool.overflow(), 0))
+
+
+@gauge_sampler.register
+def sample_db_pools() -> None:
+    """Connection pool usage of the primary (and replica) engine."""
+    _sample_pool("primary", engine)
+    if read_engine is not engine:
+        _sample_pool("replica", read_engine)
+
+
+@gauge_sampler.register
+def sample_password_hash_queue() -> None:
+    """bcrypt jobs in flight."""
+    PASSWORD_HASH_QUEUE_DEPTH.set(password_hash_pool.queue_depth)
+
+
+@gauge_sampler.register
+def sample_caches() -> None:
+    """Hit and miss counts of the in-process caches."""
+    caches: dict[str, CacheStats] = {
+        "user": user_cache.stats(),
+        "verified_token": verified_token_cache.stats(),
+        "review_session": review_sessions.stats(),
+        "forecast": forecast_cache.stats(),
+        "primary_pin": primary_pins.stats(),
+        "chat_reply": reply_cache.stats(),
+    }
+    for name, stats in caches.items():
+        CACHE_HITS.labels(name).set(stats.hits)
+        CACHE_MISSES.labels(name).set(stats.misses)
+        CACHE_ENTRIES.labels(name).set(stats.size)
+        CACHE_HIT_RATIO.labels(name).set(stats.hit_ratio)
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """Metrics in the Prometheus text exposition format."""
+    gauge_sampler.sample()
+    return Response(content=render_metrics(), media_type=METRICS_CONTENT_TYPE)
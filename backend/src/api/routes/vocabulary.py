@@ -2,21 +2,41 @@
 Vocabulary API routes.
 """
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Response
 
-from src.api.dependencies import CurrentUser, DbSession
+from src.api.dependencies import CurrentUser, DbSession, ReadDbSession
 from src.models.word import WordStatus
 from src.schemas.word import (
     ReviewAnswer,
+    ReviewBatch,
+    ReviewBatchItem,
+    ReviewForecast,
     ReviewResponse,
+    ReviewSessionCreate,
+    ReviewSessionProgress,
+    ReviewSessionResponse,
+    UserWordBulkCreate,
+    UserWordBulkResult,
     UserWordCreate,
     UserWordResponse,
     VocabularyStats,
     WordCreate,
     WordResponse,
+    WordSuggestion,
 )
+from src.services.forecast import get_review_forecast
+from src.services.review_session import (
+    answer_review_card,
+    end_review_session,
+    get_review_session,
+    start_review_session,
+)
+from src.services.scheduler import scheduler_for_user
 from src.services.vocabulary import (
+    DueReviewCursor,
     add_word_to_user,
+    add_words_to_user_by_filter,
+    autocomplete_words,
     create_word,
     get_due_reviews,
     get_user_vocabulary,
@@ -25,10 +45,13 @@ from src.services.vocabulary import (
     get_words,
     remove_user_word,
     submit_review,
+    submit_reviews_batch,
 )
 
 router = APIRouter(prefix="/vocabulary", tags=["Vocabulary"])
 
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
 
 # ============================================================================
 # Dictionary Words (public read, admin write)
@@ -37,7 +60,7 @@ router = APIRouter(prefix="/vocabulary", tags=["Vocabulary"])
 
 @router.get("/words", response_model=list[WordResponse])
 async def list_words(
-    db: DbSession,
+    db: ReadDbSession,
     cefr_level: str | None = Query(None, description="Filter by CEFR level (A1-C2)"),
     part_of_speech: str | None = Query(None, description="Filter by part of speech"),
     search: str | None = Query(None, description="Search in Swedish/English"),
@@ -56,6 +79,20 @@ async def list_words(
     return [WordResponse.model_validate(w) for w in words]
 
 
+@router.get("/words/autocomplete", response_model=list[WordSuggestion])
+async def autocomplete_dictionary_words(
+    db: DbSession,
+    q: str = Query(..., min_length=1, max_length=100, description="Swedish or English prefix"),
+    limit: int = Query(10, ge=1, le=50),
+) -> list[WordSuggestion]:
+    """
+    Prefix autocomplete served from the in-process dictionary index.
+
+    While the index is first being built, the database word search answers.
+    """
+    return await autocomplete_words(db, q, limit=limit)
+
+
 @router.post("/words", response_model=WordResponse)
 async def create_dictionary_word(
     word_data: WordCreate,
@@ -74,7 +111,7 @@ async def create_dictionary_word(
 
 @router.get("/my-words", response_model=list[UserWordResponse])
 async def list_my_words(
-    db: DbSession,
+    db: ReadDbSession,
     current_user: CurrentUser,
     status: WordStatus | None = Query(None, description="Filter by learning status"),
     cefr_level: str | None = Query(None, description="Filter by CEFR level"),
@@ -106,6 +143,17 @@ async def add_word_to_my_vocabulary(
     return UserWordResponse.model_validate(user_word)
 
 
+@router.post("/my-words/bulk", response_model=UserWordBulkResult)
+async def add_words_to_my_vocabulary(
+    filters: UserWordBulkCreate,
+    db: DbSession,
+    current_user: CurrentUser,
+) -> UserWordBulkResult:
+    """Add every dictionary word matching the filters (e.g. a CEFR level)."""
+    added = await add_words_to_user_by_filter(db, current_user.id, filters)
+    return UserWordBulkResult(added=added)
+
+
 @router.get("/my-words/{user_word_id}", response_model=UserWordResponse)
 async def get_my_word(
     user_word_id: int,
@@ -116,6 +164,7 @@ async def get_my_word(
     user_word = await get_user_word(db, current_user.id, user_word_id)
     if not user_word:
         from fastapi import HTTPException
+
         raise HTTPException(status_code=404, detail="Word not found in your vocabulary")
     return UserWordResponse.model_validate(user_word)
 
@@ -130,6 +179,7 @@ async def remove_word_from_my_vocabulary(
     success = await remove_user_word(db, current_user.id, user_word_id)
     if not success:
         from fastapi import HTTPException
+
         raise HTTPException(status_code=404, detail="Word not found in your vocabulary")
     return {"message": "Word removed from vocabulary"}
 
@@ -141,15 +191,40 @@ async def remove_word_from_my_vocabulary(
 
 @router.get("/review", response_model=list[UserWordResponse])
 async def get_words_for_review(
-    db: DbSession,
+    db: ReadDbSession,
     current_user: CurrentUser,
+    response: Response,
     limit: int = Query(20, ge=1, le=50, description="Number of cards to review"),
+    cursor: str | None = Query(None, description="X-Next-Cursor value from the previous page"),
 ) -> list[UserWordResponse]:
-    """Get words due for review."""
-    due_words = await get_due_reviews(db, current_user.id, limit=limit)
+    """
+    Get words due for review.
+
+    When more cards may follow, the X-Next-Cursor response header holds the
+    cursor for the next page.
+    """
+    after = DueReviewCursor.decode(cursor) if cursor else None
+    due_words = await get_due_reviews(db, current_user.id, limit=limit, after=after)
+    if len(due_words) == limit:
+        last = due_words[-1]
+        response.headers[NEXT_CURSOR_HEADER] = DueReviewCursor(
+            next_review=last.next_review, user_word_id=last.id
+        ).encode()
     return [UserWordResponse.model_validate(uw) for uw in due_words]
 
 
+@router.post("/review/batch", response_model=list[ReviewResponse])
+async def submit_word_reviews_batch(
+    batch: ReviewBatch,
+    db: DbSession,
+    current_user: CurrentUser,
+) -> list[ReviewResponse]:
+    """Submit all answers of a review session in one request."""
+    return await submit_reviews_batch(
+        db, current_user.id, batch.reviews, scheduler_for_user(current_user)
+    )
+
+
 @router.post("/review/{user_word_id}", response_model=ReviewResponse)
 async def submit_word_review(
     user_word_id: int,
@@ -158,7 +233,57 @@ async def submit_word_review(
     current_user: CurrentUser,
 ) -> ReviewResponse:
     """Submit a review answer for a word."""
-    return await submit_review(db, current_user.id, user_word_id, answer)
+    return await submit_review(
+        db, current_user.id, user_word_id, answer, scheduler_for_user(current_user)
+    )
+
+
+# ============================================================================
+# Review Sessions
+# ============================================================================
+
+
+@router.post("/review-sessions", response_model=ReviewSessionResponse)
+async def create_review_session(
+    options: ReviewSessionCreate,
+    db: ReadDbSession,
+    current_user: CurrentUser,
+) -> ReviewSessionResponse:
+    """Start a review session and return its first window of cards."""
+    session = await start_review_session(db, current_user.id, options)
+    return session.to_response()
+
+
+@router.get("/review-sessions/{session_id}", response_model=ReviewSessionResponse)
+async def get_review_session_window(
+    session_id: str,
+    current_user: CurrentUser,
+) -> ReviewSessionResponse:
+    """Get the session's progress and its next window of pending cards."""
+    session = await get_review_session(current_user.id, session_id)
+    return session.to_response()
+
+
+@router.post("/review-sessions/{session_id}/answers", response_model=ReviewSessionProgress)
+async def answer_review_session_card(
+    session_id: str,
+    answer: ReviewBatchItem,
+    current_user: CurrentUser,
+) -> ReviewSessionProgress:
+    """Record an answer; nothing is written until the session ends."""
+    return await answer_review_card(current_user.id, session_id, answer)
+
+
+@router.post("/review-sessions/{session_id}/end", response_model=list[ReviewResponse])
+async def finish_review_session(
+    session_id: str,
+    db: DbSession,
+    current_user: CurrentUser,
+) -> list[ReviewResponse]:
+    """End the session and apply all of its answers in one batch."""
+    return await end_review_session(
+        db, current_user.id, session_id, scheduler_for_user(current_user)
+    )
 
 
 # ============================================================================
@@ -168,8 +293,20 @@ async def submit_word_review(
 
 @router.get("/stats", response_model=VocabularyStats)
 async def get_my_vocabulary_stats(
-    db: DbSession,
+    db: ReadDbSession,
     current_user: CurrentUser,
 ) -> VocabularyStats:
     """Get vocabulary statistics for current user."""
     return await get_vocabulary_stats(db, current_user.id)
+
+
+@router.get("/forecast", response_model=ReviewForecast)
+async def get_my_review_forecast(
+    db: ReadDbSession,
+    current_user: CurrentUser,
+    days: int = Query(30, ge=1, le=365),
+    simulate: bool = Query(False, description="Also project future reviews with SM-2"),
+    assumed_quality: int = Query(4, ge=0, le=5, description="Answer quality for simulate"),
+) -> ReviewForecast:
+    """Reviews due per day for the next `days` days, in the user's time zone."""
+    return await get_review_forecast(db, current_user, days, simulate, assumed_quality)
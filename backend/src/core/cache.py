@@ -0,0 +1,375 @@
+"""
+In-process caching primitives.
+
+TTLCache is a thread-safe LRU with per-entry expiry and optional byte cap.
+CacheBackend is the async interface services use, so a shared store can
+replace the in-memory stand-in to share entries across worker processes;
+SQLiteCacheBackend shares them between the workers of one host through a
+local file.
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from typing import Any
+
+from src.core.config import get_settings
+
+settings = get_settings()
+
+
+def value_size(value: Any) -> int:
+    """Approximate size of a cached value in bytes (its JSON encoding)."""
+    if isinstance(value, bytes):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode())
+    return len(json.dumps(value, default=str).encode())
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters for a cache."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    size: int = 0
+    bytes: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Fraction of lookups served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class TTLCache:
+    """
+    Least-recently-used cache whose entries also expire after a TTL.
+
+    With max_bytes, entries are also evicted until their total size (as
+    measured by sizeof) fits; sizes are only computed when a byte cap is set.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        max_bytes: int = 0,
+        sizeof: Callable[[Any], int] = value_size,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self._entries: OrderedDict[Hashable, tuple[float, Any, int]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+
+    def get(self, key: Hashable) -> Any | None:
+        """Return the cached value, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats.misses += 1
+                return None
+            expires_at, value, size = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self._bytes -= size
+                self._stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: float | None = None) -> None:
+        """Store a value, optionally with its own TTL."""
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        if ttl <= 0:
+            return
+        size = self.sizeof(value) if self.max_bytes else 0
+        if size > self.max_bytes > 0:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[2]
+            self._entries[key] = (time.monotonic() + ttl, value, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or (
+                self.max_bytes and self._bytes > self.max_bytes
+            ):
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self._stats.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        """Remove a key if present."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._bytes -= entry[2]
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> CacheStats:
+        """Snapshot of the cache counters."""
+        with self._lock:
+            return CacheStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                evictions=self._stats.evictions,
+                size=len(self._entries),
+                bytes=self._bytes,
+            )
+
+
+class CacheBackend(ABC):
+    """Async key/value cache that may be shared between worker processes."""
+
+    @abstractmethod
+    def __init__(
+        self, max_entries: int, ttl_seconds: float, max_bytes: int = 0, namespace: str = "default"
+    ):
+        """Create a cache; see create_cache_backend for the arguments."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Any | None:
+        """Return the cached value, or None."""
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl_seconds: float | None = None) -> None:
+        """Store a value (backends that share entries must serialize it)."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Invalidate a key."""
+
+    @abstractmethod
+    async def replace(
+        self, key: str, expected: Any, value: Any, ttl_seconds: float | None = None
+    ) -> bool:
+        """
+        Compare-and-set: store value only if the key still holds expected.
+
+        Returns:
+            False if the entry changed, expired or was deleted meanwhile
+        """
+
+    @abstractmethod
+    def stats(self) -> CacheStats:
+        """Hit/miss counters as seen by this process."""
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """Per-process stand-in backed by a TTLCache."""
+
+    def __init__(
+        self, max_entries: int, ttl_seconds: float, max_bytes: int = 0, namespace: str = "default"
+    ):
+        # Every instance is a store of its own, so namespaces never collide
+        self.namespace = namespace
+        self._cache = TTLCache(
+            max_entries=max_entries, ttl_seconds=ttl_seconds, max_bytes=max_bytes
+        )
+
+    async def get(self, key: str) -> Any | None:
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: Any, ttl_seconds: float | None = None) -> None:
+        self._cache.set(key, value, ttl_seconds)
+
+    async def delete(self, key: str) -> None:
+        self._cache.delete(key)
+
+    async def replace(
+        self, key: str, expected: Any, value: Any, ttl_seconds: float | None = None
+    ) -> bool:
+        # Atomic: nothing awaits between the read and the write
+        if self._cache.get(key) != expected:
+            return False
+        self._cache.set(key, value, ttl_seconds)
+        return True
+
+    def stats(self) -> CacheStats:
+        return self._cache.stats()
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    Cache in a local SQLite file (cache_dir/<namespace>.sqlite3).
+
+    Survives restarts and is shared by the workers of one host. Values are
+    stored as JSON. Each write first drops expired entries when over a cap,
+    then the least recently read ones until max_entries and max_bytes hold.
+    Queries run in a worker thread.
+    """
+
+    def __init__(
+        self, max_entries: int, ttl_seconds: float, max_bytes: int = 0, namespace: str = "default"
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        os.makedirs(settings.cache_dir, exist_ok=True)
+        self.path = os.path.join(settings.cache_dir, f"{namespace}.sqlite3")
+        self._connection = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute("PRAGMA busy_timeout=5000")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS cache_entries ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+            "expires_at REAL NOT NULL, last_used_at REAL NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS ix_cache_entries_last_used_at "
+            "ON cache_entries (last_used_at)"
+        )
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+        self._refresh_size()
+
+    async def get(self, key: str) -> Any | None:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, value: Any, ttl_seconds: float | None = None) -> None:
+        await asyncio.to_thread(self._set, key, value, ttl_seconds)
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self._delete, key)
+
+    async def replace(
+        self, key: str, expected: Any, value: Any, ttl_seconds: float | None = None
+    ) -> bool:
+        return await asyncio.to_thread(self._replace, key, expected, value, ttl_seconds)
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(**vars(self._stats))
+
+    def _get(self, key: str) -> Any | None:
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "UPDATE cache_entries SET last_used_at = ? WHERE key = ? AND expires_at > ? "
+                "RETURNING value",
+                (now, key, now),
+            ).fetchone()
+            if row is None:
+                self._stats.misses += 1
+                return None
+            self._stats.hits += 1
+        return json.loads(row[0])
+
+    def _set(self, key: str, value: Any, ttl_seconds: float | None) -> None:
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        encoded = json.dumps(value, default=str)
+        size = len(encoded.encode())
+        if ttl <= 0 or size > self.max_bytes > 0:
+            return
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO cache_entries VALUES (?, ?, ?, ?, ?)",
+                (key, encoded, size, now + ttl, now),
+            )
+            self._refresh_size()
+            if self._over_cap():
+                self._connection.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (now,))
+                self._refresh_size()
+            if self._over_cap():
+                self._evict_least_recently_used()
+
+    def _replace(self, key: str, expected: Any, value: Any, ttl_seconds: float | None) -> bool:
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        encoded = json.dumps(value, default=str)
+        size = len(encoded.encode())
+        if ttl <= 0 or size > self.max_bytes > 0:
+            return False
+        now = time.time()
+        with self._lock:
+            # Values read back from this table re-encode to the stored text
+            replaced = self._connection.execute(
+                "UPDATE cache_entries SET value = ?, size = ?, expires_at = ?, last_used_at = ? "
+                "WHERE key = ? AND value = ? AND expires_at > ?",
+                (encoded, size, now + ttl, now, key, json.dumps(expected, default=str), now),
+            ).rowcount
+            self._refresh_size()
+        return replaced == 1
+
+    def _delete(self, key: str) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+            self._refresh_size()
+
+    def _refresh_size(self) -> None:
+        self._stats.size, self._stats.bytes = self._connection.execute(
+            "SELECT count(*), coalesce(sum(size), 0) FROM cache_entries"
+        ).fetchone()
+
+    def _over_cap(self) -> bool:
+        return self._stats.size > self.max_entries or (
+            self.max_bytes > 0 and self._stats.bytes > self.max_bytes
+        )
+
+    def _evict_least_recently_used(self) -> None:
+        excess_entries = max(self._stats.size - self.max_entries, 0)
+        excess_bytes = max(self._stats.bytes - self.max_bytes, 0) if self.max_bytes else 0
+        victims: list[tuple[str]] = []
+        for key, size in self._connection.execute(
+            "SELECT key, size FROM cache_entries ORDER BY last_used_at"
+        ):
+            if len(victims) >= excess_entries and excess_bytes <= 0:
+                break
+            victims.append((key,))
+            excess_bytes -= size
+        self._connection.executemany("DELETE FROM cache_entries WHERE key = ?", victims)
+        self._stats.evictions += len(victims)
+        self._refresh_size()
+
+
+CACHE_BACKENDS: dict[str, type[CacheBackend]] = {
+    "memory": InMemoryCacheBackend,
+    "sqlite": SQLiteCacheBackend,
+}
+
+
+def create_cache_backend(
+    name: str,
+    max_entries: int,
+    ttl_seconds: float,
+    max_bytes: int = 0,
+    namespace: str = "default",
+) -> CacheBackend:
+    """
+    Instantiate a registered cache backend by name.
+
+    Args:
+        name: Backend name ("memory" or "sqlite")
+        max_entries: Entry cap (least recently used entries are evicted)
+        ttl_seconds: Default entry lifetime
+        max_bytes: Cap on the total size of the values; 0 for none
+        namespace: Keeps the entries of different caches apart in shared stores
+    """
+    try:
+        backend_class = CACHE_BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown cache backend: {name!r}")
+    return backend_class(
+        max_entries=max_entries, ttl_seconds=ttl_seconds, max_bytes=max_bytes, namespace=namespace
+    )
@@ -19,16 +19,138 @@ class Settings(BaseSettings):
 
     # Database
     database_url: str
+    # Connection pool (ignored for SQLite, which uses SQLAlchemy's default pool)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    # asyncpg prepared statements kept per connection; 0 disables the cache
+    # (required behind PgBouncer in transaction pooling mode)
+    db_statement_cache_size: int = 100
+    # Optional read replica for read-only endpoints. After a write, a user is
+    # pinned to the primary for read_your_writes_seconds so replica lag never
+    # hides their own changes.
+    database_read_url: str | None = None
+    read_your_writes_seconds: int = 5
 
     # Authentication
     jwt_secret_key: str
     jwt_algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
     refresh_token_expire_days: int = 7
+    # "jose" (python-jose) or "native" (faster stdlib HMAC path for HS* algorithms)
+    jwt_backend: str = "jose"
+    # Verified tokens are cached until their exp; 0 disables the cache
+    token_cache_max_entries: int = 10_000
+
+    # Password hashing: bcrypt runs in a bounded thread pool off the event loop.
+    # Hashes with a different cost are upgraded transparently on login.
+    bcrypt_rounds: int = 12
+    password_hash_workers: int = 4
+    password_hash_max_pending: int = 64
+
+    # Authenticated user cache. Invalidation is immediate on the worker that
+    # changes a user; other workers see changes (e.g. is_active=False) within
+    # the TTL unless a shared backend is configured.
+    user_cache_backend: str = "memory"
+    user_cache_ttl_seconds: int = 30
+    user_cache_max_entries: int = 10_000
+
+    # Review sessions: the snapshotted card queue and pending answers live in
+    # this cache until the session ends (or expires, discarding the answers).
+    # "memory" is per process; run several workers only with a shared
+    # backend ("sqlite"), or answers reaching another worker are refused.
+    review_session_backend: str = "memory"
+    review_session_ttl_seconds: int = 3600
+    review_session_max_entries: int = 10_000
+
+    # Review forecasts are cached per user until their next review (and at
+    # most until local midnight)
+    forecast_cache_backend: str = "memory"
+    forecast_cache_ttl_seconds: int = 3600
+    forecast_cache_max_entries: int = 10_000
+
+    # Review scheduler ("sm2" or "fsrs"); users may choose their own. FSRS
+    # weights default to the published FSRS-4.5 values unless fitted ones are
+    # configured (python -m src.scripts.fit_scheduler_weights)
+    scheduler: str = "sm2"
+    fsrs_weights: list[float] | None = None
+    fsrs_desired_retention: float = 0.9
+
+    # Review event log: answers are buffered in memory and inserted in batches
+    # after the review transaction commits. Raw events older than the
+    # retention window are dropped (daily rollups are kept).
+    review_event_batch_size: int = 500
+    review_event_flush_seconds: float = 1.0
+    review_event_max_buffered: int = 50_000
+    review_event_retention_months: int = 24
+    review_event_partitions_ahead: int = 2
+
+    # Request instrumentation: statements slower than slow_query_ms are logged
+    # (parameters redacted). Requests issuing more than request_query_budget
+    # statements are logged too; strict mode raises instead, so tests fail on
+    # N+1 query patterns. Routes can set their own budget with query_budget().
+    slow_query_ms: float = 200.0
+    request_query_budget: int | None = None
+    request_query_budget_strict: bool = False
+
+    # Prometheus /metrics: gauges for pool usage, the bcrypt queue and caches
+    # are refreshed this often in every worker. Multiple workers need
+    # PROMETHEUS_MULTIPROC_DIR (see src.core.prometheus).
+    metrics_sample_seconds: float = 5.0
 
     # AI APIs (at least one required)
     anthropic_api_key: str | None = None
     openai_api_key: str | None = None
+    anthropic_model: str = "claude-3-5-sonnet-latest"
+    openai_model: str = "gpt-4o-mini"
+    ai_max_tokens: int = 1024
+    ai_timeout_seconds: float = 60.0
+    # API endpoints; point both at tests/benchmarks/stub_ai_server.py to run
+    # without real providers
+    anthropic_base_url: str = "https://api.anthropic.com"
+    openai_base_url: str = "https://api.openai.com"
+    # Per-provider limits: concurrent requests (also the connection cap) and
+    # a tokens-per-minute budget for prompt plus max_tokens (0 = unlimited)
+    anthropic_max_concurrency: int = 16
+    openai_max_concurrency: int = 16
+    anthropic_tokens_per_minute: int = 0
+    openai_tokens_per_minute: int = 0
+    # Retries of 429/5xx answers and connection errors before the first
+    # token, with full-jitter exponential backoff
+    ai_max_retries: int = 3
+    ai_retry_base_seconds: float = 0.5
+    ai_retry_max_seconds: float = 8.0
+    # Forces one provider for every user (e.g. "fake" for local development
+    # and tests); otherwise each user's preferred_ai_provider is used
+    ai_provider: str | None = None
+    # Local fake provider: canned replies emitted token by token
+    fake_ai_first_token_ms: float = 300.0
+    fake_ai_token_ms: float = 30.0
+    fake_ai_reply_words: int = 40
+
+    # Streamed chat replies are persisted in coalesced writes: whenever this
+    # many characters arrived or this much time passed since the last write
+    chat_persist_chars: int = 400
+    chat_persist_seconds: float = 1.0
+    # Reply cache for the first message of a session (no history yet) to bots
+    # whose answer depends only on the message. Other bots opt in by being listed.
+    # "sqlite" keeps entries in cache_dir and shares them between workers.
+    chat_cache_bots: list[str] = ["translator", "vocabulary"]
+    chat_cache_backend: str = "memory"
+    chat_cache_ttl_seconds: int = 7 * 24 * 3600
+    chat_cache_max_entries: int = 50_000
+    chat_cache_max_bytes: int = 64 * 1024 * 1024
+    # Context sent with a chat message, within chat_context_tokens (estimated
+    # locally): the bot prompt with the learner's CEFR levels, up to
+    # chat_context_known_words of their words, the rolling summary of older
+    # turns (at most chat_summary_tokens) and the latest messages, at most
+    # chat_context_messages of them
+    chat_context_tokens: int = 3000
+    chat_context_messages: int = 20
+    chat_context_known_words: int = 40
+    chat_summary_tokens: int = 400
 
     # Application
     environment: str = "development"
@@ -38,6 +160,11 @@ class Settings(BaseSettings):
     # CORS
     cors_origins: str = "http://localhost:5500"
 
+    # Dictionary autocomplete index (memory-mapped, shared by all workers)
+    dictionary_index_dir: str = ".cache/dictionary_index"
+    # Files of the "sqlite" cache backend
+    cache_dir: str = ".cache"
+
     # Server
     host: str = "0.0.0.0"
     port: int = 5000
@@ -58,10 +185,14 @@ class Settings(BaseSettings):
     @property
     def async_database_url(self) -> str:
         """Convert database URL to async format (asyncpg)."""
-        url = self.database_url
-        if url.startswith("postgresql://"):
-            return url.replace("postgresql://", "postgresql+asyncpg://", 1)
-        return url
+        return _to_async_url(self.database_url)
+
+    @property
+    def async_database_read_url(self) -> str | None:
+        """Read replica URL in async format, if a replica is configured."""
+        if not self.database_read_url:
+            return None
+        return _to_async_url(self.database_read_url)
 
     @property
     def sync_database_url(self) -> str:
@@ -72,6 +203,13 @@ class Settings(BaseSettings):
         return url
 
 
+def _to_async_url(url: str) -> str:
+    """Switch a plain postgresql:// URL to the asyncpg driver."""
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return url
+
+
 @lru_cache
 def get_settings() -> Settings:
     """Get cached settings instance."""
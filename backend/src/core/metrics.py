@@ -0,0 +1,105 @@
+"""
+Lightweight in-process metric primitives.
+"""
+
+import bisect
+import threading
+from collections.abc import Sequence
+from typing import Any
+
+# Latency buckets in seconds (upper bounds), roughly exponential from 0.5 ms to 10 s
+DEFAULT_LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class Histogram:
+    """Fixed-bucket histogram with count and sum, safe to update from any thread."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """Record one observation."""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    @property
+    def count(self) -> int:
+        """Number of observations."""
+        return self._count
+
+    def quantile(self, q: float) -> float | None:
+        """Estimate a quantile from bucket upper bounds (None if empty)."""
+        with self._lock:
+            counts = list(self._counts)
+            total = self._count
+        if total == 0:
+            return None
+        threshold = q * total
+        cumulative = 0
+        for upper_bound, count in zip(self.buckets, counts, strict=False):
+            cumulative += count
+            if cumulative >= threshold:
+                return upper_bound
+        return float("inf")
+
+    def snapshot(self) -> dict[str, Any]:
+        """Cumulative bucket counts plus count, sum and estimated quantiles."""
+        with self._lock:
+            counts = list(self._counts)
+            total = self._count
+            value_sum = self._sum
+
+        cumulative = 0
+        buckets = {}
+        for upper_bound, count in zip([*self.buckets, float("inf")], counts, strict=True):
+            cumulative += count
+            buckets["+Inf" if upper_bound == float("inf") else str(upper_bound)] = cumulative
+
+        return {
+            "count": total,
+            "sum": value_sum,
+            "buckets": buckets,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+
+class Counter:
+    """Monotonic counter, safe to update from any thread."""
+
+    def __init__(self) -> None:
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: int = 1) -> None:
+        """Increase the counter."""
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> int:
+        """Current value."""
+        return self._value
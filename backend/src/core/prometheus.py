@@ -0,0 +1,194 @@
+"""
+Prometheus metrics served at /metrics.
+
+With several uvicorn workers, set PROMETHEUS_MULTIPROC_DIR to an empty
+directory shared by the workers (and wiped before each start):
+prometheus_client then keeps every value in a memory-mapped file per process
+and the scraping worker merges them all.
+
+Counters and histograms are updated where things happen. State owned by
+other components (pool usage, bcrypt queue, cache statistics) is copied into
+gauges by GaugeSampler, periodically in every worker and before each scrape.
+"""
+
+import asyncio
+import contextlib
+import logging
+import os
+from collections.abc import Callable, Iterable
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+from src.core.config import get_settings
+from src.core.metrics import DEFAULT_LATENCY_BUCKETS
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+MULTIPROCESS_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+METRICS_CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+# HTTP
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Request latency by route template.",
+    ["method", "route"],
+    buckets=DEFAULT_LATENCY_BUCKETS,
+)
+REQUEST_DB_DURATION = Histogram(
+    "http_request_db_seconds",
+    "Time spent in SQL statements per request, by route template.",
+    ["method", "route"],
+    buckets=DEFAULT_LATENCY_BUCKETS,
+)
+REQUESTS = Counter(
+    "http_requests",
+    "Finished requests by route template and status code.",
+    ["method", "route", "status"],
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "Requests currently being served.",
+    multiprocess_mode="livesum",
+)
+
+# Sampled state
+DB_POOL_CONNECTIONS = Gauge(
+    "db_pool_connections",
+    "Database connections by engine and state (checked_out, idle, overflow).",
+    ["engine", "state"],
+    multiprocess_mode="livesum",
+)
+PASSWORD_HASH_QUEUE_DEPTH = Gauge(
+    "password_hash_queue_depth",
+    "bcrypt jobs running or waiting in the hashing pool.",
+    multiprocess_mode="livesum",
+)
+CACHE_HITS = Gauge(
+    "cache_hits", "Cache hits since the worker started.", ["cache"], multiprocess_mode="livesum"
+)
+CACHE_MISSES = Gauge(
+    "cache_misses", "Cache misses since the worker started.", ["cache"], multiprocess_mode="livesum"
+)
+CACHE_ENTRIES = Gauge(
+    "cache_entries", "Entries currently cached.", ["cache"], multiprocess_mode="livesum"
+)
+CACHE_HIT_RATIO = Gauge(
+    "cache_hit_ratio",
+    "Share of cache lookups that hit, per worker.",
+    ["cache"],
+    multiprocess_mode="liveall",
+)
+
+# Domain
+REVIEWS = Counter("srs_reviews", "Committed review answers by quality (0-5).", ["quality"])
+WORDS_ADDED = Counter("vocabulary_words_added", "Words added to user vocabularies.", ["source"])
+AI_REQUESTS = Counter(
+    "ai_provider_requests",
+    "AI reply requests by provider and outcome (upstream, coalesced, retried, failed).",
+    ["provider", "outcome"],
+)
+AI_REPLY_CACHE_SAVED_TOKENS = Counter(
+    "ai_reply_cache_saved_tokens", "Estimated provider tokens saved by cached chat replies."
+)
+AI_REPLY_CACHE_SAVED_SECONDS = Counter(
+    "ai_reply_cache_saved_seconds", "Generation time saved by cached chat replies."
+)
+
+# Label children resolved once: the review path only pays for the increment
+_REVIEWS_BY_QUALITY = tuple(REVIEWS.labels(quality=str(quality)) for quality in range(6))
+
+
+def multiprocess_enabled() -> bool:
+    """Whether values are shared between worker processes."""
+    return bool(os.environ.get(MULTIPROCESS_DIR_ENV))
+
+
+def render_metrics() -> bytes:
+    """Metrics in the Prometheus text format, merged across workers if enabled."""
+    if multiprocess_enabled():
+        registry = CollectorRegistry()
+        # prometheus_client's multiprocess module has no annotations
+        multiprocess.MultiProcessCollector(registry)  # type: ignore[no-untyped-call]
+    else:
+        registry = REGISTRY
+    return generate_latest(registry)
+
+
+def mark_process_dead() -> None:
+    """Drop this worker's live gauges from the shared multiprocess files."""
+    if multiprocess_enabled():
+        multiprocess.mark_process_dead(os.getpid())  # type: ignore[no-untyped-call]
+
+
+def observe_request(
+    method: str, route: str, status_code: int, duration: float, db_seconds: float
+) -> None:
+    """Record one finished request."""
+    REQUEST_DURATION.labels(method, route).observe(duration)
+    REQUEST_DB_DURATION.labels(method, route).observe(db_seconds)
+    REQUESTS.labels(method, route, str(status_code)).inc()
+
+
+def record_reviews(qualities: Iterable[int]) -> None:
+    """Count committed review answers."""
+    for quality in qualities:
+        _REVIEWS_BY_QUALITY[quality].inc()
+
+
+class GaugeSampler:
+    """
+    Copies externally owned state into gauges.
+
+    Callbacks are registered by the code that knows where the state lives;
+    sample() runs them all, and a background task repeats that every
+    interval_seconds so each worker's values stay current between scrapes.
+    """
+
+    def __init__(self, interval_seconds: float):
+        self._interval_seconds = interval_seconds
+        self._callbacks: list[Callable[[], None]] = []
+        self._task: asyncio.Task[None] | None = None
+
+    def register(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """Add a sampling callback; usable as a decorator."""
+        self._callbacks.append(callback)
+        return callback
+
+    def sample(self) -> None:
+        """Run every callback; a failing one is logged and skipped."""
+        for callback in self._callbacks:
+            try:
+                callback()
+            except Exception:
+                logger.exception("Metric sampler %s failed", callback.__name__)
+
+    def start(self) -> None:
+        """Start periodic sampling (idempotent)."""
+        if self._task is None and self._interval_seconds > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop periodic sampling."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            self.sample()
+            await asyncio.sleep(self._interval_seconds)
+
+
+gauge_sampler = GaugeSampler(settings.metrics_sample_seconds)
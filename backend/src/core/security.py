@@ -2,15 +2,28 @@
 Security utilities for authentication and password hashing.
 """
 
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from typing import Any, TypeVar
 
 import bcrypt
 from jose import JWTError, jwt
 
+from src.core.cache import TTLCache
 from src.core.config import get_settings
+from src.core.exceptions import ServiceUnavailableException
 
 settings = get_settings()
 
+T = TypeVar("T")
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
@@ -22,11 +35,79 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def hash_password(password: str) -> str:
     """Hash a password."""
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=settings.bcrypt_rounds)
     hashed = bcrypt.hashpw(password.encode("utf-8"), salt)
     return hashed.decode("utf-8")
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Check whether a hash was made with a cost other than the configured one."""
+    # bcrypt hashes look like $2b$<cost>$<salt+hash>
+    try:
+        cost = int(hashed_password.split("$")[2])
+    except (IndexError, ValueError):
+        return True
+    return cost != settings.bcrypt_rounds
+
+
+class PasswordHashPool:
+    """
+    Bounded thread pool for bcrypt work.
+
+    bcrypt releases the GIL, so hashing in threads keeps the event loop free.
+    Jobs beyond max_pending are rejected with 503 instead of queueing without
+    bound, which would only turn a login burst into timeouts.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: ThreadPoolExecutor | None = None
+        self._pending = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """Jobs submitted and not yet finished (running + waiting)."""
+        return self._pending
+
+    async def run(self, func: Callable[..., T], *args: object) -> T:
+        """Run a hashing function in the pool."""
+        if self._pending >= self.max_pending:
+            raise ServiceUnavailableException("Too many concurrent sign-ins, please retry")
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="password-hash"
+            )
+
+        self._pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            self._pending -= 1
+
+    def shutdown(self) -> None:
+        """Stop the worker threads."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hash_pool = PasswordHashPool(
+    workers=settings.password_hash_workers,
+    max_pending=settings.password_hash_max_pending,
+)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password in the hashing pool."""
+    return await password_hash_pool.run(verify_password, plain_password, hashed_password)
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password in the hashing pool."""
+    return await password_hash_pool.run(hash_password, password)
+
+
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
@@ -47,10 +128,108 @@ def create_refresh_token(data: dict, expires_delta: timedelta | None = None) ->
     return jwt.encode(to_encode, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
 
 
-def decode_token(token: str) -> dict | None:
-    """Decode and validate a JWT token."""
+def _decode_with_jose(token: str) -> dict[str, Any] | None:
     try:
-        payload = jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
-        return payload
+        return jwt.decode(token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm])
     except JWTError:
         return None
+
+
+_HMAC_DIGESTS = {
+    "HS256": hashlib.sha256,
+    "HS384": hashlib.sha384,
+    "HS512": hashlib.sha512,
+}
+
+
+def _decode_with_native(token: str) -> dict[str, Any] | None:
+    """
+    Minimal HMAC-only verifier using the standard library.
+
+    Only accepts tokens whose header names the configured HS* algorithm and
+    checks exp/nbf the way python-jose does.
+    """
+    digest = _HMAC_DIGESTS.get(settings.jwt_algorithm)
+    if digest is None:
+        return _decode_with_jose(token)
+
+    try:
+        header_segment, payload_segment, signature_segment = token.split(".")
+        header = json.loads(_b64url_decode(header_segment))
+        if header.get("alg") != settings.jwt_algorithm:
+            return None
+
+        expected = hmac.new(
+            settings.jwt_secret_key.encode("utf-8"),
+            f"{header_segment}.{payload_segment}".encode("ascii"),
+            digest,
+        ).digest()
+        if not hmac.compare_digest(expected, _b64url_decode(signature_segment)):
+            return None
+
+        payload = json.loads(_b64url_decode(payload_segment))
+    except (ValueError, UnicodeError):
+        return None
+
+    if not isinstance(payload, dict):
+        return None
+    now = time.time()
+    try:
+        if "exp" in payload and int(payload["exp"]) <= now:
+            return None
+        if "nbf" in payload and int(payload["nbf"]) > now:
+            return None
+    except (TypeError, ValueError):
+        return None
+    return payload
+
+
+def _b64url_decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+JWT_DECODERS: dict[str, Callable[[str], dict[str, Any] | None]] = {
+    "jose": _decode_with_jose,
+    "native": _decode_with_native,
+}
+
+
+def get_jwt_decoder(backend: str) -> Callable[[str], dict[str, Any] | None]:
+    """Return the uncached decode function of a JWT backend."""
+    try:
+        return JWT_DECODERS[backend]
+    except KeyError:
+        raise ValueError(f"Unknown JWT backend: {backend!r}")
+
+
+_decode_jwt = get_jwt_decoder(settings.jwt_backend)
+
+# signature -> (signing input, payload) for tokens that already passed verification
+verified_token_cache = TTLCache(
+    max_entries=settings.token_cache_max_entries,
+    ttl_seconds=settings.access_token_expire_minutes * 60,
+)
+
+
+def decode_token(token: str, use_cache: bool = True) -> dict | None:
+    """
+    Decode and validate a JWT token.
+
+    Verified tokens are cached by signature until they expire, so repeated
+    requests with the same token skip parsing and the HMAC check.
+    """
+    signing_input, _, signature = token.rpartition(".")
+    if use_cache:
+        cached = verified_token_cache.get(signature)
+        # A signature only vouches for the exact header and payload it signed
+        if cached is not None and cached[0] == signing_input:
+            return dict(cached[1])
+
+    payload = _decode_jwt(token)
+    if payload is None:
+        return None
+
+    if use_cache:
+        expires_in = payload.get("exp", 0) - time.time()
+        verified_token_cache.set(signature, (signing_input, payload), ttl_seconds=expires_in)
+    return dict(payload)
@@ -0,0 +1,79 @@
+"""
+Custom SQL functions shared by models, migrations and queries.
+"""
+
+from typing import Any
+
+from sqlalchemy import String
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.compiler import SQLCompiler
+from sqlalchemy.sql.functions import FunctionElement
+
+# Diacritic folding for search: å/ä -> a, ö -> o (plus é/ü from loanwords).
+# The PostgreSQL trigram indexes are built on exactly this expression, so
+# changing these strings requires a migration that recreates them.
+FOLD_FROM = "åäöéü"
+FOLD_TO = "aaoeu"
+
+_FOLD_TABLE = str.maketrans(FOLD_FROM, FOLD_TO)
+
+
+def fold_text(value: str) -> str:
+    """Fold a search string the same way folded() folds a column."""
+    return value.strip().lower().translate(_FOLD_TABLE)
+
+
+class folded(FunctionElement[str]):  # noqa: N801 - SQL function naming
+    """Lower-cased, diacritic-folded text: folded(Word.swedish)."""
+
+    type = String()
+    name = "folded"
+    inherit_cache = True
+
+
+@compiles(folded)
+def _compile_folded(element: folded, compiler: SQLCompiler, **kw: Any) -> str:
+    """PostgreSQL: translate() is IMMUTABLE, so the expression is indexable."""
+    text = compiler.process(element.clauses, **kw)
+    return f"translate(lower({text}), '{FOLD_FROM}', '{FOLD_TO}')"
+
+
+@compiles(folded, "sqlite")
+def _compile_folded_sqlite(element: folded, compiler: SQLCompiler, **kw: Any) -> str:
+    """SQLite: lower() is ASCII-only and translate() is missing, so replace() both cases."""
+    text = f"lower({compiler.process(element.clauses, **kw)})"
+    for source, target in zip(FOLD_FROM, FOLD_TO, strict=True):
+        text = f"replace(replace({text}, '{source}', '{target}'), '{source.upper()}', '{target}')"
+    return text
+
+
+class local_day(FunctionElement[Any]):  # noqa: N801 - SQL function naming
+    """
+    Calendar day of a UTC timestamp in a time zone.
+
+    local_day(UserWord.next_review, literal("Europe/Stockholm"), literal(120)):
+    PostgreSQL uses the zone name, SQLite (no zone database) the fixed UTC
+    offset in minutes. Returns a timestamp at midnight on PostgreSQL and a
+    "YYYY-MM-DD" string on SQLite.
+    """
+
+    name = "local_day"
+    inherit_cache = True
+
+
+@compiles(local_day)
+def _compile_local_day(element: local_day, compiler: SQLCompiler, **kw: Any) -> str:
+    column, zone_name, _ = element.clauses
+    return (
+        f"date_trunc('day', timezone({compiler.process(zone_name, **kw)}, "
+        f"{compiler.process(column, **kw)}))"
+    )
+
+
+@compiles(local_day, "sqlite")
+def _compile_local_day_sqlite(element: local_day, compiler: SQLCompiler, **kw: Any) -> str:
+    column, _, offset_minutes = element.clauses
+    return (
+        f"date({compiler.process(column, **kw)}, "
+        f"{compiler.process(offset_minutes, **kw)} || ' minutes')"
+    )
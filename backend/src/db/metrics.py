@@ -0,0 +1,140 @@
+"""
+Connection pool and compiled SQL cache metrics collected from SQLAlchemy events.
+"""
+
+import time
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection
+from sqlalchemy.engine.default import DefaultExecutionContext
+from sqlalchemy.engine.interfaces import DBAPIConnection, DBAPICursor
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import (
+    AsyncAdaptedQueuePool,
+    ConnectionPoolEntry,
+    Pool,
+    PoolProxiedConnection,
+    QueuePool,
+)
+
+from src.core.metrics import Counter, Histogram
+
+CHECKOUT_WAIT_KEY = "checkout_wait_seconds"
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that records how long each checkout waited.
+
+    The wait (queueing for a free slot, plus connecting when the pool grows)
+    is stashed on the connection record and picked up by the "checkout" event.
+    """
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        started = time.perf_counter()
+        record = super()._do_get()
+        record.info[CHECKOUT_WAIT_KEY] = time.perf_counter() - started
+        return record
+
+
+class PoolMetrics:
+    """Counters and histograms for one engine."""
+
+    def __init__(self) -> None:
+        self.checkout_wait = Histogram()
+        self.checkouts = Counter()
+        self.connects = Counter()
+        self.invalidations = Counter()
+        self.compiled_cache_hits = Counter()
+        self.compiled_cache_misses = Counter()
+
+    @property
+    def compiled_cache_hit_ratio(self) -> float:
+        """Share of executions whose SQL came from SQLAlchemy's compiled cache."""
+        hits = self.compiled_cache_hits.value
+        lookups = hits + self.compiled_cache_misses.value
+        return hits / lookups if lookups else 0.0
+
+
+def instrument_engine(engine: AsyncEngine) -> PoolMetrics:
+    """Attach pool and execution event listeners to an engine."""
+    metrics = PoolMetrics()
+    pool = engine.sync_engine.pool
+
+    @event.listens_for(pool, "connect")
+    def _on_connect(
+        _dbapi_connection: DBAPIConnection, _connection_record: ConnectionPoolEntry
+    ) -> None:
+        metrics.connects.inc()
+
+    @event.listens_for(pool, "checkout")
+    def _on_checkout(
+        _dbapi_connection: DBAPIConnection,
+        connection_record: ConnectionPoolEntry,
+        _connection_proxy: PoolProxiedConnection,
+    ) -> None:
+        metrics.checkouts.inc()
+        wait = connection_record.info.pop(CHECKOUT_WAIT_KEY, None)
+        if wait is not None:
+            metrics.checkout_wait.observe(wait)
+
+    @event.listens_for(pool, "invalidate")
+    def _on_invalidate(
+        _dbapi_connection: DBAPIConnection,
+        _connection_record: ConnectionPoolEntry,
+        _exception: BaseException | None,
+    ) -> None:
+        metrics.invalidations.inc()
+
+    # SQLAlchemy's compiled cache decides whether the same SQL string is
+    # reused, which is what lets asyncpg reuse its prepared statements. Hits
+    # here are not asyncpg's own prepared-statement cache hits, which the
+    # driver does not report.
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _on_execute(
+        _conn: Connection,
+        _cursor: DBAPICursor,
+        _statement: str,
+        _parameters: Any,
+        context: DefaultExecutionContext | None,
+        _executemany: bool,
+    ) -> None:
+        if context is None:
+            return
+        if context.cache_hit is context.dialect.CACHE_HIT:
+            metrics.compiled_cache_hits.inc()
+        elif context.cache_hit is context.dialect.CACHE_MISS:
+            metrics.compiled_cache_misses.inc()
+
+    return metrics
+
+
+def pool_status(pool: Pool) -> dict[str, Any]:
+    """Current checked-out / idle counts for a pool."""
+    if isinstance(pool, QueuePool):
+        return {
+            "pool_class": type(pool).__name__,
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "idle": pool.checkedin(),
+            # Negative while the pool has not yet opened `size` connections
+            "overflow": max(pool.overflow(), 0),
+        }
+    return {"pool_class": type(pool).__name__, "status": pool.status()}
+
+
+def metrics_report(engine: AsyncEngine, metrics: PoolMetrics) -> dict[str, Any]:
+    """Pool state plus collected metrics, as served by /health/db."""
+    return {
+        "pool": pool_status(engine.sync_engine.pool),
+        "checkouts": metrics.checkouts.value,
+        "connects": metrics.connects.value,
+        "invalidations": metrics.invalidations.value,
+        "checkout_wait_seconds": metrics.checkout_wait.snapshot(),
+        "compiled_cache": {
+            "hits": metrics.compiled_cache_hits.value,
+            "misses": metrics.compiled_cache_misses.value,
+            "hit_ratio": metrics.compiled_cache_hit_ratio,
+        },
+    }
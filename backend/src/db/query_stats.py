@@ -0,0 +1,121 @@
+"""
+Per-request SQL statement counting and slow-query logging.
+
+Cursor execution events add each statement's duration to the QueryStats of
+the request being served (tracked in a context variable, which SQLAlchemy
+carries into its greenlets). Statements slower than slow_query_ms are logged
+with their bound parameters redacted to type names.
+"""
+
+import logging
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection
+from sqlalchemy.engine.interfaces import DBAPICursor, ExecutionContext
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.core.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+STATEMENT_STARTED_KEY = "statement_started"
+
+
+class QueryBudgetExceededError(RuntimeError):
+    """A request issued more SQL statements than its query budget allows."""
+
+
+@dataclass
+class QueryStats:
+    """SQL statements issued while serving one request."""
+
+    statements: int = 0
+    db_seconds: float = 0.0
+    # Strict mode raises on the statement that goes over this many
+    budget: int | None = None
+
+
+current_query_stats: ContextVar[QueryStats | None] = ContextVar("current_query_stats", default=None)
+
+
+@contextmanager
+def track_queries(budget: int | None = None) -> Iterator[QueryStats]:
+    """Collect statement counts and DB time for the code run inside the block."""
+    stats = QueryStats(budget=budget)
+    token = current_query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        current_query_stats.reset(token)
+
+
+def redact_parameters(parameters: Any, executemany: bool = False) -> str:
+    """Describe bound parameters by type only, so values never reach the logs."""
+    if executemany:
+        rows = list(parameters or ())
+        first = redact_parameters(rows[0]) if rows else "()"
+        return f"{len(rows)} rows like {first}"
+    if isinstance(parameters, dict):
+        return (
+            "{"
+            + ", ".join(f"{key}: {type(value).__name__}" for key, value in parameters.items())
+            + "}"
+        )
+    if isinstance(parameters, (list, tuple)):
+        return "(" + ", ".join(type(value).__name__ for value in parameters) + ")"
+    return type(parameters).__name__
+
+
+def instrument_queries(engine: AsyncEngine) -> None:
+    """Attach statement timing listeners to an engine."""
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _before_execute(
+        conn: Connection,
+        _cursor: DBAPICursor,
+        _statement: str,
+        _parameters: Any,
+        _context: ExecutionContext | None,
+        _executemany: bool,
+    ) -> None:
+        conn.info.setdefault(STATEMENT_STARTED_KEY, []).append(time.perf_counter())
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _after_execute(
+        conn: Connection,
+        _cursor: DBAPICursor,
+        statement: str,
+        parameters: Any,
+        _context: ExecutionContext | None,
+        executemany: bool,
+    ) -> None:
+        elapsed = time.perf_counter() - conn.info[STATEMENT_STARTED_KEY].pop()
+        if elapsed * 1000 >= settings.slow_query_ms:
+            logger.warning(
+                "Slow query (%.1f ms): %s parameters=%s",
+                elapsed * 1000,
+                " ".join(statement.split()),
+                redact_parameters(parameters, executemany),
+            )
+
+        stats = current_query_stats.get()
+        if stats is None:
+            return
+        stats.statements += 1
+        stats.db_seconds += elapsed
+        if (
+            settings.request_query_budget_strict
+            and stats.budget is not None
+            and stats.statements > stats.budget
+        ):
+            raise QueryBudgetExceededError(
+                f"Statement {stats.statements} exceeds the query budget of {stats.budget}: "
+                f"{' '.join(statement.split())}"
+            )
@@ -0,0 +1,64 @@
+"""
+Read-your-writes routing between the primary and the read replica.
+
+Sessions record whether they wrote anything. When a session that belongs to
+an authenticated user commits a write, that user is pinned to the primary for
+a short window so their next reads cannot hit a lagging replica.
+"""
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session, UOWTransaction
+
+from src.core.cache import create_cache_backend
+from src.core.config import get_settings
+
+settings = get_settings()
+
+SESSION_USER_KEY = "user_id"
+SESSION_WROTE_KEY = "has_writes"
+
+# Shared backends make the pin visible to every worker; the in-memory one
+# only covers the worker that handled the write
+primary_pins = create_cache_backend(
+    settings.user_cache_backend,
+    max_entries=settings.user_cache_max_entries,
+    ttl_seconds=settings.read_your_writes_seconds,
+    namespace="primary_pins",
+)
+
+
+def _pin_key(user_id: str) -> str:
+    return f"primary-pin:{user_id}"
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_flush(session: Session, _flush_context: UOWTransaction) -> None:
+    session.info[SESSION_WROTE_KEY] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_dml(orm_execute_state: ORMExecuteState) -> None:
+    # Bulk insert/update/delete statements bypass the flush
+    state = orm_execute_state
+    if state.is_insert or state.is_update or state.is_delete:
+        state.session.info[SESSION_WROTE_KEY] = True
+
+
+def bind_session_user(session: AsyncSession, user_id: str) -> None:
+    """Associate a session with the authenticated user it serves."""
+    session.info[SESSION_USER_KEY] = user_id
+
+
+async def pin_session_user(session: AsyncSession) -> None:
+    """After a commit, pin the session's user to the primary if it wrote."""
+    if not session.info.pop(SESSION_WROTE_KEY, False):
+        return
+    user_id = session.info.get(SESSION_USER_KEY)
+    if user_id is not None and settings.read_your_writes_seconds > 0:
+        await primary_pins.set(_pin_key(user_id), True)
+
+
+async def is_pinned_to_primary(user_id: str) -> bool:
+    """Whether a user's reads must go to the primary."""
+    return bool(await primary_pins.get(_pin_key(user_id)))
@@ -2,23 +2,72 @@
 Database session configuration.
 """
 
-from collections.abc import AsyncGenerator
+import asyncio
+import logging
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from typing import Any
 
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm import DeclarativeBase, Session
 
 from src.core.config import get_settings
+from src.db.metrics import InstrumentedQueuePool, instrument_engine
+from src.db.query_stats import instrument_queries
+from src.db.routing import is_pinned_to_primary, pin_session_user
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
+
+AFTER_COMMIT_KEY = "after_commit_actions"
+AFTER_COMMIT_TASKS_KEY = "after_commit_tasks"
+
+
+def engine_options(database_url: str) -> dict[str, Any]:
+    """Keyword arguments for create_async_engine, including pool tuning."""
+    options: dict[str, Any] = {
+        "echo": settings.debug,
+        "future": True,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+    if database_url.startswith("sqlite"):
+        return options
+
+    options.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+    )
+    if "+asyncpg" in database_url:
+        options["connect_args"] = {
+            "prepared_statement_cache_size": settings.db_statement_cache_size,
+        }
+    return options
+
 
 # Create async engine
 engine = create_async_engine(
     settings.async_database_url,
-    echo=settings.debug,
-    future=True,
+    **engine_options(settings.async_database_url),
 )
+pool_metrics = instrument_engine(engine)
+instrument_queries(engine)
+
+# Optional read replica; falls back to the primary when not configured
+if settings.async_database_read_url:
+    read_engine = create_async_engine(
+        settings.async_database_read_url,
+        **engine_options(settings.async_database_read_url),
+    )
+    read_pool_metrics = instrument_engine(read_engine)
+    instrument_queries(read_engine)
+else:
+    read_engine = engine
+    read_pool_metrics = pool_metrics
 
-# Create async session factory
+# Create async session factories
 async_session_maker = async_sessionmaker(
     engine,
     class_=AsyncSession,
@@ -26,6 +75,13 @@ async_session_maker = async_sessionmaker(
     autocommit=False,
     autoflush=False,
 )
+read_session_maker = async_sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False,
+)
 
 
 class Base(DeclarativeBase):
@@ -34,14 +90,61 @@ class Base(DeclarativeBase):
     pass
 
 
+def get_dialect_name(db: AsyncSession) -> str:
+    """Name of the SQL dialect a session is bound to (e.g. "postgresql", "sqlite")."""
+    return db.get_bind().dialect.name
+
+
+def run_after_commit(session: AsyncSession, action: Callable[[], Awaitable[None]]) -> None:
+    """
+    Run an async action once the session's transaction commits.
+
+    For cache invalidation: dropping an entry before the commit lets a
+    concurrent request cache the old rows again. Dropped on rollback.
+    """
+    session.info.setdefault(AFTER_COMMIT_KEY, []).append(action)
+
+
+@event.listens_for(Session, "after_commit")
+def _start_after_commit_actions(session: Session) -> None:
+    actions = session.info.pop(AFTER_COMMIT_KEY, None)
+    if actions:
+        loop = asyncio.get_running_loop()
+        session.info.setdefault(AFTER_COMMIT_TASKS_KEY, []).extend(
+            loop.create_task(action()) for action in actions
+        )
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_commit_actions(session: Session) -> None:
+    session.info.pop(AFTER_COMMIT_KEY, None)
+
+
+async def wait_after_commit_actions(session: AsyncSession) -> None:
+    """Wait for the actions started by the session's commits; failures are logged."""
+    tasks = session.info.pop(AFTER_COMMIT_TASKS_KEY, [])
+    for result in await asyncio.gather(*tasks, return_exceptions=True):
+        if isinstance(result, Exception):
+            logger.error("After-commit action failed", exc_info=result)
+
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """Dependency that provides a database session."""
     async with async_session_maker() as session:
         try:
             yield session
             await session.commit()
+            await wait_after_commit_actions(session)
+            await pin_session_user(session)
         except Exception:
             await session.rollback()
             raise
         finally:
             await session.close()
+
+
+async def read_session_maker_for(user_id: str | None) -> async_sessionmaker[AsyncSession]:
+    """Session factory for reads: the replica, unless the user recently wrote."""
+    if user_id is not None and await is_pinned_to_primary(user_id):
+        return async_session_maker
+    return read_session_maker
@@ -0,0 +1,22 @@
+"""
+Dialect-specific INSERT constructs for upserts.
+"""
+
+from typing import Any
+
+from sqlalchemy.dialects import postgresql, sqlite
+
+
+def dialect_insert(dialect_name: str, table: Any) -> postgresql.Insert | sqlite.Insert:
+    """
+    INSERT statement supporting on_conflict_do_update / on_conflict_do_nothing.
+
+    Args:
+        dialect_name: Dialect name, e.g. from get_dialect_name(db)
+        table: Table or mapped class to insert into
+    """
+    if dialect_name == "postgresql":
+        return postgresql.insert(table)
+    if dialect_name == "sqlite":
+        return sqlite.insert(table)
+    raise NotImplementedError(f"Upsert is not supported on {dialect_name!r}")
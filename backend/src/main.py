@@ -7,9 +7,21 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from src.api.routes import auth_router, health_router, vocabulary_router
+from src.api.middleware import RequestTimingMiddleware
+from src.api.routes import (
+    auth_router,
+    chat_router,
+    health_router,
+    metrics_router,
+    vocabulary_router,
+)
 from src.core.config import get_settings
-from src.db.session import engine
+from src.core.prometheus import gauge_sampler, mark_process_dead
+from src.core.security import password_hash_pool
+from src.db.session import engine, read_engine
+from src.services.ai_client import close_provider_pools
+from src.services.dictionary_index import dictionary_index_writer
+from src.services.review_events import review_event_writer
 
 settings = get_settings()
 
@@ -18,9 +30,20 @@ settings = get_settings()
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
     # Startup
+    review_event_writer.start()
+    dictionary_index_writer.start()
+    gauge_sampler.start()
     yield
     # Shutdown
+    await gauge_sampler.stop()
+    mark_process_dead()
+    await review_event_writer.stop()
+    await dictionary_index_writer.stop()
+    await close_provider_pools()
+    password_hash_pool.shutdown()
     await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
 
 
 def create_app() -> FastAPI:
@@ -54,10 +77,15 @@ def create_app() -> FastAPI:
         expose_headers=["*"],
     )
 
+    # Outermost, so its timing covers CORS handling too
+    app.add_middleware(RequestTimingMiddleware)
+
     # Include routers
     app.include_router(health_router)
+    app.include_router(metrics_router)
     app.include_router(auth_router, prefix=settings.api_v1_prefix)
     app.include_router(vocabulary_router, prefix=settings.api_v1_prefix)
+    app.include_router(chat_router, prefix=settings.api_v1_prefix)
 
     return app
 
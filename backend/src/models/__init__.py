@@ -1,8 +1,17 @@
 # Database models
 from src.models.chat import BotType, ChatMessage, ChatSession, MessageRole
 from src.models.skill import SkillAssessment, SkillType
-from src.models.user import AIProvider, CEFRLevel, User
-from src.models.word import Gender, PartOfSpeech, UserWord, Word, WordStatus
+from src.models.user import AIProvider, CEFRLevel, SchedulerType, User
+from src.models.word import (
+    Gender,
+    PartOfSpeech,
+    ReviewDailyRollup,
+    ReviewEvent,
+    UserVocabCounter,
+    UserWord,
+    Word,
+    WordStatus,
+)
 from src.models.writing import UserSpellingPattern, WritingSubmission
 
 __all__ = [
@@ -10,9 +19,13 @@ __all__ = [
     "User",
     "CEFRLevel",
     "AIProvider",
+    "SchedulerType",
     # Word
     "Word",
     "UserWord",
+    "UserVocabCounter",
+    "ReviewEvent",
+    "ReviewDailyRollup",
     "Gender",
     "PartOfSpeech",
     "WordStatus",
@@ -5,7 +5,7 @@ Chat session and message models.
 from datetime import datetime, timezone
 from enum import Enum
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text, func
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Text, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.db.session import Base
@@ -33,6 +33,10 @@ class ChatSession(Base):
     """A chat conversation session with a bot."""
 
     __tablename__ = "chat_sessions"
+    __table_args__ = (
+        # A user's sessions, most recently active first, keyset-paged on id
+        Index("ix_chat_sessions_user_id_updated_at", "user_id", "updated_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True, nullable=False)
@@ -42,6 +46,11 @@ class ChatSession(Base):
     # Session metadata
     message_count: Mapped[int] = mapped_column(Integer, default=0)
 
+    # Rolling summary of the messages that fell out of the context window,
+    # covering every message up to summary_through_id
+    summary: Mapped[str | None] = mapped_column(Text, nullable=True)
+    summary_through_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+
     # Timestamps
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
@@ -55,9 +64,10 @@ class ChatSession(Base):
         default=lambda: datetime.now(timezone.utc),
     )
 
-    # Relationships
+    # Relationships. Never loaded implicitly: read messages a page at a time
+    # (services.chat.list_chat_messages)
     messages: Mapped[list["ChatMessage"]] = relationship(
-        "ChatMessage", back_populates="session", order_by="ChatMessage.created_at"
+        "ChatMessage", back_populates="session", order_by="ChatMessage.created_at", lazy="raise"
     )
 
     def __repr__(self) -> str:
@@ -68,6 +78,12 @@ class ChatMessage(Base):
     """A single message in a chat session."""
 
     __tablename__ = "chat_messages"
+    __table_args__ = (
+        # Keyset scans of a session's latest messages (context window)
+        Index("ix_chat_messages_session_id_id", "session_id", "id"),
+        # Paged message history, newest first
+        Index("ix_chat_messages_session_id_created_at_id", "session_id", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     session_id: Mapped[int] = mapped_column(
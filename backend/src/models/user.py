@@ -5,7 +5,7 @@ User database model.
 from datetime import datetime, timezone
 from enum import Enum
 
-from sqlalchemy import DateTime, String, func
+from sqlalchemy import JSON, DateTime, String, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from src.db.session import Base
@@ -29,6 +29,13 @@ class AIProvider(str, Enum):
     OPENAI = "openai"
 
 
+class SchedulerType(str, Enum):
+    """Available review schedulers."""
+
+    SM2 = "sm2"
+    FSRS = "fsrs"
+
+
 class User(Base):
     """User account model."""
 
@@ -50,6 +57,10 @@ class User(Base):
         String(20), default=AIProvider.CLAUDE.value
     )
     timezone: Mapped[str] = mapped_column(String(50), default="Europe/Stockholm")
+    # Review scheduler; None follows the server default (settings.scheduler)
+    scheduler: Mapped[str | None] = mapped_column(String(10), nullable=True)
+    # Per-user FSRS weights fitted from review history; None uses the global ones
+    scheduler_weights: Mapped[list[float] | None] = mapped_column(JSON, nullable=True)
 
     # Account status
     is_active: Mapped[bool] = mapped_column(default=True)
@@ -2,12 +2,24 @@
 Vocabulary word models.
 """
 
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 from enum import Enum
 
-from sqlalchemy import DateTime, Float, ForeignKey, Integer, String, Text, func
+from sqlalchemy import (
+    Date,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+    func,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from src.db.functions import folded
 from src.db.session import Base
 
 
@@ -83,6 +95,12 @@ class UserWord(Base):
     """User's progress on a specific word (SRS tracking)."""
 
     __tablename__ = "user_words"
+    __table_args__ = (
+        # Serves the due-review queue: equality on user_id, then the
+        # next_review ASC NULLS LAST order with id as keyset tie-breaker
+        Index("ix_user_words_user_id_next_review", "user_id", "next_review", "id"),
+        UniqueConstraint("user_id", "word_id", name="user_words_user_id_word_id_unique"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True, nullable=False)
@@ -101,6 +119,10 @@ class UserWord(Base):
     interval_days: Mapped[int] = mapped_column(Integer, default=1)
     repetition_number: Mapped[int] = mapped_column(Integer, default=0)
 
+    # FSRS memory state; NULL until the card is reviewed under FSRS
+    stability: Mapped[float | None] = mapped_column(Float, nullable=True)
+    difficulty: Mapped[float | None] = mapped_column(Float, nullable=True)
+
     # Review dates
     last_reviewed: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     next_review: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -126,3 +148,98 @@ class UserWord(Base):
 
     def __repr__(self) -> str:
         return f"<UserWord user={self.user_id} word={self.word_id} status={self.status}>"
+
+
+class UserVocabCounter(Base):
+    """Per-user word count for one learning status, kept in step with user_words."""
+
+    __tablename__ = "user_vocab_counters"
+
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), primary_key=True)
+    status: Mapped[str] = mapped_column(String(20), primary_key=True)
+    word_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<UserVocabCounter user={self.user_id} {self.status}={self.word_count}>"
+
+
+class ReviewEvent(Base):
+    """
+    One answered review with the SRS state before and after it (append-only).
+
+    On PostgreSQL the table is range-partitioned by month on reviewed_at, so
+    retention drops whole partitions. It has no primary key or foreign keys:
+    rows are never updated or fetched one at a time, and a unique key on a
+    partitioned table would have to include reviewed_at anyway.
+    """
+
+    __tablename__ = "review_events"
+    __table_args__ = (
+        Index("ix_review_events_user_id_reviewed_at", "user_id", "reviewed_at"),
+        {"postgresql_partition_by": "RANGE (reviewed_at)"},
+    )
+
+    user_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    word_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    reviewed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    quality: Mapped[int] = mapped_column(Integer, nullable=False)
+    response_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
+
+    # SRS state before the answer
+    prev_status: Mapped[str] = mapped_column(String(20), nullable=False)
+    prev_ease_factor: Mapped[float] = mapped_column(Float, nullable=False)
+    prev_interval_days: Mapped[int] = mapped_column(Integer, nullable=False)
+    prev_repetition_number: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    # SRS state after the answer
+    status: Mapped[str] = mapped_column(String(20), nullable=False)
+    ease_factor: Mapped[float] = mapped_column(Float, nullable=False)
+    interval_days: Mapped[int] = mapped_column(Integer, nullable=False)
+    repetition_number: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    # The ORM needs an identity; the table itself has no key
+    __mapper_args__ = {"primary_key": [user_id, word_id, reviewed_at]}
+
+    def __repr__(self) -> str:
+        return f"<ReviewEvent user={self.user_id} word={self.word_id} quality={self.quality}>"
+
+
+class ReviewDailyRollup(Base):
+    """Per-user daily review totals (UTC days), kept after raw events expire."""
+
+    __tablename__ = "review_daily_rollups"
+
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    reviews: Mapped[int] = mapped_column(Integer, nullable=False)
+    correct: Mapped[int] = mapped_column(Integer, nullable=False)  # quality >= 3
+    quality_sum: Mapped[int] = mapped_column(Integer, nullable=False)
+    # Only answers that reported a response time
+    timed_reviews: Mapped[int] = mapped_column(Integer, nullable=False)
+    response_ms_sum: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<ReviewDailyRollup user={self.user_id} day={self.day} reviews={self.reviews}>"
+
+
+# Natural key of a dictionary entry; target of the bulk importer's upsert
+Index(
+    "ix_words_swedish_part_of_speech",
+    Word.swedish,
+    func.coalesce(Word.part_of_speech, ""),
+    unique=True,
+)
+
+# Trigram indexes for diacritic-insensitive substring search (pg_trgm on PostgreSQL)
+Index(
+    "ix_words_swedish_trgm",
+    folded(Word.swedish).label("swedish_folded"),
+    postgresql_using="gin",
+    postgresql_ops={"swedish_folded": "gin_trgm_ops"},
+).ddl_if(dialect="postgresql")
+Index(
+    "ix_words_english_trgm",
+    folded(Word.english).label("english_folded"),
+    postgresql_using="gin",
+    postgresql_ops={"english_folded": "gin_trgm_ops"},
+).ddl_if(dialect="postgresql")
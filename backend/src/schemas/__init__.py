@@ -4,7 +4,6 @@ from src.schemas.chat import (
     ChatResponse,
     ChatSessionCreate,
     ChatSessionResponse,
-    ChatSessionWithMessages,
     MessageCreate,
     MessageResponse,
 )
@@ -20,13 +19,24 @@ from src.schemas.user import (
 )
 from src.schemas.word import (
     ReviewAnswer,
+    ReviewBatch,
+    ReviewBatchItem,
+    ReviewCard,
+    ReviewForecast,
+    ReviewForecastDay,
     ReviewResponse,
+    ReviewSessionCreate,
+    ReviewSessionProgress,
+    ReviewSessionResponse,
+    UserWordBulkCreate,
+    UserWordBulkResult,
     UserWordCreate,
     UserWordResponse,
     UserWordUpdate,
     VocabularyStats,
     WordCreate,
     WordResponse,
+    WordSuggestion,
 )
 
 __all__ = [
@@ -42,16 +52,26 @@ __all__ = [
     # Word
     "WordCreate",
     "WordResponse",
+    "WordSuggestion",
     "UserWordCreate",
+    "UserWordBulkCreate",
+    "UserWordBulkResult",
     "UserWordUpdate",
     "UserWordResponse",
     "ReviewAnswer",
+    "ReviewBatch",
+    "ReviewBatchItem",
     "ReviewResponse",
+    "ReviewCard",
+    "ReviewSessionCreate",
+    "ReviewSessionResponse",
+    "ReviewSessionProgress",
+    "ReviewForecast",
+    "ReviewForecastDay",
     "VocabularyStats",
     # Chat
     "ChatSessionCreate",
     "ChatSessionResponse",
-    "ChatSessionWithMessages",
     "MessageCreate",
     "MessageResponse",
     "ChatResponse",
@@ -50,12 +50,6 @@ class ChatSessionResponse(BaseModel):
     updated_at: datetime
 
 
-class ChatSessionWithMessages(ChatSessionResponse):
-    """Schema for chat session with messages."""
-
-    messages: list[MessageResponse]
-
-
 class ChatResponse(BaseModel):
     """Schema for chat completion response."""
 
@@ -6,7 +6,7 @@ from datetime import datetime
 
 from pydantic import BaseModel, ConfigDict, EmailStr, Field
 
-from src.models.user import AIProvider, CEFRLevel
+from src.models.user import AIProvider, CEFRLevel, SchedulerType
 
 
 # Common timezone options
@@ -54,6 +54,8 @@ class UserUpdate(BaseModel):
     display_name: str | None = Field(None, max_length=100)
     preferred_ai_provider: AIProvider | None = None
     timezone: str | None = Field(None, max_length=50)
+    # null switches back to the server default
+    scheduler: SchedulerType | None = None
 
 
 class UserResponse(UserBase):
@@ -69,6 +71,7 @@ class UserResponse(UserBase):
     speaking_level: CEFRLevel
     preferred_ai_provider: AIProvider
     timezone: str
+    scheduler: SchedulerType | None
     is_active: bool
     created_at: datetime
 
@@ -2,12 +2,14 @@
 Vocabulary word Pydantic schemas.
 """
 
-from datetime import datetime
+from datetime import date, datetime
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 from src.models.word import Gender, PartOfSpeech, WordStatus
 
+MAX_REVIEW_BATCH_SIZE = 200
+
 
 class WordBase(BaseModel):
     """Base word schema."""
@@ -39,6 +41,16 @@ class WordResponse(WordBase):
     created_at: datetime
 
 
+class WordSuggestion(BaseModel):
+    """Schema for a compact autocomplete suggestion."""
+
+    id: int
+    swedish: str
+    english: str
+    part_of_speech: PartOfSpeech | None
+    cefr_level: str
+
+
 class UserWordBase(BaseModel):
     """Base user word schema."""
 
@@ -52,6 +64,34 @@ class UserWordCreate(BaseModel):
     word_id: int
 
 
+class UserWordBulkCreate(BaseModel):
+    """Schema for adding every dictionary word matching a filter."""
+
+    cefr_level: str | None = Field(None, max_length=2)
+    part_of_speech: PartOfSpeech | None = None
+    min_frequency_rank: int | None = Field(None, ge=1)
+    max_frequency_rank: int | None = Field(None, ge=1)
+
+    @model_validator(mode="after")
+    def check_filters(self) -> "UserWordBulkCreate":
+        """Require at least one filter and a non-empty frequency range."""
+        if all(value is None for value in self.model_dump().values()):
+            raise ValueError("At least one filter is required")
+        if (
+            self.min_frequency_rank is not None
+            and self.max_frequency_rank is not None
+            and self.min_frequency_rank > self.max_frequency_rank
+        ):
+            raise ValueError("min_frequency_rank must not exceed max_frequency_rank")
+        return self
+
+
+class UserWordBulkResult(BaseModel):
+    """Schema for the result of a bulk add."""
+
+    added: int
+
+
 class UserWordUpdate(BaseModel):
     """Schema for updating user's word progress."""
 
@@ -83,6 +123,66 @@ class ReviewAnswer(BaseModel):
     """Schema for submitting a review answer."""
 
     quality: int = Field(ge=0, le=5, description="Answer quality: 0=blackout, 5=perfect")
+    response_ms: int | None = Field(
+        None, ge=0, le=3_600_000, description="Time taken to answer, in milliseconds"
+    )
+
+
+class ReviewBatchItem(ReviewAnswer):
+    """Schema for a single answer within a batch review submission."""
+
+    user_word_id: int
+    answered_at: datetime | None = Field(
+        None, description="When the card was answered (defaults to submission time)"
+    )
+
+
+class ReviewBatch(BaseModel):
+    """Schema for submitting a whole review session at once."""
+
+    reviews: list[ReviewBatchItem] = Field(min_length=1, max_length=MAX_REVIEW_BATCH_SIZE)
+
+
+class ReviewSessionCreate(BaseModel):
+    """Schema for starting a review session."""
+
+    limit: int = Field(50, ge=1, le=100, description="Maximum number of due cards")
+    new_limit: int = Field(10, ge=0, le=50, description="Maximum number of new cards")
+    window: int = Field(5, ge=1, le=20, description="Cards returned per prefetch window")
+
+
+class ReviewCard(BaseModel):
+    """Schema for a compact card in a review session."""
+
+    user_word_id: int
+    word_id: int
+    swedish: str
+    english: str
+    pronunciation: str | None
+    part_of_speech: PartOfSpeech | None
+    gender: Gender | None
+    example_sv: str | None
+    example_en: str | None
+    status: WordStatus
+    interval_days: int
+
+
+class ReviewSessionResponse(BaseModel):
+    """Schema for a review session and its next prefetch window."""
+
+    session_id: str
+    total_cards: int
+    answered: int
+    remaining: int
+    cards: list[ReviewCard]
+
+
+class ReviewSessionProgress(BaseModel):
+    """Schema for the state of a session after an answer."""
+
+    answered: int
+    remaining: int
+    requeued: bool
 
 
 class ReviewResponse(BaseModel):
@@ -94,6 +194,22 @@ class ReviewResponse(BaseModel):
     interval_days: int
 
 
+class ReviewForecastDay(BaseModel):
+    """Schema for the number of reviews due on one day."""
+
+    day: date
+    due: int
+
+
+class ReviewForecast(BaseModel):
+    """Schema for a day-by-day review forecast in the user's time zone."""
+
+    timezone: str
+    simulated: bool
+    new_cards: int
+    days: list[ReviewForecastDay]
+
+
 class VocabularyStats(BaseModel):
     """Schema for vocabulary statistics."""
 
@@ -0,0 +1,163 @@
+"""
+Fit FSRS scheduler weights to the review_events history.
+
+Fits one global weight vector (printed as JSON for the FSRS_WEIGHTS
+setting). With --per-user it also fits every user with at least
+--min-reviews predicted reviews, starting from the global fit, and keeps the
+per-user weights only where they beat the global ones on that user's
+history. --write stores them in users.scheduler_weights.
+
+Run with: python -m src.scripts.fit_scheduler_weights [--per-user] [--write] [--since DATE]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+from datetime import UTC, date, datetime
+
+import numpy as np
+from sqlalchemy import select, update
+
+from src.db.session import async_session_maker
+from src.models.user import User
+from src.models.word import ReviewEvent
+from src.services.fsrs import (
+    DEFAULT_WEIGHTS,
+    ReviewHistory,
+    build_review_history,
+    fit_fsrs_weights,
+    fsrs_log_loss,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EPOCHS = 100
+DEFAULT_MIN_REVIEWS = 500
+STREAM_CHUNK_SIZE = 50_000
+
+
+async def load_review_columns(since: date | None = None) -> dict[str, np.ndarray]:
+    """Stream (user_id, word_id, reviewed_at, quality) sorted by card and time."""
+    query = select(
+        ReviewEvent.user_id,
+        ReviewEvent.word_id,
+        ReviewEvent.reviewed_at,
+        ReviewEvent.quality,
+    ).order_by(ReviewEvent.user_id, ReviewEvent.word_id, ReviewEvent.reviewed_at)
+    if since:
+        query = query.where(
+            ReviewEvent.reviewed_at >= datetime.combine(since, datetime.min.time(), UTC)
+        )
+
+    chunks: dict[str, list[np.ndarray]] = {
+        "user_id": [],
+        "word_id": [],
+        "reviewed_at": [],
+        "quality": [],
+    }
+    async with async_session_maker() as session:
+        result = await session.stream(query.execution_options(yield_per=STREAM_CHUNK_SIZE))
+        async for partition in result.partitions():
+            user_ids, word_ids, reviewed_at, quality = zip(*partition, strict=True)
+            chunks["user_id"].append(np.array(user_ids, dtype=np.int64))
+            chunks["word_id"].append(np.array(word_ids, dtype=np.int64))
+            chunks["reviewed_at"].append(
+                np.array(
+                    [
+                        value.astimezone(UTC).replace(tzinfo=None) if value.tzinfo else value
+                        for value in reviewed_at
+                    ],
+                    dtype="datetime64[us]",
+                )
+            )
+            chunks["quality"].append(np.array(quality, dtype=np.int64))
+
+    return {
+        name: np.concatenate(parts) if parts else np.array([], dtype=np.int64)
+        for name, parts in chunks.items()
+    }
+
+
+def history_for(columns: dict[str, np.ndarray], mask: np.ndarray | None = None) -> ReviewHistory:
+    """ReviewHistory of all loaded answers, or of the rows selected by mask."""
+    if mask is not None:
+        columns = {name: values[mask] for name, values in columns.items()}
+    card_key = columns["user_id"] * 2**32 + columns["word_id"]
+    return build_review_history(card_key, columns["reviewed_at"], columns["quality"])
+
+
+async def fit_scheduler_weights(
+    since: date | None = None,
+    epochs: int = DEFAULT_EPOCHS,
+    per_user: bool = False,
+    min_reviews: int = DEFAULT_MIN_REVIEWS,
+    write: bool = False,
+) -> list[float]:
+    """Fit and report global (and optionally per-user) weights; returns the global ones."""
+    started = time.perf_counter()
+    columns = await load_review_columns(since)
+    history = history_for(columns)
+    logger.info(
+        "Loaded %d reviews of %d cards (%d predictions)",
+        len(history.card),
+        history.card_count,
+        history.predictions,
+    )
+
+    default_weights = np.array(DEFAULT_WEIGHTS)
+    weights, loss = fit_fsrs_weights(history, default_weights, epochs=epochs)
+    logger.info(
+        "Global log loss %.4f -> %.4f in %.1fs",
+        fsrs_log_loss(default_weights, history),
+        loss,
+        time.perf_counter() - started,
+    )
+
+    if per_user:
+        user_weights = {}
+        for user_id in np.unique(columns["user_id"]).tolist():
+            user_history = history_for(columns, columns["user_id"] == user_id)
+            if user_history.predictions < min_reviews:
+                continue
+            global_loss = fsrs_log_loss(weights, user_history)
+            fitted, fitted_loss = fit_fsrs_weights(user_history, weights, epochs=epochs // 2)
+            logger.info("user %d: log loss %.4f -> %.4f", user_id, global_loss, fitted_loss)
+            if fitted_loss < global_loss:
+                user_weights[user_id] = [round(value, 4) for value in fitted.tolist()]
+
+        logger.info("%d users get their own weights", len(user_weights))
+        if write and user_weights:
+            async with async_session_maker() as session:
+                await session.execute(
+                    update(User),
+                    [
+                        {"id": user_id, "scheduler_weights": values}
+                        for user_id, values in user_weights.items()
+                    ],
+                )
+                await session.commit()
+
+    return [round(value, 4) for value in weights.tolist()]
+
+
+def main() -> None:
+    """Parse CLI arguments and fit the weights."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--since", type=date.fromisoformat, help="Only use reviews from this day")
+    parser.add_argument("--epochs", type=int, default=DEFAULT_EPOCHS)
+    parser.add_argument("--per-user", action="store_true", help="Also fit per-user weights")
+    parser.add_argument("--min-reviews", type=int, default=DEFAULT_MIN_REVIEWS)
+    parser.add_argument("--write", action="store_true", help="Store per-user weights")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    weights = asyncio.run(
+        fit_scheduler_weights(args.since, args.epochs, args.per_user, args.min_reviews, args.write)
+    )
+    print(json.dumps(weights))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,362 @@
+"""
+Streaming bulk importer for dictionary words (CSV, TSV or JSONL).
+
+Rows are read from disk in constant memory, validated against WordCreate in
+batches and upserted on the natural key (swedish, part_of_speech). On
+PostgreSQL each batch is loaded with asyncpg COPY into a temporary staging
+table and merged with a single INSERT ... SELECT ... ON CONFLICT; other
+databases fall back to a multi-row upsert.
+
+Each batch commits together with a byte-offset checkpoint written next to
+the input file. After a crash, re-running the same command resumes from the
+last committed batch. Re-importing rows is harmless: the upsert converges to
+the same rows (and on PostgreSQL skips rows whose values did not change).
+
+Once the import is done (including one resumed from a checkpoint) the
+dictionary index is rebuilt as a new generation, which running workers pick
+up without restarting.
+
+Columns/keys are the WordCreate fields: swedish, english, pronunciation,
+part_of_speech, gender, cefr_level, frequency_rank, example_sv, example_en, notes.
+
+Run with: python -m src.scripts.import_words words.tsv [--batch-size N] [--restart]
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import logging
+import os
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, cast
+
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import CursorResult, func, literal_column, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db.session import async_session_maker, get_dialect_name
+from src.db.upsert import dialect_insert
+from src.models.word import Word
+from src.schemas.word import WordCreate
+from src.services.dictionary_index import rebuild_dictionary_index
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 5_000
+# Rows per multi-row INSERT in the fallback path (bound-parameter limits)
+INSERT_CHUNK_ROWS = 500
+CHECKPOINT_SUFFIX = ".checkpoint"
+FORMATS = {".csv": "csv", ".tsv": "tsv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+WORD_COLUMNS = list(WordCreate.model_fields)
+UPDATE_COLUMNS = [column for column in WORD_COLUMNS if column not in ("swedish", "part_of_speech")]
+STAGING_TABLE = "words_import_staging"
+
+CREATE_STAGING_SQL = f"""
+    CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} (
+        seq bigint NOT NULL,
+        swedish varchar(100) NOT NULL,
+        english varchar(255) NOT NULL,
+        pronunciation varchar(100),
+        part_of_speech varchar(20),
+        gender varchar(3),
+        cefr_level varchar(2) NOT NULL,
+        frequency_rank integer,
+        example_sv text,
+        example_en text,
+        notes text
+    ) ON COMMIT DELETE ROWS
+"""
+
+# DISTINCT ON keeps the last occurrence of a key within the batch, since
+# ON CONFLICT cannot touch the same row twice in one statement. The WHERE
+# clause skips no-op updates so re-imports do not rewrite unchanged rows.
+MERGE_STAGING_SQL = f"""
+    INSERT INTO words ({", ".join(WORD_COLUMNS)})
+    SELECT DISTINCT ON (swedish, coalesce(part_of_speech, '')) {", ".join(WORD_COLUMNS)}
+    FROM {STAGING_TABLE}
+    ORDER BY swedish, coalesce(part_of_speech, ''), seq DESC
+    ON CONFLICT (swedish, coalesce(part_of_speech, '')) DO UPDATE SET
+        {", ".join(f"{column} = EXCLUDED.{column}" for column in UPDATE_COLUMNS)}
+    WHERE ({", ".join(f"words.{column}" for column in UPDATE_COLUMNS)})
+        IS DISTINCT FROM ({", ".join(f"EXCLUDED.{column}" for column in UPDATE_COLUMNS)})
+"""
+
+_batch_adapter = TypeAdapter(list[WordCreate])
+
+
+@dataclass
+class ImportStats:
+    """Running totals for one import."""
+
+    read: int = 0
+    rejected: int = 0
+    written: int = 0
+
+
+# ============================================================================
+# Reading
+# ============================================================================
+
+
+class OffsetLineReader:
+    """Iterates decoded lines while tracking the byte offset after each one."""
+
+    def __init__(self, handle: BinaryIO):
+        self._handle = handle
+        self.offset = handle.tell()
+
+    def __iter__(self) -> Iterator[str]:
+        while line := self._handle.readline():
+            self.offset = self._handle.tell()
+            yield line.decode("utf-8")
+
+
+def read_records(
+    handle: BinaryIO, file_format: str, start_offset: int
+) -> Iterator[tuple[dict[str, Any], int]]:
+    """
+    Yield (record, byte offset just past the record) from start_offset on.
+
+    For CSV/TSV the header line is always read first, so start_offset may
+    point anywhere after it.
+    """
+    if file_format == "jsonl":
+        handle.seek(start_offset)
+        reader = OffsetLineReader(handle)
+        for line in reader:
+            if line.strip():
+                yield json.loads(line), reader.offset
+        return
+
+    delimiter = "\t" if file_format == "tsv" else ","
+    handle.seek(0)
+    header_reader = OffsetLineReader(handle)
+    header = next(csv.reader(header_reader, delimiter=delimiter), None)
+    if header is None:
+        return
+    handle.seek(max(start_offset, header_reader.offset))
+
+    reader = OffsetLineReader(handle)
+    # csv pulls lines lazily, so reader.offset is the end of the row just parsed
+    for row in csv.DictReader(reader, fieldnames=header, delimiter=delimiter):
+        # Empty cells mean "not set" for the optional fields
+        record = {
+            key: value for key, value in row.items() if key is not None and value not in ("", None)
+        }
+        yield record, reader.offset
+
+
+def validate_batch(records: list[dict[str, Any]], first_line: int) -> tuple[list[WordCreate], int]:
+    """
+    Validate a batch at once, falling back to row-by-row to isolate bad rows.
+
+    Returns:
+        Valid rows and the number of rejected rows
+    """
+    try:
+        return _batch_adapter.validate_python(records), 0
+    except ValidationError:
+        pass
+
+    valid = []
+    for position, record in enumerate(records):
+        try:
+            valid.append(WordCreate.model_validate(record))
+        except ValidationError as exc:
+            logger.warning("Skipping record %d: %s", first_line + position, exc.errors()[0]["msg"])
+    return valid, len(records) - len(valid)
+
+
+# ============================================================================
+# Loading
+# ============================================================================
+
+
+async def load_batch_copy(session: AsyncSession, words: list[WordCreate], first_seq: int) -> int:
+    """COPY a batch into the staging table and merge it into words (PostgreSQL)."""
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+    asyncpg_connection = raw_connection.driver_connection
+    assert asyncpg_connection is not None
+
+    await session.execute(text(CREATE_STAGING_SQL))
+    await asyncpg_connection.copy_records_to_table(
+        STAGING_TABLE,
+        records=[
+            (first_seq + position, *word.model_dump(mode="json").values())
+            for position, word in enumerate(words)
+        ],
+        columns=["seq", *WORD_COLUMNS],
+    )
+    result = cast(CursorResult[Any], await session.execute(text(MERGE_STAGING_SQL)))
+    return result.rowcount
+
+
+async def load_batch_insert(session: AsyncSession, words: list[WordCreate]) -> int:
+    """Multi-row upsert for databases without COPY."""
+    # Last occurrence wins, as with the staging merge
+    rows = list(
+        {
+            (word.swedish, word.part_of_speech or ""): word.model_dump(mode="json")
+            for word in words
+        }.values()
+    )
+    written = 0
+    for start in range(0, len(rows), INSERT_CHUNK_ROWS):
+        stmt = dialect_insert(get_dialect_name(session), Word).values(
+            rows[start : start + INSERT_CHUNK_ROWS]
+        )
+        stmt = stmt.on_conflict_do_update(
+            # Literal '' (not a bound parameter) so the target matches the index expression
+            index_elements=[Word.swedish, func.coalesce(Word.part_of_speech, literal_column("''"))],
+            set_={column: stmt.excluded[column] for column in UPDATE_COLUMNS},
+        )
+        result = cast(CursorResult[Any], await session.execute(stmt))
+        written += result.rowcount
+    return written
+
+
+# ============================================================================
+# Checkpoints
+# ============================================================================
+
+
+def read_checkpoint(checkpoint_path: Path, input_path: Path) -> int:
+    """Byte offset to resume from, or 0 if no checkpoint matches this file."""
+    if not checkpoint_path.exists():
+        return 0
+    checkpoint = json.loads(checkpoint_path.read_text())
+    if checkpoint.get("size") != input_path.stat().st_size:
+        logger.warning("Ignoring checkpoint for a different version of %s", input_path)
+        return 0
+    return int(checkpoint["offset"])
+
+
+def write_checkpoint(checkpoint_path: Path, input_path: Path, offset: int) -> None:
+    """Atomically record the offset of the last committed batch."""
+    temporary_path = checkpoint_path.with_name(checkpoint_path.name + ".tmp")
+    temporary_path.write_text(json.dumps({"size": input_path.stat().st_size, "offset": offset}))
+    os.replace(temporary_path, checkpoint_path)
+
+
+# ============================================================================
+# Import
+# ============================================================================
+
+
+async def import_words(
+    input_path: Path,
+    file_format: str | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    checkpoint_path: Path | None = None,
+    restart: bool = False,
+) -> ImportStats:
+    """
+    Import a word list, resuming from its checkpoint if one exists.
+
+    Args:
+        input_path: CSV, TSV or JSONL file
+        file_format: "csv", "tsv" or "jsonl" (default: from the file extension)
+        batch_size: Rows validated and committed per batch
+        checkpoint_path: Defaults to the input path plus ".checkpoint"
+        restart: Ignore an existing checkpoint and start from the beginning
+
+    Returns:
+        Row counts for this run
+    """
+    file_format = file_format or FORMATS.get(input_path.suffix.lower())
+    if file_format is None or file_format not in FORMATS.values():
+        raise ValueError(f"Cannot infer the format of {input_path}; pass --format")
+    checkpoint_path = checkpoint_path or input_path.with_name(input_path.name + CHECKPOINT_SUFFIX)
+
+    start_offset = 0 if restart else read_checkpoint(checkpoint_path, input_path)
+    if start_offset:
+        logger.info("Resuming %s at byte %d", input_path, start_offset)
+
+    stats = ImportStats()
+    started = time.perf_counter()
+
+    async with async_session_maker() as session:
+        use_copy = get_dialect_name(session) == "postgresql"
+
+        async def flush(records: list[dict[str, Any]], offset: int) -> None:
+            words, rejected = validate_batch(records, stats.read - len(records) + 1)
+            stats.rejected += rejected
+            if words:
+                if use_copy:
+                    stats.written += await load_batch_copy(session, words, stats.read)
+                else:
+                    stats.written += await load_batch_insert(session, words)
+            await session.commit()
+            write_checkpoint(checkpoint_path, input_path, offset)
+            logger.info(
+                "Imported %d rows (%d rejected, %.0f rows/s)",
+                stats.read,
+                stats.rejected,
+                stats.read / (time.perf_counter() - started),
+            )
+
+        with input_path.open("rb") as handle:
+            batch: list[dict[str, Any]] = []
+            offset = start_offset
+            for record, offset in read_records(handle, file_format, start_offset):
+                batch.append(record)
+                stats.read += 1
+                if len(batch) >= batch_size:
+                    await flush(batch, offset)
+                    batch = []
+            if batch:
+                await flush(batch, offset)
+
+        # A resumed run also rebuilds: the interrupted run committed batches
+        # but may have died before its rebuild
+        if stats.written or start_offset:
+            # A full rebuild rather than add_entries: upserts also change words
+            # the index already has. It publishes a new generation file, so
+            # workers that have the current one mapped are unaffected.
+            await rebuild_dictionary_index(session)
+
+    checkpoint_path.unlink(missing_ok=True)
+    elapsed = time.perf_counter() - started
+    logger.info(
+        "Done: %d rows read, %d written, %d rejected in %.1fs (%.0f rows/s)",
+        stats.read,
+        stats.written,
+        stats.rejected,
+        elapsed,
+        stats.read / elapsed if elapsed else 0.0,
+    )
+    return stats
+
+
+def main() -> None:
+    """Parse CLI arguments and run the importer."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("input", type=Path, help="CSV, TSV or JSONL word list")
+    parser.add_argument("--format", choices=sorted(set(FORMATS.values())))
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--checkpoint", type=Path, help="Checkpoint file location")
+    parser.add_argument(
+        "--restart", action="store_true", help="Ignore any checkpoint and start over"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    asyncio.run(
+        import_words(
+            args.input,
+            file_format=args.format,
+            batch_size=args.batch_size,
+            checkpoint_path=args.checkpoint,
+            restart=args.restart,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Maintenance job for the review_events log.
+
+In order, each in its own transaction:
+1. create monthly partitions ahead of time (PostgreSQL)
+2. roll events up into review_daily_rollups (by default yesterday and today)
+3. drop raw events older than the retention window
+
+Rollups run before retention so a day is always aggregated before its raw
+events can expire. Meant to run daily from cron.
+
+Run with: python -m src.scripts.maintain_review_events [--since YYYY-MM-DD] [--skip-retention]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from datetime import UTC, date, datetime, timedelta
+
+from src.db.session import async_session_maker
+from src.services.review_events import (
+    apply_review_event_retention,
+    ensure_review_event_partitions,
+    rollup_review_events,
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def maintain_review_events(since: date | None = None, retention: bool = True) -> None:
+    """Run partition creation, rollups and (optionally) retention."""
+    started = time.perf_counter()
+    today = datetime.now(UTC).date()
+
+    async with async_session_maker() as session:
+        created = await ensure_review_event_partitions(session, today)
+        await session.commit()
+    if created:
+        logger.info("Created partitions: %s", ", ".join(created))
+
+    since = since or today - timedelta(days=1)
+    async with async_session_maker() as session:
+        written = await rollup_review_events(session, since, today + timedelta(days=1))
+        await session.commit()
+    logger.info("Rolled up %s..%s into %d rows", since, today, written)
+
+    if retention:
+        async with async_session_maker() as session:
+            dropped, deleted = await apply_review_event_retention(session, today)
+            await session.commit()
+        logger.info(
+            "Retention dropped %d partitions (%s) and deleted %d rows",
+            len(dropped),
+            ", ".join(dropped) or "none",
+            deleted,
+        )
+
+    logger.info("Review event maintenance finished in %.2fs", time.perf_counter() - started)
+
+
+def main() -> None:
+    """Parse CLI arguments and run the maintenance job."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--since",
+        type=date.fromisoformat,
+        help="First UTC day to roll up (default: yesterday); use to backfill",
+    )
+    parser.add_argument(
+        "--skip-retention", action="store_true", help="Do not delete expired events"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    asyncio.run(maintain_review_events(args.since, retention=not args.skip_retention))
+
+
+if __name__ == "__main__":
+    main()
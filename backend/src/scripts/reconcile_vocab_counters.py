@@ -0,0 +1,72 @@
+"""
+Rebuild or verify the user_vocab_counters table against user_words.
+
+Rebuilding recomputes every counter with one INSERT ... SELECT ... GROUP BY.
+With --verify nothing is written; mismatches are logged and the exit status
+is 1 if any were found, so the check can run from cron or CI.
+
+Run with: python -m src.scripts.reconcile_vocab_counters [--verify] [--user-id ID ...]
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+
+from src.db.session import async_session_maker
+from src.services.vocab_counters import find_counter_mismatches, rebuild_vocab_counters
+
+logger = logging.getLogger(__name__)
+
+
+async def verify_counters(user_ids: list[int] | None = None) -> int:
+    """Log every counter that disagrees with user_words and return how many did."""
+    async with async_session_maker() as session:
+        mismatches = await find_counter_mismatches(session, user_ids)
+
+    for user_id, status, counter_value, live_count in mismatches:
+        logger.warning(
+            "user %d status %s: counter=%d actual=%d",
+            user_id,
+            status,
+            counter_value,
+            live_count,
+        )
+    logger.info("Found %d mismatched counters", len(mismatches))
+    return len(mismatches)
+
+
+async def rebuild_counters(user_ids: list[int] | None = None) -> int:
+    """Recompute counters in one transaction and return the rows written."""
+    started = time.perf_counter()
+    async with async_session_maker() as session:
+        written = await rebuild_vocab_counters(session, user_ids)
+        await session.commit()
+
+    logger.info("Rebuilt %d counter rows in %.2fs", written, time.perf_counter() - started)
+    return written
+
+
+def main() -> None:
+    """Parse CLI arguments and rebuild or verify the counters."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--verify", action="store_true", help="Only compare, do not write")
+    parser.add_argument(
+        "--user-id",
+        type=int,
+        action="append",
+        dest="user_ids",
+        help="Limit to this user (repeatable)",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    if args.verify:
+        mismatches = asyncio.run(verify_counters(args.user_ids))
+        sys.exit(1 if mismatches else 0)
+    asyncio.run(rebuild_counters(args.user_ids))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""
+Bulk rescheduling script that replays review history through the vectorized SM-2 engine.
+
+Streams `user_words` in primary-key order, merges each chunk with a review
+history file and recomputes the SRS columns with calculate_sm2_batch.
+
+The history file is a CSV with the columns `user_word_id,quality,reviewed_at`
+(ISO 8601 timestamps), sorted by `user_word_id` and then `reviewed_at`. The
+file is checked for that order before anything is written; an unsorted file is
+rejected rather than partly replayed.
+
+Run with: python -m src.scripts.reschedule_words history.csv [--reset] [--dry-run]
+"""
+
+import argparse
+import asyncio
+import csv
+import logging
+import time
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from sqlalchemy import select, update
+
+from src.db.session import async_session_maker
+from src.models.word import UserWord
+from src.services.srs import calculate_sm2_batch
+from src.services.vocab_counters import rebuild_vocab_counters
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 10_000
+
+# SM-2 starting state, matching the UserWord column defaults
+INITIAL_EASE_FACTOR = 2.5
+INITIAL_INTERVAL_DAYS = 1
+INITIAL_REPETITION_NUMBER = 0
+
+
+@dataclass
+class HistoryEvent:
+    """One answer from the review history file."""
+
+    user_word_id: int
+    quality: int
+    reviewed_at: datetime
+
+
+class HistoryReader:
+    """Sequential reader that hands out history events chunk by chunk."""
+
+    def __init__(self, rows: Iterator[HistoryEvent]):
+        self._rows = rows
+        self._pending: HistoryEvent | None = next(self._rows, None)
+
+    def take_until(self, max_user_word_id: int) -> list[HistoryEvent]:
+        """Consume every event whose user_word_id is <= max_user_word_id."""
+        events = []
+        while self._pending and self._pending.user_word_id <= max_user_word_id:
+            events.append(self._pending)
+            self._pending = next(self._rows, None)
+        return events
+
+
+def read_history(path: Path) -> Iterator[HistoryEvent]:
+    """
+    Stream review events from a CSV file.
+
+    Raises:
+        ValueError: If a row comes before the previous one in
+            (user_word_id, reviewed_at) order
+    """
+    previous: tuple[int, datetime] | None = None
+    with path.open(newline="", encoding="utf-8") as history_file:
+        reader = csv.DictReader(history_file)
+        for row in reader:
+            reviewed_at = datetime.fromisoformat(row["reviewed_at"])
+            if reviewed_at.tzinfo is None:
+                reviewed_at = reviewed_at.replace(tzinfo=UTC)
+            event = HistoryEvent(
+                user_word_id=int(row["user_word_id"]),
+                quality=int(row["quality"]),
+                reviewed_at=reviewed_at,
+            )
+            order = (event.user_word_id, event.reviewed_at)
+            if previous is not None and order < previous:
+                raise ValueError(
+                    f"{path}:{reader.line_num}: history is not sorted by user_word_id, reviewed_at"
+                )
+            previous = order
+            yield event
+
+
+def replay_chunk(
+    cards: Sequence[Any], events: list[HistoryEvent], reset: bool
+) -> list[dict[str, Any]]:
+    """
+    Apply a chunk of review events to its cards.
+
+    Events are grouped into rounds (the k-th answer of every card) so each
+    round is a single vectorized SM-2 call.
+
+    Returns:
+        Update parameter dicts for every card that had at least one event
+    """
+    position = {card.id: index for index, card in enumerate(cards)}
+    events = [event for event in events if event.user_word_id in position]
+    if not events:
+        return []
+
+    card_count = len(cards)
+    event_card = np.fromiter((position[e.user_word_id] for e in events), np.int64, len(events))
+    event_quality = np.fromiter((e.quality for e in events), np.int64, len(events))
+    event_time = np.array(
+        [e.reviewed_at.astimezone(UTC).replace(tzinfo=None) for e in events],
+        dtype="datetime64[us]",
+    )
+
+    if reset:
+        ease_factor = np.full(card_count, INITIAL_EASE_FACTOR)
+        interval_days = np.full(card_count, INITIAL_INTERVAL_DAYS, dtype=np.int64)
+        repetition_number = np.full(card_count, INITIAL_REPETITION_NUMBER, dtype=np.int64)
+        times_seen = np.zeros(card_count, dtype=np.int64)
+        times_correct = np.zeros(card_count, dtype=np.int64)
+        times_incorrect = np.zeros(card_count, dtype=np.int64)
+    else:
+        ease_factor = np.array([card.ease_factor for card in cards], dtype=np.float64)
+        interval_days = np.array([card.interval_days for card in cards], dtype=np.int64)
+        repetition_number = np.array([card.repetition_number for card in cards], dtype=np.int64)
+        times_seen = np.array([card.times_seen for card in cards], dtype=np.int64)
+        times_correct = np.array([card.times_correct for card in cards], dtype=np.int64)
+        times_incorrect = np.array([card.times_incorrect for card in cards], dtype=np.int64)
+
+    next_review = np.full(card_count, np.datetime64("NaT"), dtype="datetime64[us]")
+    status = np.full(card_count, "", dtype="<U13")
+
+    # Events arrive sorted by card, so an event's round is its offset in its group
+    group_start = np.flatnonzero(np.r_[True, event_card[1:] != event_card[:-1]])
+    group_size = np.diff(np.r_[group_start, len(events)])
+    event_round = np.arange(len(events)) - np.repeat(group_start, group_size)
+
+    for round_number in range(int(event_round.max()) + 1):
+        in_round = event_round == round_number
+        targets = event_card[in_round]
+        result = calculate_sm2_batch(
+            event_quality[in_round],
+            ease_factor[targets],
+            interval_days[targets],
+            repetition_number[targets],
+            reviewed_at=event_time[in_round],
+        )
+        ease_factor[targets] = result.ease_factor
+        interval_days[targets] = result.interval_days
+        repetition_number[targets] = result.repetition_number
+        next_review[targets] = result.next_review
+        status[targets] = result.status
+
+    correct = event_quality >= 3
+    times_seen += np.bincount(event_card, minlength=card_count)
+    times_correct += np.bincount(event_card[correct], minlength=card_count)
+    times_incorrect += np.bincount(event_card[~correct], minlength=card_count)
+    last_reviewed = np.full(card_count, np.datetime64("NaT"), dtype="datetime64[us]")
+    last_reviewed[event_card[group_start + group_size - 1]] = event_time[
+        group_start + group_size - 1
+    ]
+
+    touched = np.unique(event_card)
+    return [
+        {
+            "id": cards[index].id,
+            "ease_factor": ef,
+            "interval_days": interval,
+            "repetition_number": repetition,
+            "next_review": next_at.replace(tzinfo=UTC),
+            "last_reviewed": last_at.replace(tzinfo=UTC),
+            "status": card_status,
+            "times_seen": seen_count,
+            "times_correct": correct_count,
+            "times_incorrect": incorrect_count,
+        }
+        for index, ef, interval, repetition, next_at, last_at, card_status, seen_count, correct_count, incorrect_count in zip(
+            touched.tolist(),
+            ease_factor[touched].tolist(),
+            interval_days[touched].tolist(),
+            repetition_number[touched].tolist(),
+            next_review[touched].tolist(),
+            last_reviewed[touched].tolist(),
+            status[touched].tolist(),
+            times_seen[touched].tolist(),
+            times_correct[touched].tolist(),
+            times_incorrect[touched].tolist(),
+            strict=True,
+        )
+    ]
+
+
+async def reschedule_words(
+    history_path: Path,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    reset: bool = False,
+    dry_run: bool = False,
+) -> int:
+    """
+    Replay review history into user_words chunk by chunk.
+
+    Args:
+        history_path: CSV review history sorted by user_word_id, reviewed_at
+        chunk_size: Number of user_words rows loaded per chunk
+        reset: Start every replayed card from the initial SM-2 state
+        dry_run: Compute the new state without writing it
+
+    Returns:
+        Number of rescheduled cards
+    """
+    # Validate the whole file first so an unsorted one fails before any chunk is written
+    for _ in read_history(history_path):
+        pass
+
+    history = HistoryReader(read_history(history_path))
+    last_id = 0
+    rescheduled = 0
+    started = time.perf_counter()
+
+    async with async_session_maker() as session:
+        while True:
+            result = await session.execute(
+                select(
+                    UserWord.id,
+                    UserWord.ease_factor,
+                    UserWord.interval_days,
+                    UserWord.repetition_number,
+                    UserWord.times_seen,
+                    UserWord.times_correct,
+                    UserWord.times_incorrect,
+                )
+                .where(UserWord.id > last_id)
+                .order_by(UserWord.id)
+                .limit(chunk_size)
+            )
+            cards = result.all()
+            if not cards:
+                break
+            last_id = cards[-1].id
+
+            updates = replay_chunk(cards, history.take_until(last_id), reset)
+            if updates and not dry_run:
+                await session.execute(update(UserWord), updates)
+                await session.commit()
+            rescheduled += len(updates)
+
+            logger.info(
+                "Rescheduled %d cards (%.0f cards/s)",
+                rescheduled,
+                rescheduled / (time.perf_counter() - started),
+            )
+
+    # Replays can move cards between statuses
+    if rescheduled and not dry_run:
+        async with async_session_maker() as session:
+            await rebuild_vocab_counters(session)
+            await session.commit()
+
+    return rescheduled
+
+
+def main() -> None:
+    """Parse CLI arguments and run the rescheduler."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("history", type=Path, help="Review history CSV file")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--reset", action="store_true", help="Replay from the initial SM-2 state")
+    parser.add_argument("--dry-run", action="store_true", help="Do not write any changes")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    asyncio.run(
+        reschedule_words(
+            args.history,
+            chunk_size=args.chunk_size,
+            reset=args.reset,
+            dry_run=args.dry_run,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,463 @@
+"""
+AI provider clients for the chatbots.
+
+Every provider streams the assistant reply as text chunks (tokens) so the
+chat service can forward them as they arrive. Claude and OpenAI are called
+over their HTTP streaming APIs; the fake provider emits a canned reply with
+configurable delays for local development, tests and benchmarks.
+
+Each HTTP provider has one ProviderPool per worker: a long-lived HTTP/2
+client, a concurrency semaphore, an optional tokens-per-minute bucket and the
+table of in-flight requests. Identical requests (same model, prompt and
+conversation) that overlap share one upstream call, and every caller gets
+the whole reply. 429 and 5xx answers and connection errors are retried with
+jittered exponential backoff as long as no token has been delivered.
+"""
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import logging
+import random
+import re
+import time
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
+from typing import Any
+
+import httpx
+
+from src.core.config import get_settings
+from src.core.prometheus import AI_REQUESTS
+from src.models.user import AIProvider, User
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+ANTHROPIC_VERSION = "2023-06-01"
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 429, 500, 502, 503, 504, 529})
+# Rough prompt size for the tokens-per-minute budget
+CHARS_PER_TOKEN = 4
+
+FAKE_PROVIDER = "fake"
+FAKE_FILLER = (
+    "Det är roligt att prata svenska med dig. Vi kan öva lite mer på ord, "
+    "grammatik och uttal. Berätta gärna vad du gjorde i helgen!"
+)
+
+
+class AIProviderError(Exception):
+    """The AI provider could not produce a reply."""
+
+
+class _RetryableError(Exception):
+    """An attempt failed in a way worth retrying."""
+
+    def __init__(self, message: str, retry_after: float | None = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class ChatProvider(ABC):
+    """Streams an assistant reply for a conversation."""
+
+    name: str
+
+    @abstractmethod
+    def stream_reply(self, system: str, messages: list[dict[str, str]]) -> AsyncIterator[str]:
+        """
+        Yield the reply as text chunks.
+
+        Args:
+            system: System prompt
+            messages: Conversation so far as {"role": "user"|"assistant", "content": ...}
+        """
+
+
+# ============================================================================
+# Pools
+# ============================================================================
+
+
+class TokenBucket:
+    """
+    Tokens-per-minute limiter.
+
+    Holds up to one minute's budget and refills continuously; callers wait
+    in arrival order until their request fits.
+    """
+
+    def __init__(self, tokens_per_minute: int):
+        self.capacity = float(tokens_per_minute)
+        self.tokens = self.capacity
+        self.rate = tokens_per_minute / 60
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: int) -> None:
+        """Take tokens from the bucket, waiting for them if needed."""
+        # A request larger than the whole budget would wait forever
+        wanted = min(tokens, self.capacity)
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= wanted:
+                    self.tokens -= wanted
+                    return
+                await asyncio.sleep((wanted - self.tokens) / self.rate)
+
+
+class SharedReply:
+    """One upstream reply, replayed to every caller that asked for it."""
+
+    def __init__(self) -> None:
+        self.tokens: list[str] = []
+        self.finished = False
+        self.error: AIProviderError | None = None
+        self.subscribers = 0
+        self.task: asyncio.Task[None] | None = None
+        self._changed = asyncio.Condition()
+
+    async def push(self, token: str) -> None:
+        async with self._changed:
+            self.tokens.append(token)
+            self._changed.notify_all()
+
+    async def finish(self, error: AIProviderError | None = None) -> None:
+        async with self._changed:
+            self.finished = True
+            self.error = error
+            self._changed.notify_all()
+
+    async def subscribe(self) -> AsyncIterator[str]:
+        """All tokens from the first, then the rest as they arrive."""
+        self.subscribers += 1
+        index = 0
+        try:
+            while True:
+                async with self._changed:
+                    while index == len(self.tokens) and not self.finished:
+                        await self._changed.wait()
+                    tokens = self.tokens[index:]
+                    finished, error = self.finished, self.error
+                for token in tokens:
+                    yield token
+                index += len(tokens)
+                if finished and index == len(self.tokens):
+                    if error is not None:
+                        raise error
+                    return
+        finally:
+            self.subscribers -= 1
+            # Nobody is listening any more: stop paying for the reply
+            if not self.subscribers and self.task is not None and not self.task.done():
+                self.task.cancel()
+
+
+class ProviderPool:
+    """A provider's shared HTTP/2 client, limits and in-flight requests."""
+
+    def __init__(self, base_url: str, max_concurrency: int, tokens_per_minute: int = 0):
+        self.client = httpx.AsyncClient(
+            base_url=base_url,
+            http2=True,
+            timeout=httpx.Timeout(settings.ai_timeout_seconds, connect=10.0),
+            limits=httpx.Limits(
+                max_connections=max_concurrency, max_keepalive_connections=max_concurrency
+            ),
+        )
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.in_flight: dict[str, SharedReply] = {}
+
+    async def close(self) -> None:
+        for shared in list(self.in_flight.values()):
+            if shared.task is not None:
+                shared.task.cancel()
+        await self.client.aclose()
+
+
+_pools: dict[str, ProviderPool] = {}
+
+
+async def close_provider_pools() -> None:
+    """Close every provider's HTTP client."""
+    while _pools:
+        _, pool = _pools.popitem()
+        await pool.close()
+
+
+def retry_delay(attempt: int, retry_after: float | None = None) -> float:
+    """Full-jitter exponential backoff, never shorter than a Retry-After."""
+    ceiling = min(settings.ai_retry_max_seconds, settings.ai_retry_base_seconds * 2**attempt)
+    return max(random.uniform(0, ceiling), retry_after or 0.0)
+
+
+def _retry_after(response: httpx.Response) -> float | None:
+    with contextlib.suppress(TypeError, ValueError):
+        return float(response.headers.get("retry-after"))
+    return None
+
+
+async def _sse_data(response: httpx.Response) -> AsyncIterator[str]:
+    """Payloads of the "data:" lines of a server-sent event stream."""
+    async for line in response.aiter_lines():
+        if line.startswith("data:"):
+            yield line[5:].strip()
+
+
+class HTTPChatProvider(ChatProvider):
+    """
+    A provider reached over an HTTP streaming API through its ProviderPool.
+
+    Subclasses build the request and turn the response events into tokens.
+    """
+
+    path: str
+
+    @abstractmethod
+    def create_pool(self) -> ProviderPool:
+        """The pool for this provider, built from settings."""
+
+    @abstractmethod
+    def build_request(
+        self, system: str, messages: list[dict[str, str]]
+    ) -> tuple[dict[str, Any], dict[str, str]]:
+        """JSON body and headers of a streaming request."""
+
+    @abstractmethod
+    def response_tokens(self, response: httpx.Response) -> AsyncIterator[str]:
+        """Text chunks of a successful streaming response."""
+
+    @property
+    def pool(self) -> ProviderPool:
+        pool = _pools.get(self.name)
+        if pool is None:
+            pool = _pools[self.name] = self.create_pool()
+        return pool
+
+    async def stream_reply(self, system: str, messages: list[dict[str, str]]) -> AsyncIterator[str]:
+        body, headers = self.build_request(system, messages)
+        key = hashlib.sha256(json.dumps(body, sort_keys=True).encode()).hexdigest()
+        pool = self.pool
+        shared = pool.in_flight.get(key)
+        # A reply whose last caller left is being cancelled: start afresh
+        if shared is None or shared.task is None or shared.task.cancelling():
+            AI_REQUESTS.labels(self.name, "upstream").inc()
+            shared = pool.in_flight[key] = SharedReply()
+            shared.task = asyncio.create_task(self._fetch(pool, key, shared, body, headers))
+        else:
+            AI_REQUESTS.labels(self.name, "coalesced").inc()
+        async for token in shared.subscribe():
+            yield token
+
+    async def _fetch(
+        self,
+        pool: ProviderPool,
+        key: str,
+        shared: SharedReply,
+        body: dict[str, Any],
+        headers: dict[str, str],
+    ) -> None:
+        error = None
+        try:
+            if pool.token_bucket is not None:
+                prompt_chars = len(json.dumps(body.get("system", ""))) + len(
+                    json.dumps(body["messages"])
+                )
+                await pool.token_bucket.acquire(
+                    prompt_chars // CHARS_PER_TOKEN + body["max_tokens"]
+                )
+            await self._fetch_with_retries(pool, shared, body, headers)
+        except AIProviderError as exc:
+            AI_REQUESTS.labels(self.name, "failed").inc()
+            error = exc
+        except asyncio.CancelledError:
+            error = AIProviderError("Request cancelled")
+            raise
+        except Exception as exc:
+            logger.exception("Unexpected %s provider failure", self.name)
+            AI_REQUESTS.labels(self.name, "failed").inc()
+            error = AIProviderError(f"{self.name} API request failed: {exc}")
+        finally:
+            if pool.in_flight.get(key) is shared:
+                del pool.in_flight[key]
+            await shared.finish(error)
+
+    async def _fetch_with_retries(
+        self,
+        pool: ProviderPool,
+        shared: SharedReply,
+        body: dict[str, Any],
+        headers: dict[str, str],
+    ) -> None:
+        attempt = 0
+        while True:
+            try:
+                async with (
+                    pool.semaphore,
+                    pool.client.stream("POST", self.path, json=body, headers=headers) as response,
+                ):
+                    if response.status_code in RETRYABLE_STATUS_CODES:
+                        raise _RetryableError(
+                            f"{self.name} API returned {response.status_code}",
+                            _retry_after(response),
+                        )
+                    if response.status_code != 200:
+                        raise AIProviderError(f"{self.name} API returned {response.status_code}")
+                    async for token in self.response_tokens(response):
+                        await shared.push(token)
+                return
+            except (_RetryableError, httpx.TransportError) as exc:
+                # Callers already saw part of the reply: a retry would repeat it
+                if shared.tokens or attempt >= settings.ai_max_retries:
+                    raise AIProviderError(f"{self.name} API request failed: {exc}") from exc
+                AI_REQUESTS.labels(self.name, "retried").inc()
+                await asyncio.sleep(retry_delay(attempt, getattr(exc, "retry_after", None)))
+                attempt += 1
+            except httpx.HTTPError as exc:
+                raise AIProviderError(f"{self.name} API request failed: {exc}") from exc
+
+
+class ClaudeProvider(HTTPChatProvider):
+    """Anthropic Messages API with streaming."""
+
+    name = AIProvider.CLAUDE.value
+    path = "/v1/messages"
+
+    def create_pool(self) -> ProviderPool:
+        return ProviderPool(
+            settings.anthropic_base_url,
+            settings.anthropic_max_concurrency,
+            settings.anthropic_tokens_per_minute,
+        )
+
+    def build_request(
+        self, system: str, messages: list[dict[str, str]]
+    ) -> tuple[dict[str, Any], dict[str, str]]:
+        if not settings.anthropic_api_key:
+            raise AIProviderError("ANTHROPIC_API_KEY is not configured")
+        body = {
+            "model": settings.anthropic_model,
+            "max_tokens": settings.ai_max_tokens,
+            "system": system,
+            "messages": messages,
+            "stream": True,
+        }
+        headers = {
+            "x-api-key": settings.anthropic_api_key,
+            "anthropic-version": ANTHROPIC_VERSION,
+        }
+        return body, headers
+
+    async def response_tokens(self, response: httpx.Response) -> AsyncIterator[str]:
+        async for data in _sse_data(response):
+            event = json.loads(data)
+            if event["type"] == "content_block_delta" and "text" in event["delta"]:
+                yield event["delta"]["text"]
+            elif event["type"] == "error":
+                raise AIProviderError(event["error"].get("message", "Anthropic error"))
+
+
+class OpenAIProvider(HTTPChatProvider):
+    """OpenAI Chat Completions API with streaming."""
+
+    name = AIProvider.OPENAI.value
+    path = "/v1/chat/completions"
+
+    def create_pool(self) -> ProviderPool:
+        return ProviderPool(
+            settings.openai_base_url,
+            settings.openai_max_concurrency,
+            settings.openai_tokens_per_minute,
+        )
+
+    def build_request(
+        self, system: str, messages: list[dict[str, str]]
+    ) -> tuple[dict[str, Any], dict[str, str]]:
+        if not settings.openai_api_key:
+            raise AIProviderError("OPENAI_API_KEY is not configured")
+        body = {
+            "model": settings.openai_model,
+            "max_tokens": settings.ai_max_tokens,
+            "messages": [{"role": "system", "content": system}, *messages],
+            "stream": True,
+        }
+        headers = {"Authorization": f"Bearer {settings.openai_api_key}"}
+        return body, headers
+
+    async def response_tokens(self, response: httpx.Response) -> AsyncIterator[str]:
+        async for data in _sse_data(response):
+            if data == "[DONE]":
+                return
+            choices = json.loads(data).get("choices") or [{}]
+            text = choices[0].get("delta", {}).get("content")
+            if text:
+                yield text
+
+
+class FakeChatProvider(ChatProvider):
+    """
+    Local stand-in that echoes the last user message and pads it with filler.
+
+    Emits reply_words words, the first after first_token_ms and each further
+    one after token_ms.
+    """
+
+    name = FAKE_PROVIDER
+
+    def __init__(
+        self,
+        first_token_ms: float | None = None,
+        token_ms: float | None = None,
+        reply_words: int | None = None,
+    ):
+        self.first_token_ms = (
+            settings.fake_ai_first_token_ms if first_token_ms is None else first_token_ms
+        )
+        self.token_ms = settings.fake_ai_token_ms if token_ms is None else token_ms
+        self.reply_words = settings.fake_ai_reply_words if reply_words is None else reply_words
+
+    def reply_tokens(self, messages: list[dict[str, str]]) -> list[str]:
+        """The tokens of the canned reply to a conversation."""
+        last_user_message = next(
+            (message["content"] for message in reversed(messages) if message["role"] == "user"),
+            "",
+        )
+        words = f"Du skrev: {last_user_message}".split()
+        filler = FAKE_FILLER.split()
+        while len(words) < self.reply_words:
+            words.extend(filler)
+        return re.findall(r"\S+\s*", " ".join(words[: self.reply_words]))
+
+    async def stream_reply(self, system: str, messages: list[dict[str, str]]) -> AsyncIterator[str]:
+        del system  # The canned reply does not depend on the prompt
+        await asyncio.sleep(self.first_token_ms / 1000)
+        for index, token in enumerate(self.reply_tokens(messages)):
+            if index:
+                await asyncio.sleep(self.token_ms / 1000)
+            yield token
+
+
+AI_PROVIDERS: dict[str, type[ChatProvider]] = {
+    AIProvider.CLAUDE.value: ClaudeProvider,
+    AIProvider.OPENAI.value: OpenAIProvider,
+    FAKE_PROVIDER: FakeChatProvider,
+}
+
+
+def create_ai_provider(name: str) -> ChatProvider:
+    """Instantiate an AI provider by name."""
+    try:
+        provider_class = AI_PROVIDERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown AI provider: {name!r}")
+    return provider_class()
+
+
+def ai_provider_for_user(user: User) -> ChatProvider:
+    """The provider forced by settings, else the user's preferred one."""
+    return create_ai_provider(settings.ai_provider or user.preferred_ai_provider)
@@ -2,20 +2,46 @@
 Authentication service.
 """
 
-from sqlalchemy import select
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import DateTime, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
 
+from src.core.cache import create_cache_backend
+from src.core.config import get_settings
 from src.core.exceptions import ConflictException, CredentialsException
 from src.core.security import (
     create_access_token,
     create_refresh_token,
     decode_token,
-    hash_password,
-    verify_password,
+    hash_password_async,
+    password_needs_rehash,
+    verify_password_async,
 )
+from src.db.session import run_after_commit
 from src.models.user import User
 from src.schemas.user import TokenResponse, UserCreate, UserUpdate
 
+settings = get_settings()
+
+# Columns kept in the user cache (the password hash never leaves the database)
+USER_CACHE_COLUMNS = tuple(
+    column.key for column in User.__table__.columns if column.key != "hashed_password"
+)
+# Stored as ISO 8601 strings so shared (JSON) backends round-trip them
+USER_CACHE_DATETIME_COLUMNS = frozenset(
+    column.key for column in User.__table__.columns if isinstance(column.type, DateTime)
+)
+
+user_cache = create_cache_backend(
+    settings.user_cache_backend,
+    max_entries=settings.user_cache_max_entries,
+    ttl_seconds=settings.user_cache_ttl_seconds,
+    namespace="users",
+)
+
 
 async def get_user_by_email(db: AsyncSession, email: str) -> User | None:
     """Get user by email."""
@@ -29,6 +55,53 @@ async def get_user_by_id(db: AsyncSession, user_id: int) -> User | None:
     return result.scalar_one_or_none()
 
 
+def _user_cache_key(subject: str) -> str:
+    return f"user:{subject}"
+
+
+def _user_projection(user: User) -> dict[str, Any]:
+    """The cached columns of a user, with datetimes as ISO 8601 strings."""
+    projection = {column: getattr(user, column) for column in USER_CACHE_COLUMNS}
+    for column in USER_CACHE_DATETIME_COLUMNS:
+        if projection[column] is not None:
+            projection[column] = projection[column].isoformat()
+    return projection
+
+
+def _user_from_projection(projection: dict[str, Any]) -> User:
+    """Rebuild a detached User from its cached projection."""
+    values = dict(projection)
+    for column in USER_CACHE_DATETIME_COLUMNS:
+        if values.get(column) is not None:
+            values[column] = datetime.fromisoformat(values[column])
+    user = User(**values)
+    make_transient_to_detached(user)
+    return user
+
+
+async def get_cached_user(db: AsyncSession, subject: str) -> User | None:
+    """
+    Get a user by JWT subject, served from the user cache when possible.
+
+    On a hit the User is rebuilt from the cached projection as a detached
+    instance (no query); the password hash is not loaded.
+    """
+    key = _user_cache_key(subject)
+    projection = await user_cache.get(key)
+    if projection is not None:
+        return _user_from_projection(projection)
+
+    user = await get_user_by_id(db, int(subject))
+    if user:
+        await user_cache.set(key, _user_projection(user))
+    return user
+
+
+def invalidate_cached_user(db: AsyncSession, user_id: int) -> None:
+    """Drop a user from the cache once the change to their row commits."""
+    run_after_commit(db, lambda: user_cache.delete(_user_cache_key(str(user_id))))
+
+
 async def create_user(db: AsyncSession, user_data: UserCreate) -> User:
     """Create a new user."""
     # Check if email already exists
@@ -39,7 +112,7 @@ async def create_user(db: AsyncSession, user_data: UserCreate) -> User:
     # Create user
     user = User(
         email=user_data.email,
-        hashed_password=hash_password(user_data.password),
+        hashed_password=await hash_password_async(user_data.password),
         display_name=user_data.display_name,
     )
     db.add(user)
@@ -54,12 +127,17 @@ async def authenticate_user(db: AsyncSession, email: str, password: str) -> User
     if not user:
         raise CredentialsException("Invalid email or password")
 
-    if not verify_password(password, user.hashed_password):
+    if not await verify_password_async(password, user.hashed_password):
         raise CredentialsException("Invalid email or password")
 
     if not user.is_active:
         raise CredentialsException("Account is disabled")
 
+    # Upgrade hashes made with an outdated cost while we have the plain password
+    if password_needs_rehash(user.hashed_password):
+        user.hashed_password = await hash_password_async(password)
+        await db.flush()
+
     return user
 
 
@@ -96,10 +174,22 @@ async def update_user(db: AsyncSession, user: User, user_data: UserUpdate) -> Us
     """Update user profile."""
     update_data = user_data.model_dump(exclude_unset=True)
 
+    # Users served from the cache are detached; re-attach without a SELECT
+    db.add(user)
     for field, value in update_data.items():
         if hasattr(user, field):
             setattr(user, field, value)
 
     await db.flush()
     await db.refresh(user)
+    invalidate_cached_user(db, user.id)
+    return user
+
+
+async def deactivate_user(db: AsyncSession, user: User) -> User:
+    """Disable a user account; its tokens stop working within the cache TTL."""
+    db.add(user)
+    user.is_active = False
+    await db.flush()
+    invalidate_cached_user(db, user.id)
     return user
@@ -0,0 +1,405 @@
+"""
+Chat service: sessions, bot prompts and streamed assistant replies.
+
+A reply is streamed as it arrives from the AI provider. The user message and
+an empty assistant message are stored up front; the assistant content is then
+rewritten in coalesced writes (every chat_persist_chars characters or
+chat_persist_seconds, whichever comes first) so a dropped connection keeps
+what was generated. The session's message_count and updated_at change once,
+when the reply ends.
+"""
+
+import asyncio
+import base64
+import json
+import logging
+import time
+from collections.abc import AsyncIterator, Coroutine
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import and_, delete, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import defer
+
+from src.core.config import get_settings
+from src.core.exceptions import (
+    BadRequestException,
+    NotFoundException,
+    ServiceUnavailableException,
+)
+from src.db.session import async_session_maker
+from src.models.chat import BotType, ChatMessage, ChatSession, MessageRole
+from src.models.user import User
+from src.schemas.chat import BotInfo, ChatResponse, ChatSessionCreate, MessageResponse
+from src.services.ai_client import AIProviderError, ChatProvider
+from src.services.chat_context import build_context
+from src.services.reply_cache import reply_cache
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Reply writes still running after their stream was cancelled
+_pending_writes: set[asyncio.Task[None]] = set()
+
+BOTS = {
+    BotType.CONVERSATION: BotInfo(
+        type=BotType.CONVERSATION,
+        name="Conversation Partner",
+        swedish_name="Samtalspartner",
+        description="Practice free conversation at your level",
+        icon="message-square",
+    ),
+    BotType.WRITING: BotInfo(
+        type=BotType.WRITING,
+        name="Writing Teacher",
+        swedish_name="Skrivläraren",
+        description="Get feedback on your writing",
+        icon="pencil",
+    ),
+    BotType.GRAMMAR: BotInfo(
+        type=BotType.GRAMMAR,
+        name="Grammar Teacher",
+        swedish_name="Grammatikläraren",
+        description="Learn grammar rules with examples",
+        icon="book-a",
+    ),
+    BotType.VOCABULARY: BotInfo(
+        type=BotType.VOCABULARY,
+        name="Word Teacher",
+        swedish_name="Ordläraren",
+        description="Learn new words in context",
+        icon="book-open",
+    ),
+    BotType.TRANSLATOR: BotInfo(
+        type=BotType.TRANSLATOR,
+        name="Translator",
+        swedish_name="Översättaren",
+        description="Translation with explanations",
+        icon="languages",
+    ),
+}
+
+BOT_PROMPTS = {
+    BotType.CONVERSATION: (
+        "You are Samtalspartner, a friendly conversation partner for a Swedish learner. "
+        "Reply in Swedish at the learner's level, keep the conversation going with a "
+        "question, and gently point out at most one mistake per reply."
+    ),
+    BotType.WRITING: (
+        "You are Skrivläraren, a Swedish writing teacher. Correct the learner's text, "
+        "group the errors as spelling, grammar or vocabulary, and explain each briefly."
+    ),
+    BotType.GRAMMAR: (
+        "You are Grammatikläraren, a Swedish grammar teacher. Explain rules with short "
+        "examples and ask the learner questions that lead them to the rule."
+    ),
+    BotType.VOCABULARY: (
+        "You are Ordläraren, a Swedish vocabulary teacher. Introduce words in context "
+        "with example sentences, related words and memory aids."
+    ),
+    BotType.TRANSLATOR: (
+        "You are Översättaren, a Swedish-English translator. Translate, explain nuances "
+        "and idioms, and warn about false friends."
+    ),
+}
+
+
+def system_prompt(bot_type: str, user: User) -> str:
+    """Bot prompt plus the learner's CEFR levels."""
+    return (
+        f"{BOT_PROMPTS[BotType(bot_type)]}\n\n"
+        f"The learner's CEFR levels: reading {user.reading_level}, "
+        f"writing {user.writing_level}, listening {user.listening_level}, "
+        f"speaking {user.speaking_level}."
+    )
+
+
+# ============================================================================
+# Sessions
+# ============================================================================
+
+
+async def create_chat_session(
+    db: AsyncSession, user_id: int, session_data: ChatSessionCreate
+) -> ChatSession:
+    """Start a chat session with a bot."""
+    chat_session = ChatSession(user_id=user_id, bot_type=session_data.bot_type.value)
+    db.add(chat_session)
+    await db.flush()
+    return chat_session
+
+
+@dataclass(frozen=True)
+class ChatCursor:
+    """Keyset position in a newest-first listing (last row already returned)."""
+
+    at: datetime
+    id: int
+
+    def encode(self) -> str:
+        """Encode as an opaque, URL-safe cursor string."""
+        raw = json.dumps({"t": self.at.isoformat(), "i": self.id})
+        return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+    @classmethod
+    def decode(cls, cursor: str) -> "ChatCursor":
+        """Decode a cursor produced by encode()."""
+        try:
+            raw = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+            return cls(at=datetime.fromisoformat(raw["t"]), id=int(raw["i"]))
+        except (ValueError, KeyError, TypeError):
+            raise BadRequestException("Invalid chat cursor")
+
+
+async def list_chat_sessions(
+    db: AsyncSession, user_id: int, limit: int = 20, before: ChatCursor | None = None
+) -> list[ChatSession]:
+    """
+    User's chat sessions, most recently active first.
+
+    Served from ix_chat_sessions_user_id_updated_at and paged with a keyset
+    cursor on (updated_at, id). Only session columns are read: no messages,
+    and the summary is deferred.
+    """
+    query = (
+        select(ChatSession)
+        .options(defer(ChatSession.summary, raiseload=True))
+        .where(ChatSession.user_id == user_id)
+    )
+    if before is not None:
+        query = query.where(
+            or_(
+                ChatSession.updated_at < before.at,
+                and_(ChatSession.updated_at == before.at, ChatSession.id < before.id),
+            )
+        )
+    result = await db.execute(
+        query.order_by(ChatSession.updated_at.desc(), ChatSession.id.desc()).limit(limit)
+    )
+    return list(result.scalars().all())
+
+
+async def get_chat_session(db: AsyncSession, user_id: int, session_id: int) -> ChatSession:
+    """One of the user's chat sessions (404 if it is not theirs)."""
+    chat_session = (
+        await db.execute(
+            select(ChatSession).where(ChatSession.id == session_id, ChatSession.user_id == user_id)
+        )
+    ).scalar_one_or_none()
+    if chat_session is None:
+        raise NotFoundException("Chat session")
+    return chat_session
+
+
+async def list_chat_messages(
+    db: AsyncSession, session_id: int, limit: int = 50, before: ChatCursor | None = None
+) -> list[ChatMessage]:
+    """
+    A session's messages, newest first.
+
+    Served from ix_chat_messages_session_id_created_at_id and paged with a
+    keyset cursor on (created_at, id). Replies still being generated (empty
+    content) are left out.
+    """
+    query = select(ChatMessage).where(
+        ChatMessage.session_id == session_id, ChatMessage.content != ""
+    )
+    if before is not None:
+        query = query.where(
+            or_(
+                ChatMessage.created_at < before.at,
+                and_(ChatMessage.created_at == before.at, ChatMessage.id < before.id),
+            )
+        )
+    result = await db.execute(
+        query.order_by(ChatMessage.created_at.desc(), ChatMessage.id.desc()).limit(limit)
+    )
+    return list(result.scalars().all())
+
+
+# ============================================================================
+# Replies
+# ============================================================================
+
+
+@dataclass
+class ChatReplyEvent:
+    """
+    One step of a streamed reply.
+
+    Events: "start" (message ids), "token" (text), "done" (the stored
+    assistant message) and "error" (detail).
+    """
+
+    event: str
+    data: dict[str, Any] = field(default_factory=dict)
+
+    def to_sse(self) -> str:
+        """Server-Sent Events encoding."""
+        return f"event: {self.event}\ndata: {json.dumps(self.data, ensure_ascii=False)}\n\n"
+
+
+async def stream_chat_reply(
+    user: User,
+    session_id: int,
+    content: str,
+    provider: ChatProvider,
+    session_maker: async_sessionmaker[AsyncSession] = async_session_maker,
+) -> AsyncIterator[ChatReplyEvent]:
+    """
+    Store a user message and stream the assistant's reply.
+
+    Uses its own database sessions, since the reply outlives the request
+    handler that starts it, and holds no connection while waiting for tokens.
+    """
+    async with session_maker() as db:
+        chat_session = await get_chat_session(db, user.id, session_id)
+        system = system_prompt(chat_session.bot_type, user)
+        context = await build_context(db, chat_session, system, content)
+        # The first message of a session has no history to depend on; cached
+        # bots answer it from the bot prompt alone, so one reply fits every
+        # learner at the same levels. Later messages keep their context.
+        cached = (
+            reply_cache.enabled_for(chat_session.bot_type)
+            and len(context.messages) == 1
+            and not chat_session.summary
+        )
+        if cached:
+            history = context.messages
+        else:
+            system, history = context.system, context.messages
+
+        user_message = ChatMessage(
+            session_id=session_id, role=MessageRole.USER.value, content=content
+        )
+        assistant_message = ChatMessage(
+            session_id=session_id, role=MessageRole.ASSISTANT.value, content=""
+        )
+        db.add_all([user_message, assistant_message])
+        await db.commit()
+    yield ChatReplyEvent(
+        "start",
+        {
+            "session_id": session_id,
+            "user_message_id": user_message.id,
+            "assistant_message_id": assistant_message.id,
+        },
+    )
+
+    replies = provider.stream_reply(system, history)
+    if cached:
+        replies = reply_cache.stream(
+            reply_cache.key(chat_session.bot_type, system, content),
+            len(system) + len(content),
+            replies,
+        )
+
+    parts: list[str] = []
+    persisted_chars = 0
+    persisted_at = time.monotonic()
+    last_save = None
+    error = None
+    try:
+        async for token in replies:
+            parts.append(token)
+            yield ChatReplyEvent("token", {"text": token})
+
+            pending_chars = sum(map(len, parts)) - persisted_chars
+            if (
+                pending_chars >= settings.chat_persist_chars
+                or time.monotonic() - persisted_at >= settings.chat_persist_seconds
+            ):
+                text = "".join(parts)
+                last_save = _detach(_save_content(session_maker, assistant_message.id, text))
+                await asyncio.shield(last_save)
+                persisted_chars, persisted_at = len(text), time.monotonic()
+    except AIProviderError as exc:
+        logger.warning("AI provider %s failed: %s", provider.name, exc)
+        error = str(exc)
+    finally:
+        await asyncio.shield(
+            _detach(
+                _finish_reply(
+                    session_maker, session_id, assistant_message.id, "".join(parts), last_save
+                )
+            )
+        )
+
+    if error is not None:
+        yield ChatReplyEvent("error", {"detail": "AI provider unavailable"})
+        return
+    reply = MessageResponse(
+        id=assistant_message.id,
+        role=MessageRole.ASSISTANT,
+        content="".join(parts),
+        created_at=assistant_message.created_at,
+    )
+    yield ChatReplyEvent("done", reply.model_dump(mode="json"))
+
+
+async def complete_chat_reply(
+    user: User, session_id: int, content: str, provider: ChatProvider
+) -> ChatResponse:
+    """Whole-reply variant of stream_chat_reply."""
+    async for reply_event in stream_chat_reply(user, session_id, content, provider):
+        if reply_event.event == "error":
+            raise ServiceUnavailableException(reply_event.data["detail"])
+        if reply_event.event == "done":
+            return ChatResponse(
+                message=MessageResponse.model_validate(reply_event.data), session_id=session_id
+            )
+    raise ServiceUnavailableException("AI provider unavailable")
+
+
+def _detach(write: Coroutine[Any, Any, None]) -> asyncio.Task[None]:
+    """
+    Run a write in its own task.
+
+    Awaited through asyncio.shield, so a client disconnect cancelling the
+    stream cannot interrupt a statement halfway through.
+    """
+    task = asyncio.ensure_future(write)
+    _pending_writes.add(task)
+    task.add_done_callback(_pending_writes.discard)
+    return task
+
+
+async def _save_content(
+    session_maker: async_sessionmaker[AsyncSession], message_id: int, content: str
+) -> None:
+    async with session_maker() as db:
+        await db.execute(
+            update(ChatMessage).where(ChatMessage.id == message_id).values(content=content)
+        )
+        await db.commit()
+
+
+async def _finish_reply(
+    session_maker: async_sessionmaker[AsyncSession],
+    session_id: int,
+    message_id: int,
+    content: str,
+    last_save: asyncio.Task[None] | None,
+) -> None:
+    """Write the final content and bump the session's counters once."""
+    if last_save is not None:
+        # A save still running after a disconnect must not land after this
+        await asyncio.wait([last_save])
+    async with session_maker() as db:
+        added = 2
+        if content:
+            await db.execute(
+                update(ChatMessage).where(ChatMessage.id == message_id).values(content=content)
+            )
+        else:
+            # Nothing was generated: keep only the user's message
+            await db.execute(delete(ChatMessage).where(ChatMessage.id == message_id))
+            added = 1
+        await db.execute(
+            update(ChatSession)
+            .where(ChatSession.id == session_id)
+            .values(message_count=ChatSession.message_count + added, updated_at=func.now())
+        )
+        await db.commit()
@@ -0,0 +1,226 @@
+"""
+Bounded context windows for chat replies.
+
+Instead of a session's whole history, a reply is generated from:
+
+- the bot prompt with the learner's CEFR levels,
+- a sample of words the learner knows, so the bot can build on them,
+- a rolling summary of the turns that no longer fit, and
+- the latest messages, fetched newest first through a keyset scan on
+  (session_id, id),
+
+all within chat_context_tokens as measured by estimate_tokens. Messages that
+drop out of the window are folded into the session's summary, one line per
+message, the moment they drop out; the summary keeps its newest lines within
+chat_summary_tokens.
+"""
+
+import re
+from dataclasses import dataclass
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import get_settings
+from src.models.chat import ChatMessage, ChatSession, MessageRole
+from src.models.word import UserWord, Word, WordStatus
+
+settings = get_settings()
+
+_TOKEN_PIECES = re.compile(r"\w+|[^\w\s]")
+# Role and separator tokens the providers add around each message
+MESSAGE_OVERHEAD_TOKENS = 4
+SUMMARY_LINE_CHARS = 160
+# Messages folded into the summary per reply; a longer backlog (e.g. a
+# session older than the summary) is caught up over the following replies
+SUMMARY_FOLD_BATCH = 200
+KNOWN_WORD_STATUSES = (WordStatus.FAMILIAR.value, WordStatus.MASTERED.value)
+SUMMARY_ROLE_LABELS = {MessageRole.USER.value: "Learner", MessageRole.ASSISTANT.value: "Bot"}
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Approximate token count of a text.
+
+    Mirrors how BPE tokenizers split text: a short word is one token, longer
+    ones (Swedish compounds especially) a token per ~4 characters, and each
+    punctuation mark a token of its own.
+    """
+    return sum((len(piece) + 3) // 4 for piece in _TOKEN_PIECES.findall(text))
+
+
+def message_tokens(message: dict[str, str]) -> int:
+    """Approximate tokens a conversation message costs."""
+    return estimate_tokens(message["content"]) + MESSAGE_OVERHEAD_TOKENS
+
+
+def summary_line(role: str, content: str) -> str:
+    """One summary line: who spoke and the start of what they said."""
+    text = " ".join(content.split())
+    sentence_end = re.search(r"[.!?](\s|$)", text)
+    if sentence_end:
+        text = text[: sentence_end.start() + 1]
+    if len(text) > SUMMARY_LINE_CHARS:
+        text = text[: SUMMARY_LINE_CHARS - 1].rstrip() + "…"
+    return f"{SUMMARY_ROLE_LABELS.get(role, role)}: {text}"
+
+
+def extend_summary(summary: str | None, lines: list[str]) -> str:
+    """Append lines, dropping the oldest until the summary fits its budget."""
+    kept = (summary.splitlines() if summary else []) + lines
+    tokens = [estimate_tokens(line) + 1 for line in kept]
+    total = sum(tokens)
+    start = 0
+    while total > settings.chat_summary_tokens and start < len(kept) - 1:
+        total -= tokens[start]
+        start += 1
+    return "\n".join(kept[start:])
+
+
+@dataclass
+class StoredMessage:
+    """A message already in the session, as read for the context window."""
+
+    id: int
+    role: str
+    content: str
+
+    @property
+    def tokens(self) -> int:
+        """Approximate tokens the message costs."""
+        return estimate_tokens(self.content) + MESSAGE_OVERHEAD_TOKENS
+
+
+@dataclass
+class ContextWindow:
+    """What is sent to the provider for one reply."""
+
+    system: str
+    messages: list[dict[str, str]]
+    tokens: int
+
+
+async def known_words_sample(db: AsyncSession, user_id: int, limit: int) -> list[str]:
+    """Swedish words the learner knows, most recently reviewed first."""
+    result = await db.execute(
+        select(Word.swedish)
+        .join(UserWord, UserWord.word_id == Word.id)
+        .where(UserWord.user_id == user_id, UserWord.status.in_(KNOWN_WORD_STATUSES))
+        .order_by(UserWord.last_reviewed.desc().nulls_last(), UserWord.id.desc())
+        .limit(limit)
+    )
+    return list(result.scalars().all())
+
+
+async def _latest_messages(db: AsyncSession, chat_session: ChatSession) -> list[StoredMessage]:
+    """Up to chat_context_messages messages after the summary, newest first."""
+    result = await db.execute(
+        select(ChatMessage.id, ChatMessage.role, ChatMessage.content)
+        .where(
+            ChatMessage.session_id == chat_session.id,
+            ChatMessage.id > (chat_session.summary_through_id or 0),
+            ChatMessage.role != MessageRole.SYSTEM.value,
+            # Replies still being generated
+            ChatMessage.content != "",
+        )
+        .order_by(ChatMessage.id.desc())
+        .limit(settings.chat_context_messages)
+    )
+    return [StoredMessage(id_, role, content) for id_, role, content in result.all()]
+
+
+async def _fold_into_summary(db: AsyncSession, chat_session: ChatSession, before_id: int) -> None:
+    """Summarize the unsummarized messages older than before_id."""
+    result = await db.execute(
+        select(
+            ChatMessage.id,
+            ChatMessage.role,
+            # Only the start of each message makes it into the summary
+            func.substr(ChatMessage.content, 1, SUMMARY_LINE_CHARS * 2),
+        )
+        .where(
+            ChatMessage.session_id == chat_session.id,
+            ChatMessage.id > (chat_session.summary_through_id or 0),
+            ChatMessage.id < before_id,
+            ChatMessage.role != MessageRole.SYSTEM.value,
+            ChatMessage.content != "",
+        )
+        .order_by(ChatMessage.id)
+        .limit(SUMMARY_FOLD_BATCH)
+    )
+    rows = result.all()
+    if not rows:
+        return
+    chat_session.summary = extend_summary(
+        chat_session.summary, [summary_line(role, content) for _, role, content in rows]
+    )
+    chat_session.summary_through_id = rows[-1][0]
+
+
+def _fit_messages(messages: list[StoredMessage], budget: int) -> tuple[int, int]:
+    """How many of the newest-first messages fit in the budget, and their tokens."""
+    used = 0
+    for count, message in enumerate(messages):
+        cost = message.tokens
+        if used + cost > budget:
+            return count, used
+        used += cost
+    return len(messages), used
+
+
+async def build_context(
+    db: AsyncSession, chat_session: ChatSession, system: str, content: str
+) -> ContextWindow:
+    """
+    Context for replying to a new message in a session.
+
+    Folds messages that leave the window into chat_session.summary; the
+    caller commits that along with the new message.
+
+    Args:
+        db: Database session
+        chat_session: The session (its summary columns may be updated)
+        system: Bot prompt with the learner's CEFR levels
+        content: The new user message
+    """
+    new_message = {"role": MessageRole.USER.value, "content": content}
+    budget = settings.chat_context_tokens - estimate_tokens(system) - message_tokens(new_message)
+
+    words = await known_words_sample(db, chat_session.user_id, settings.chat_context_known_words)
+    words_line = ""
+    while words:
+        words_line = f"Words the learner already knows: {', '.join(words)}."
+        if estimate_tokens(words_line) <= budget // 4:
+            break
+        # Keep the most recently reviewed words
+        words = words[: len(words) * 3 // 4]
+        words_line = ""
+    budget -= estimate_tokens(words_line)
+
+    latest = await _latest_messages(db, chat_session)
+    fitting, used = _fit_messages(latest, budget)
+    everything_fits = (
+        fitting == len(latest) < settings.chat_context_messages and not chat_session.summary
+    )
+    if not everything_fits:
+        # Older turns exist or are about to be summarized: leave room for them
+        fitting, used = _fit_messages(latest, budget - settings.chat_summary_tokens)
+        if fitting:
+            await _fold_into_summary(db, chat_session, before_id=latest[fitting - 1].id)
+        elif latest:
+            await _fold_into_summary(db, chat_session, before_id=latest[0].id + 1)
+
+    window = latest[:fitting]
+    parts = [system]
+    if words_line:
+        parts.append(words_line)
+    if chat_session.summary:
+        parts.append(f"Earlier in this conversation:\n{chat_session.summary}")
+    full_system = "\n\n".join(parts)
+    messages = [{"role": message.role, "content": message.content} for message in reversed(window)]
+    messages.append(new_message)
+    return ContextWindow(
+        system=full_system,
+        messages=messages,
+        tokens=estimate_tokens(full_system) + used + message_tokens(new_message),
+    )
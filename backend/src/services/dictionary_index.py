@@ -0,0 +1,588 @@
+"""
+Memory-mapped, read-only dictionary index for prefix autocomplete.
+
+The index lives in generation-numbered files that every worker process maps
+read-only, so lookups never touch the database:
+
+    header | records | swedish keys | english keys | blob
+
+- records: one per word (word id, frequency rank, payload location)
+- keys: folded lookup keys sorted by their UTF-8 bytes, each pointing at a
+  record; binary search gives prefix and exact lookups
+- blob: key bytes and unit-separator joined word payloads
+
+New words are merged in incrementally: records and blob bytes are appended
+(so existing offsets stay valid) and only the sorted key tables get the new
+entries spliced in. Every write, incremental or full rebuild, publishes a
+generation numbered above any on disk: the file is written under a temporary
+name and renamed into place, then the CURRENT pointer file is swapped
+atomically and readers pick it up on their next lookup. A published file is
+never opened for writing again (truncating a file other workers have mapped
+kills them with SIGBUS), and superseded generations are only deleted once
+they have been superseded for GENERATION_GRACE_SECONDS.
+
+File writes and the cross-process lock block, so the event loop never runs
+them: DictionaryIndexWriter applies committed words and builds a missing
+index in worker threads.
+"""
+
+import asyncio
+import fcntl
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager, suppress
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from src.core.config import get_settings
+from src.db.functions import fold_text
+from src.db.session import async_session_maker
+from src.models.word import Word
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+MAGIC = b"SVLDICT1"
+HEADER = struct.Struct("<8sQIII")  # magic, generation, records, swedish keys, english keys
+RECORD_DTYPE = np.dtype(
+    [
+        ("word_id", "<u4"),
+        ("frequency_rank", "<i4"),
+        ("payload_offset", "<u4"),
+        ("payload_length", "<u4"),
+    ]
+)
+KEY_DTYPE = np.dtype([("offset", "<u4"), ("length", "<u4"), ("record", "<u4")])
+
+FIELD_SEPARATOR = "\x1f"
+NO_FREQUENCY_RANK = -1
+# Candidates taken per requested result before deduplicating words that
+# match through several keys; the full range is sorted if that falls short
+CANDIDATE_OVERSCAN = 4
+RELOAD_CHECK_INTERVAL_SECONDS = 1.0
+# Readers may still be opening a superseded generation for this long
+GENERATION_GRACE_SECONDS = 60.0
+
+CURRENT_FILE = "CURRENT"
+LOCK_FILE = ".lock"
+PENDING_ENTRIES_KEY = "dictionary_index_pending"
+
+
+@dataclass(frozen=True)
+class DictionaryEntry:
+    """The subset of a Word that autocomplete needs."""
+
+    word_id: int
+    swedish: str
+    english: str
+    part_of_speech: str | None
+    cefr_level: str
+    frequency_rank: int | None
+
+    @classmethod
+    def from_word(cls, word: Word) -> "DictionaryEntry":
+        """Build an entry from a Word row."""
+        return cls(
+            word_id=word.id,
+            swedish=word.swedish,
+            english=word.english,
+            part_of_speech=word.part_of_speech,
+            cefr_level=word.cefr_level,
+            frequency_rank=word.frequency_rank,
+        )
+
+
+def english_keys(english: str) -> set[str]:
+    """Lookup keys for each English gloss ("to go, to walk" -> "to go", "go", ...)."""
+    keys = set()
+    for gloss in english.replace("/", ",").split(","):
+        gloss = fold_text(gloss)
+        if gloss:
+            keys.add(gloss)
+            if gloss.startswith("to "):
+                keys.add(gloss[3:])
+    return keys
+
+
+def _encode_payload(entry: DictionaryEntry) -> bytes:
+    fields = [entry.swedish, entry.english, entry.part_of_speech or "", entry.cefr_level]
+    return FIELD_SEPARATOR.join(fields).encode("utf-8")
+
+
+@contextmanager
+def _directory_lock(directory: Path) -> Iterator[None]:
+    """
+    Cross-process writer lock: flock on a lock file that is never removed.
+
+    The kernel releases the lock when its holder exits, so a crashed writer
+    cannot leave it stale and a long rebuild is never taken over.
+    """
+    fd = os.open(directory / LOCK_FILE, os.O_CREAT | os.O_RDWR, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        # Closing the descriptor releases the lock
+        os.close(fd)
+
+
+class _MappedGeneration:
+    """One mapped index file."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        with path.open("rb") as index_file:
+            self.map = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self.generation, record_count, swedish_count, english_count = HEADER.unpack_from(
+            self.map, 0
+        )
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a dictionary index")
+
+        offset = HEADER.size
+        self.records = np.frombuffer(self.map, RECORD_DTYPE, record_count, offset)
+        offset += self.records.nbytes
+        self.swedish_keys = np.frombuffer(self.map, KEY_DTYPE, swedish_count, offset)
+        self.swedish_fields = self._fields_view(offset, self.swedish_keys.nbytes)
+        offset += self.swedish_keys.nbytes
+        self.english_keys = np.frombuffer(self.map, KEY_DTYPE, english_count, offset)
+        self.english_fields = self._fields_view(offset, self.english_keys.nbytes)
+        offset += self.english_keys.nbytes
+        self.blob_start = offset
+
+    def _fields_view(self, offset: int, size: int) -> memoryview:
+        """
+        Flat uint32 view of a key table's (offset, length, record) triples.
+
+        Indexing a memoryview is several times faster than numpy scalar access,
+        which matters in the binary search loop. Assumes a little-endian host.
+        """
+        return memoryview(self.map)[offset : offset + size].cast("I")
+
+    def blob(self) -> bytes:
+        """Copy of the blob section (used when writing the next generation)."""
+        return self.map[self.blob_start :]
+
+    def lower_bound(self, fields: memoryview, target: bytes) -> int:
+        """First key position (in a key table's fields view) whose bytes are >= target."""
+        low, high = 0, len(fields) // 3
+        while low < high:
+            middle = (low + high) // 2
+            start = self.blob_start + fields[3 * middle]
+            if self.map[start : start + fields[3 * middle + 1]] < target:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def entry(self, record_index: int) -> DictionaryEntry:
+        record = self.records[record_index]
+        start = self.blob_start + int(record["payload_offset"])
+        payload = self.map[start : start + int(record["payload_length"])].decode("utf-8")
+        swedish, english, part_of_speech, cefr_level = payload.split(FIELD_SEPARATOR)
+        rank = int(record["frequency_rank"])
+        return DictionaryEntry(
+            word_id=int(record["word_id"]),
+            swedish=swedish,
+            english=english,
+            part_of_speech=part_of_speech or None,
+            cefr_level=cefr_level,
+            frequency_rank=None if rank == NO_FREQUENCY_RANK else rank,
+        )
+
+
+class DictionaryIndex:
+    """Process-local handle on the shared, memory-mapped dictionary index."""
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self._current: _MappedGeneration | None = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    @property
+    def is_built(self) -> bool:
+        """Whether any generation of the index exists on disk."""
+        return (self.directory / CURRENT_FILE).exists()
+
+    def _mapped(self) -> _MappedGeneration | None:
+        """Current generation, remapped if another process published a new one."""
+        now = time.monotonic()
+        if self._current is not None and now < self._next_check:
+            return self._current
+
+        with self._lock:
+            self._next_check = now + RELOAD_CHECK_INTERVAL_SECONDS
+            try:
+                generation = int((self.directory / CURRENT_FILE).read_text().strip())
+            except FileNotFoundError:
+                return None
+            if self._current is None or self._current.generation != generation:
+                # The previous map is released once no lookup references it
+                self._current = _MappedGeneration(self._generation_path(generation))
+            return self._current
+
+    def _generation_path(self, generation: int) -> Path:
+        return self.directory / f"words.{generation}.idx"
+
+    def _generations_on_disk(self) -> dict[int, Path]:
+        """Published generation files by generation number."""
+        generations = {}
+        for path in self.directory.glob("words.*.idx"):
+            try:
+                generations[int(path.name.split(".")[1])] = path
+            except ValueError:
+                continue
+        return generations
+
+    def prefix(self, term: str, limit: int = 10) -> list[DictionaryEntry]:
+        """
+        Words whose Swedish or English key starts with term.
+
+        Exact matches come first, then more frequent words.
+        """
+        return self._lookup(term, limit, exact_only=False)
+
+    def exact(self, term: str, limit: int = 10) -> list[DictionaryEntry]:
+        """Words whose Swedish or English key equals term."""
+        return self._lookup(term, limit, exact_only=True)
+
+    def _lookup(self, term: str, limit: int, exact_only: bool) -> list[DictionaryEntry]:
+        index = self._mapped()
+        target = fold_text(term).encode("utf-8")
+        if index is None or not target:
+            return []
+
+        # UTF-8 never contains 0xFF, so target + 0xFF sorts after every key
+        # starting with target; target + 0x00 sorts right after target itself
+        candidates: list[np.ndarray] = []
+        exact_flags: list[np.ndarray] = []
+        for keys, fields in (
+            (index.swedish_keys, index.swedish_fields),
+            (index.english_keys, index.english_fields),
+        ):
+            start = index.lower_bound(fields, target)
+            exact_end = index.lower_bound(fields, target + b"\x00")
+            end = exact_end if exact_only else index.lower_bound(fields, target + b"\xff")
+            candidates.append(keys["record"][start:end])
+            exact_flags.append(np.arange(start, end) < exact_end)
+
+        records = np.concatenate(candidates)
+        if not len(records):
+            return []
+        order = self._best_first(records, np.concatenate(exact_flags), index, limit)
+        _, first_seen = np.unique(records[order], return_index=True)
+        best = order[np.sort(first_seen)][:limit]
+        return [index.entry(int(record)) for record in records[best]]
+
+    @staticmethod
+    def _best_first(
+        records: np.ndarray, is_exact: np.ndarray, index: _MappedGeneration, limit: int
+    ) -> np.ndarray:
+        """
+        Positions of the best candidates in order: exact matches first, then by
+        frequency rank (unranked words last), then in key order.
+
+        Every key in the prefix range is ranked, so a short prefix costs a
+        linear pass over its whole range (roughly 1 ms per 25k keys); only the
+        top limit * CANDIDATE_OVERSCAN candidates are sorted.
+        """
+        ranks = index.records["frequency_rank"][records].astype(np.int64)
+        ranks[ranks == NO_FREQUENCY_RANK] = np.iinfo(np.int32).max
+        # One int64 per candidate: exact flag | rank | position (unique keys)
+        sort_keys = ((~is_exact).astype(np.int64) << 62) | (ranks << 31)
+        sort_keys |= np.arange(len(records), dtype=np.int64)
+
+        take = min(len(records), limit * CANDIDATE_OVERSCAN)
+        if take < len(records):
+            top = np.argpartition(sort_keys, take - 1)[:take]
+            order = top[np.argsort(sort_keys[top])]
+            if len(np.unique(records[order])) >= limit:
+                return order
+        return np.argsort(sort_keys)
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def rebuild(self, entries: Iterable[DictionaryEntry], if_missing: bool = False) -> None:
+        """
+        Write a complete new generation from scratch.
+
+        Args:
+            entries: Every word in the dictionary
+            if_missing: Skip if another process built the index meanwhile
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with _directory_lock(self.directory):
+            if if_missing and self.is_built:
+                return
+            self._write_generation(None, list(entries))
+
+    def add_entries(self, entries: Iterable[DictionaryEntry]) -> None:
+        """Merge new words into the index without rescanning the database."""
+        entries = list(entries)
+        if not entries:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with _directory_lock(self.directory):
+            self._next_check = 0.0
+            self._write_generation(self._mapped(), entries)
+
+    def _write_generation(
+        self, base: _MappedGeneration | None, entries: list[DictionaryEntry]
+    ) -> None:
+        if base is not None:
+            known_ids = set(base.records["word_id"].tolist())
+            entries = [entry for entry in entries if entry.word_id not in known_ids]
+            if not entries:
+                return
+            blob = bytearray(base.blob())
+            records = [base.records]
+            record_offset = len(base.records)
+        else:
+            blob = bytearray()
+            records = []
+            record_offset = 0
+        # Above anything on disk, so a rebuild never reuses a mapped file
+        generation = max([*self._generations_on_disk(), base.generation if base else 0]) + 1
+
+        new_records = np.zeros(len(entries), RECORD_DTYPE)
+        swedish_new: list[tuple[bytes, int, int, int]] = []
+        english_new: list[tuple[bytes, int, int, int]] = []
+
+        def append(data: bytes) -> int:
+            offset = len(blob)
+            blob.extend(data)
+            return offset
+
+        for position, entry in enumerate(entries):
+            record_index = record_offset + position
+            payload = _encode_payload(entry)
+            new_records[position] = (
+                entry.word_id,
+                NO_FREQUENCY_RANK if entry.frequency_rank is None else entry.frequency_rank,
+                append(payload),
+                len(payload),
+            )
+            key = fold_text(entry.swedish).encode("utf-8")
+            swedish_new.append((key, append(key), len(key), record_index))
+            for gloss in english_keys(entry.english):
+                key = gloss.encode("utf-8")
+                english_new.append((key, append(key), len(key), record_index))
+        records.append(new_records)
+
+        swedish_keys = self._merge_keys(base, "swedish", swedish_new)
+        english_keys_table = self._merge_keys(base, "english", english_new)
+        all_records = np.concatenate(records)
+
+        path = self._generation_path(generation)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with tmp_path.open("wb") as index_file:
+            index_file.write(
+                HEADER.pack(
+                    MAGIC,
+                    generation,
+                    len(all_records),
+                    len(swedish_keys),
+                    len(english_keys_table),
+                )
+            )
+            index_file.write(all_records.tobytes())
+            index_file.write(swedish_keys.tobytes())
+            index_file.write(english_keys_table.tobytes())
+            index_file.write(blob)
+            index_file.flush()
+            os.fsync(index_file.fileno())
+        os.replace(tmp_path, path)
+
+        pointer_tmp = self.directory / f"{CURRENT_FILE}.tmp"
+        with pointer_tmp.open("w") as pointer_file:
+            pointer_file.write(str(generation))
+            pointer_file.flush()
+            os.fsync(pointer_file.fileno())
+        os.replace(pointer_tmp, self.directory / CURRENT_FILE)
+        self._next_check = 0.0
+        self._remove_old_generations(generation)
+        logger.info("Dictionary index generation %d: %d words", generation, len(all_records))
+
+    @staticmethod
+    def _merge_keys(
+        base: _MappedGeneration | None,
+        language: str,
+        new_keys: list[tuple[bytes, int, int, int]],
+    ) -> np.ndarray:
+        """Splice new keys into the base generation's sorted key table."""
+        new_keys.sort(key=lambda item: item[0])
+        new_table = np.array([item[1:] for item in new_keys], dtype=KEY_DTYPE)
+        if base is None:
+            return new_table
+
+        existing = getattr(base, f"{language}_keys")
+        fields = getattr(base, f"{language}_fields")
+        positions = [base.lower_bound(fields, item[0]) for item in new_keys]
+        return np.insert(existing, positions, new_table)
+
+    def _remove_old_generations(self, current: int) -> None:
+        """
+        Delete generations superseded more than GENERATION_GRACE_SECONDS ago.
+
+        A generation counts as superseded from the moment the next one was
+        published (that file's mtime). Workers that still have a deleted file
+        mapped keep their mapping; best effort, as files still mapped on some
+        platforms cannot be removed.
+        """
+        cutoff = time.time() - GENERATION_GRACE_SECONDS
+        generations = self._generations_on_disk()
+        published = sorted(generations)
+        for older, newer in zip(published, published[1:], strict=False):
+            if older >= current:
+                break
+            with suppress(OSError):
+                if generations[newer].stat().st_mtime < cutoff:
+                    generations[older].unlink()
+        # Left behind by writers that died mid-write
+        for tmp_path in self.directory.glob("words.*.tmp"):
+            with suppress(OSError):
+                if tmp_path.stat().st_mtime < cutoff:
+                    tmp_path.unlink()
+
+
+class DictionaryIndexWriter:
+    """
+    Applies index writes from background tasks, in worker threads.
+
+    Committed words are buffered and merged in one generation per batch; a
+    missing index is built at most once at a time. Words committed while a
+    build runs are merged after it, so none are lost to the build's snapshot.
+    """
+
+    def __init__(self, index: DictionaryIndex, session_maker: async_sessionmaker[AsyncSession]):
+        self.index = index
+        self._session_maker = session_maker
+        self._pending: list[DictionaryEntry] = []
+        self._apply_task: asyncio.Task[None] | None = None
+        self._build_task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        """Build the index in the background if no generation exists yet."""
+        self.build_if_missing()
+
+    async def stop(self) -> None:
+        """Wait for running writes, including words still buffered."""
+        for task in (self._build_task, self._apply_task):
+            if task is not None:
+                with suppress(Exception):
+                    await task
+
+    def add(self, entries: list[DictionaryEntry]) -> None:
+        """Buffer committed words; never blocks."""
+        self._pending.extend(entries)
+        if self._apply_task is None or self._apply_task.done():
+            self._apply_task = asyncio.get_running_loop().create_task(
+                self._apply_pending(), name="dictionary-index-writer"
+            )
+
+    def build_if_missing(self) -> None:
+        """Start building the index unless it exists or is being built."""
+        if self.index.is_built or (self._build_task is not None and not self._build_task.done()):
+            return
+        self._build_task = asyncio.get_running_loop().create_task(
+            self._build(), name="dictionary-index-build"
+        )
+
+    async def _build(self) -> None:
+        try:
+            async with self._session_maker() as session:
+                await rebuild_dictionary_index(session, if_missing=True)
+        except Exception:
+            logger.exception("Failed to build the dictionary index")
+
+    async def _apply_pending(self) -> None:
+        if self._build_task is not None:
+            with suppress(Exception):
+                await self._build_task
+        while self._pending:
+            batch, self._pending = self._pending, []
+            # Without an index the next build reads these words from the table
+            if not self.index.is_built:
+                continue
+            try:
+                await asyncio.to_thread(self.index.add_entries, batch)
+            except Exception:
+                logger.exception("Failed to add %d words to the dictionary index", len(batch))
+
+
+dictionary_index = DictionaryIndex(Path(settings.dictionary_index_dir))
+dictionary_index_writer = DictionaryIndexWriter(dictionary_index, async_session_maker)
+
+
+def ensure_dictionary_index() -> DictionaryIndex | None:
+    """
+    The index, or None while it is still being built.
+
+    A missing index is built in the background; requests never wait for it.
+    """
+    if dictionary_index.is_built:
+        return dictionary_index
+    dictionary_index_writer.build_if_missing()
+    return None
+
+
+async def rebuild_dictionary_index(db: AsyncSession, if_missing: bool = False) -> None:
+    """Write a new generation from the current words table (e.g. after a bulk import)."""
+    result = await db.stream(
+        select(
+            Word.id,
+            Word.swedish,
+            Word.english,
+            Word.part_of_speech,
+            Word.cefr_level,
+            Word.frequency_rank,
+        )
+    )
+    entries = [
+        DictionaryEntry(
+            word_id=row.id,
+            swedish=row.swedish,
+            english=row.english,
+            part_of_speech=row.part_of_speech,
+            cefr_level=row.cefr_level,
+            frequency_rank=row.frequency_rank,
+        )
+        async for row in result
+    ]
+    await asyncio.to_thread(dictionary_index.rebuild, entries, if_missing)
+
+
+def queue_dictionary_update(db: AsyncSession, words: Iterable[Word]) -> None:
+    """Add words to the index once the session's transaction commits."""
+    pending = db.info.setdefault(PENDING_ENTRIES_KEY, [])
+    pending.extend(DictionaryEntry.from_word(word) for word in words)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending_entries(session: Session) -> None:
+    entries = session.info.pop(PENDING_ENTRIES_KEY, None)
+    if entries:
+        dictionary_index_writer.add(entries)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_entries(session: Session) -> None:
+    session.info.pop(PENDING_ENTRIES_KEY, None)
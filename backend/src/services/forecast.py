@@ -0,0 +1,233 @@
+"""
+Review forecast: how many reviews fall due on each of the next N days.
+
+The default mode is a single GROUP BY over user_words.next_review truncated to
+days in the user's time zone. Simulation mode also projects future reviews by
+replaying the user's scheduler forward (every review answered with an
+assumed quality) in vectorized batches.
+"""
+
+from datetime import UTC, date, datetime, time, timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import numpy as np
+from sqlalchemy import func, literal, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.cache import create_cache_backend
+from src.core.config import get_settings
+from src.db.functions import local_day
+from src.db.session import run_after_commit
+from src.models.user import User
+from src.models.word import UserWord
+from src.schemas.word import ReviewForecast, ReviewForecastDay
+from src.services.scheduler import CardStates, Scheduler, scheduler_for_user
+
+settings = get_settings()
+
+forecast_cache = create_cache_backend(
+    settings.forecast_cache_backend,
+    max_entries=settings.forecast_cache_max_entries,
+    ttl_seconds=settings.forecast_cache_ttl_seconds,
+    namespace="review_forecasts",
+)
+
+
+def _forecast_cache_key(user_id: int) -> str:
+    return f"review-forecast:{user_id}"
+
+
+def _user_zone(name: str | None) -> ZoneInfo:
+    """The user's zone, falling back to UTC for unknown names."""
+    try:
+        return ZoneInfo(name or "UTC")
+    except (ZoneInfoNotFoundError, ValueError):
+        return ZoneInfo("UTC")
+
+
+def _utc_offset_seconds(now: datetime) -> int:
+    """UTC offset of an aware datetime, in seconds."""
+    offset = now.utcoffset()
+    if offset is None:
+        raise ValueError("now must be timezone-aware")
+    return int(offset.total_seconds())
+
+
+def _to_utc_datetime64(values: list[datetime]) -> np.ndarray:
+    """Naive-UTC datetime64[us] array (SQLite returns naive UTC, PostgreSQL aware)."""
+    return np.array(
+        [value.astimezone(UTC).replace(tzinfo=None) if value.tzinfo else value for value in values],
+        dtype="datetime64[us]",
+    )
+
+
+async def get_review_forecast(
+    db: AsyncSession,
+    user: User,
+    days: int = 30,
+    simulate: bool = False,
+    assumed_quality: int = 4,
+) -> ReviewForecast:
+    """
+    Reviews due per local day for the next `days` days (day 0 is today).
+
+    Overdue cards count towards today; never-reviewed cards are reported
+    separately as new_cards.
+    """
+    zone = _user_zone(user.timezone)
+    scheduler = scheduler_for_user(user)
+    params = f"{days}:{simulate}:{assumed_quality}:{zone.key}:{scheduler.name}"
+    cached = await forecast_cache.get(_forecast_cache_key(user.id)) or {}
+    if params in cached:
+        return ReviewForecast.model_validate(cached[params])
+
+    now = datetime.now(zone)
+    today = now.date()
+    horizon_end = datetime.combine(today + timedelta(days=days), time.min, zone)
+
+    counts: list[int] | np.ndarray
+    if simulate:
+        counts, new_cards = await _simulated_counts(
+            db, user.id, scheduler, now, today, horizon_end, days, assumed_quality
+        )
+    else:
+        counts, new_cards = await _histogram_counts(
+            db, user.id, zone, now, today, horizon_end, days
+        )
+
+    forecast = ReviewForecast(
+        timezone=zone.key,
+        simulated=simulate,
+        new_cards=new_cards,
+        days=[
+            ReviewForecastDay(day=today + timedelta(days=offset), due=int(count))
+            for offset, count in enumerate(counts)
+        ],
+    )
+
+    # Day 0 moves at local midnight, so never cache past it
+    next_midnight = datetime.combine(today + timedelta(days=1), time.min, zone)
+    cached[params] = forecast.model_dump(mode="json")
+    await forecast_cache.set(
+        _forecast_cache_key(user.id),
+        cached,
+        ttl_seconds=min(settings.forecast_cache_ttl_seconds, (next_midnight - now).total_seconds()),
+    )
+    return forecast
+
+
+def invalidate_review_forecast(db: AsyncSession, user_id: int) -> None:
+    """Drop a user's cached forecasts once the session commits (reviews, vocabulary changes)."""
+    run_after_commit(db, lambda: forecast_cache.delete(_forecast_cache_key(user_id)))
+
+
+async def _histogram_counts(
+    db: AsyncSession,
+    user_id: int,
+    zone: ZoneInfo,
+    now: datetime,
+    today: date,
+    horizon_end: datetime,
+    days: int,
+) -> tuple[list[int], int]:
+    """Current schedule only: one date_trunc histogram over the due-review index range."""
+    offset_minutes = _utc_offset_seconds(now) // 60
+    day = local_day(
+        UserWord.next_review,
+        literal(zone.key, literal_execute=True),
+        literal(offset_minutes, literal_execute=True),
+    ).label("day")
+
+    result = await db.execute(
+        select(day, func.count())
+        .where(
+            UserWord.user_id == user_id,
+            or_(UserWord.next_review.is_(None), UserWord.next_review < horizon_end),
+        )
+        .group_by(day)
+    )
+
+    counts = [0] * days
+    new_cards = 0
+    for bucket, count in result.all():
+        if bucket is None:
+            new_cards += count
+            continue
+        bucket_day = bucket.date() if isinstance(bucket, datetime) else date.fromisoformat(bucket)
+        index = max((bucket_day - today).days, 0)
+        if index < days:
+            counts[index] += count
+    return counts, new_cards
+
+
+async def _simulated_counts(
+    db: AsyncSession,
+    user_id: int,
+    scheduler: Scheduler,
+    now: datetime,
+    today: date,
+    horizon_end: datetime,
+    days: int,
+    assumed_quality: int,
+) -> tuple[np.ndarray, int]:
+    """
+    Replay the scheduler forward until every card's next review is past the horizon.
+
+    Each round reviews every card due inside the horizon at once; intervals
+    are at least a day, so there are at most `days` rounds. Local days use
+    the zone's current UTC offset.
+    """
+    result = await db.execute(
+        select(
+            UserWord.ease_factor,
+            UserWord.interval_days,
+            UserWord.repetition_number,
+            UserWord.stability,
+            UserWord.difficulty,
+            UserWord.last_reviewed,
+            UserWord.next_review,
+        ).where(
+            UserWord.user_id == user_id,
+            or_(UserWord.next_review.is_(None), UserWord.next_review < horizon_end),
+        )
+    )
+    rows = result.all()
+    scheduled = [row for row in rows if row.next_review is not None]
+    new_cards = len(rows) - len(scheduled)
+
+    counts = np.zeros(days, dtype=np.int64)
+    if not scheduled:
+        return counts, new_cards
+
+    cards = CardStates.from_rows(scheduled)
+    # Overdue cards are reviewed now
+    due = np.maximum(
+        _to_utc_datetime64([row.next_review for row in scheduled]),
+        _to_utc_datetime64([now])[0],
+    )
+
+    utc_offset = np.timedelta64(_utc_offset_seconds(now), "s")
+    today64 = np.datetime64(today, "D")
+    horizon64 = _to_utc_datetime64([horizon_end])[0]
+
+    active = np.flatnonzero(due < horizon64)
+    while active.size:
+        local_days = ((due[active] + utc_offset).astype("datetime64[D]") - today64).astype(np.int64)
+        counts += np.bincount(np.clip(local_days, 0, days - 1), minlength=days)
+
+        step = scheduler.review_batch(
+            np.full(active.size, assumed_quality),
+            cards.take(active),
+            reviewed_at=due[active],
+        )
+        cards.ease_factor[active] = step.ease_factor
+        cards.interval_days[active] = step.interval_days
+        cards.repetition_number[active] = step.repetition_number
+        cards.stability[active] = step.stability
+        cards.difficulty[active] = step.difficulty
+        cards.last_reviewed[active] = due[active]
+        due[active] = step.next_review
+
+        active = active[due[active] < horizon64]
+
+    return counts, new_cards
@@ -0,0 +1,122 @@
+"""
+Cache of chatbot replies that depend only on the question.
+
+The translator and vocabulary bots get the same questions over and over
+("vad betyder fika?"), mostly to open a session. Only those opening messages
+are cached: with no history, a reply is fully determined by the system prompt
+(bot, prompt text and the learner's CEFR levels) and the message; that pair,
+with the message normalized, is the cache key. Changing a bot prompt
+therefore starts a fresh set of keys. Later messages in a session are
+answered with their history and never cached. Other bots are only cached
+when listed in chat_cache_bots.
+
+Hits are served as one chunk. Saved tokens (estimated) and generation time
+are counted for /metrics.
+"""
+
+import hashlib
+import json
+import re
+import time
+import unicodedata
+from collections.abc import AsyncIterator, Iterable
+from dataclasses import dataclass
+
+from src.core.cache import CacheBackend, CacheStats, create_cache_backend
+from src.core.config import get_settings
+from src.core.prometheus import AI_REPLY_CACHE_SAVED_SECONDS, AI_REPLY_CACHE_SAVED_TOKENS
+from src.services.ai_client import CHARS_PER_TOKEN
+
+settings = get_settings()
+
+_WHITESPACE = re.compile(r"\s+")
+# Trailing punctuation does not change the question ("fika?" vs "fika")
+_TRAILING_PUNCTUATION = re.compile(r"[\s?!.。…]+$")
+
+
+def normalize_message(content: str) -> str:
+    """Unicode-normalized, case-folded message with collapsed whitespace."""
+    text = unicodedata.normalize("NFKC", content).casefold()
+    text = _WHITESPACE.sub(" ", text).strip()
+    return _TRAILING_PUNCTUATION.sub("", text)
+
+
+@dataclass
+class ReplyCacheSavings:
+    """What cache hits spared the providers."""
+
+    tokens: int = 0
+    seconds: float = 0.0
+
+
+class ReplyCache:
+    """Reply cache in front of the AI providers."""
+
+    def __init__(self, backend: CacheBackend, bots: Iterable[str]):
+        self.backend = backend
+        self.bots = frozenset(bots)
+        self.savings = ReplyCacheSavings()
+
+    def enabled_for(self, bot_type: str) -> bool:
+        """Whether replies of this bot are cached."""
+        return bot_type in self.bots
+
+    def key(self, bot_type: str, system: str, content: str) -> str:
+        """Cache key of a message sent with a system prompt."""
+        digest = hashlib.sha256(
+            json.dumps([bot_type, system, normalize_message(content)]).encode()
+        ).hexdigest()
+        return f"reply:{digest}"
+
+    async def stream(
+        self, key: str, prompt_chars: int, replies: AsyncIterator[str]
+    ) -> AsyncIterator[str]:
+        """
+        The cached reply, or the provider's reply (stored once complete).
+
+        Args:
+            key: Cache key from key()
+            prompt_chars: Length of the prompt, for the saved-token estimate
+            replies: Provider stream, only iterated on a miss
+        """
+        cached = await self.backend.get(key)
+        if cached is not None:
+            self.savings.tokens += cached["tokens"]
+            self.savings.seconds += cached["seconds"]
+            AI_REPLY_CACHE_SAVED_TOKENS.inc(cached["tokens"])
+            AI_REPLY_CACHE_SAVED_SECONDS.inc(cached["seconds"])
+            yield cached["reply"]
+            return
+
+        started = time.perf_counter()
+        parts = []
+        async for token in replies:
+            parts.append(token)
+            yield token
+        # Only complete replies get here: errors and disconnects skip the store
+        reply = "".join(parts)
+        if reply:
+            await self.backend.set(
+                key,
+                {
+                    "reply": reply,
+                    "tokens": (prompt_chars + len(reply)) // CHARS_PER_TOKEN,
+                    "seconds": time.perf_counter() - started,
+                },
+            )
+
+    def stats(self) -> CacheStats:
+        """Hit/miss counters of the backend."""
+        return self.backend.stats()
+
+
+reply_cache = ReplyCache(
+    create_cache_backend(
+        settings.chat_cache_backend,
+        max_entries=settings.chat_cache_max_entries,
+        ttl_seconds=settings.chat_cache_ttl_seconds,
+        max_bytes=settings.chat_cache_max_bytes,
+        namespace="chat_replies",
+    ),
+    settings.chat_cache_bots,
+)
@@ -0,0 +1,375 @@
+"""
+Append-only review event log (review_events).
+
+Review endpoints queue one event per answer on their session; once the
+transaction commits the events are handed to the in-process
+ReviewEventWriter, which inserts them in batches from a background task. The
+review request never waits on (or fails because of) the log.
+
+Maintenance (run by src.scripts.maintain_review_events):
+- monthly partitions are created ahead of time on PostgreSQL
+- rollups aggregate events into review_daily_rollups per user and UTC day
+- retention drops raw events older than the configured number of months
+"""
+
+import asyncio
+import contextlib
+import logging
+import re
+from collections.abc import Iterable
+from datetime import UTC, date, datetime, time
+from typing import Any, cast
+
+from sqlalchemy import CursorResult, case, delete, event, func, insert, literal, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from src.core.config import get_settings
+from src.core.prometheus import record_reviews
+from src.db.functions import local_day
+from src.db.session import async_session_maker, get_dialect_name
+from src.models.word import ReviewDailyRollup, ReviewEvent
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+PENDING_EVENTS_KEY = "review_events_pending"
+PARTITION_NAME = re.compile(r"^review_events_p(\d{4})_(\d{2})$")
+DEFAULT_PARTITION = "review_events_default"
+
+
+class ReviewEventWriter:
+    """
+    In-memory buffer of review events, inserted in batches by a background task.
+
+    A flush happens every flush_seconds, or sooner once batch_size events are
+    waiting. The buffer is bounded: past max_buffered events (e.g. while the
+    database is unreachable) the oldest are dropped and counted.
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        batch_size: int,
+        flush_seconds: float,
+        max_buffered: int,
+    ):
+        self._session_maker = session_maker
+        self._batch_size = batch_size
+        self._flush_seconds = flush_seconds
+        self._max_buffered = max_buffered
+        self._buffer: list[dict[str, Any]] = []
+        self._batch_ready = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: asyncio.Task[None] | None = None
+        self.written = 0
+        self.dropped = 0
+
+    def add(self, events: list[dict[str, Any]]) -> None:
+        """Buffer events; never blocks or touches the database."""
+        self._buffer.extend(events)
+        self._trim()
+        if len(self._buffer) >= self._batch_size:
+            self._batch_ready.set()
+
+    def start(self) -> None:
+        """Start the background flush loop on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="review-event-writer")
+
+    async def stop(self) -> None:
+        """Stop the flush loop and write whatever is still buffered."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self.flush()
+
+    async def flush(self) -> int:
+        """
+        Insert buffered events in batch_size chunks.
+
+        On a database error the failed batch goes back to the front of the
+        buffer and is retried on the next flush.
+
+        Returns:
+            Number of events written
+        """
+        written = 0
+        async with self._flush_lock:
+            while self._buffer:
+                batch = self._buffer[: self._batch_size]
+                del self._buffer[: self._batch_size]
+                try:
+                    async with self._session_maker() as session:
+                        await session.execute(insert(ReviewEvent), batch)
+                        await session.commit()
+                except Exception:
+                    logger.exception("Failed to write %d review events", len(batch))
+                    self._buffer[:0] = batch
+                    self._trim()
+                    break
+                written += len(batch)
+        self.written += written
+        return written
+
+    def stats(self) -> dict[str, int]:
+        """Buffered, written and dropped event counts."""
+        return {
+            "buffered": len(self._buffer),
+            "written": self.written,
+            "dropped": self.dropped,
+        }
+
+    async def _run(self) -> None:
+        while True:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._batch_ready.wait(), timeout=self._flush_seconds)
+            self._batch_ready.clear()
+            await self.flush()
+
+    def _trim(self) -> None:
+        overflow = len(self._buffer) - self._max_buffered
+        if overflow > 0:
+            del self._buffer[:overflow]
+            self.dropped += overflow
+            logger.warning("Review event buffer full, dropped %d oldest events", overflow)
+
+
+review_event_writer = ReviewEventWriter(
+    async_session_maker,
+    batch_size=settings.review_event_batch_size,
+    flush_seconds=settings.review_event_flush_seconds,
+    max_buffered=settings.review_event_max_buffered,
+)
+
+
+def queue_review_events(db: AsyncSession, events: Iterable[dict[str, Any]]) -> None:
+    """Log review events once the session's transaction commits."""
+    pending = db.info.setdefault(PENDING_EVENTS_KEY, [])
+    pending.extend(events)
+
+
+@event.listens_for(Session, "after_commit")
+def _hand_over_pending_events(session: Session) -> None:
+    events = session.info.pop(PENDING_EVENTS_KEY, None)
+    if events:
+        review_event_writer.add(events)
+        record_reviews(event["quality"] for event in events)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_events(session: Session) -> None:
+    session.info.pop(PENDING_EVENTS_KEY, None)
+
+
+# ============================================================================
+# Partitions and retention
+# ============================================================================
+
+
+def add_months(month: date, months: int) -> date:
+    """First day of the month `months` after (or before) `month`."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """Name of the review_events partition holding `month`."""
+    return f"review_events_p{month:%Y_%m}"
+
+
+async def list_review_event_partitions(db: AsyncSession) -> dict[str, date]:
+    """Monthly partitions of review_events (name -> first day of month), PostgreSQL only."""
+    result = await db.execute(
+        text(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            WHERE parent.relname = 'review_events'
+            """
+        )
+    )
+    partitions = {}
+    for name in result.scalars().all():
+        match = PARTITION_NAME.match(name)
+        if match:
+            partitions[name] = date(int(match[1]), int(match[2]), 1)
+    return partitions
+
+
+async def ensure_review_event_partitions(
+    db: AsyncSession, today: date | None = None, months_ahead: int | None = None
+) -> list[str]:
+    """
+    Create monthly partitions from the current month to months_ahead.
+
+    Does nothing on databases without declarative partitioning.
+
+    Returns:
+        Names of the partitions that were created
+    """
+    if get_dialect_name(db) != "postgresql":
+        return []
+    if months_ahead is None:
+        months_ahead = settings.review_event_partitions_ahead
+
+    current = (today or datetime.now(UTC).date()).replace(day=1)
+    existing = await list_review_event_partitions(db)
+    has_default = await _has_default_partition(db)
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        name = partition_name(month)
+        if name in existing:
+            continue
+        await _create_partition(db, name, month, has_default)
+        created.append(name)
+    return created
+
+
+async def _has_default_partition(db: AsyncSession) -> bool:
+    result = await db.execute(
+        text("SELECT 1 FROM pg_class WHERE relname = :name"), {"name": DEFAULT_PARTITION}
+    )
+    return result.first() is not None
+
+
+async def _create_partition(db: AsyncSession, name: str, month: date, has_default: bool) -> None:
+    """
+    Create the partition of one month.
+
+    Events of that month already in the default partition (e.g. after a
+    missed maintenance run) would make CREATE ... PARTITION OF fail, so the
+    default partition is detached while they are moved to the new one.
+    """
+    start = datetime.combine(month, time.min, UTC)
+    end = datetime.combine(add_months(month, 1), time.min, UTC)
+    bounds = f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    in_month = "reviewed_at >= :start AND reviewed_at < :end"
+    period = {"start": start, "end": end}
+
+    stranded = False
+    if has_default:
+        result = await db.execute(
+            text(f"SELECT 1 FROM {DEFAULT_PARTITION} WHERE {in_month} LIMIT 1"), period
+        )
+        stranded = result.first() is not None
+    if not stranded:
+        await db.execute(text(f"CREATE TABLE {name} PARTITION OF review_events {bounds}"))
+        return
+
+    await db.execute(text(f"ALTER TABLE review_events DETACH PARTITION {DEFAULT_PARTITION}"))
+    await db.execute(text(f"CREATE TABLE {name} PARTITION OF review_events {bounds}"))
+    moved = cast(
+        CursorResult[Any],
+        await db.execute(
+            text(f"INSERT INTO {name} SELECT * FROM {DEFAULT_PARTITION} WHERE {in_month}"), period
+        ),
+    )
+    await db.execute(text(f"DELETE FROM {DEFAULT_PARTITION} WHERE {in_month}"), period)
+    await db.execute(
+        text(f"ALTER TABLE review_events ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT")
+    )
+    logger.info("Moved %d events from %s to %s", moved.rowcount, DEFAULT_PARTITION, name)
+
+
+async def apply_review_event_retention(
+    db: AsyncSession, today: date | None = None, months: int | None = None
+) -> tuple[list[str], int]:
+    """
+    Remove raw events from before the retention window (whole months).
+
+    On PostgreSQL expired monthly partitions are dropped outright; anything
+    older that is left (e.g. in the default partition) is deleted row by row.
+
+    Returns:
+        Dropped partition names and the number of rows deleted
+    """
+    if months is None:
+        months = settings.review_event_retention_months
+    cutoff = add_months((today or datetime.now(UTC).date()).replace(day=1), -months)
+
+    dropped: list[str] = []
+    if get_dialect_name(db) == "postgresql":
+        partitions = await list_review_event_partitions(db)
+        for name, month in sorted(partitions.items(), key=lambda item: item[1]):
+            if add_months(month, 1) <= cutoff:
+                await db.execute(text(f"DROP TABLE {name}"))
+                dropped.append(name)
+
+    result = cast(
+        CursorResult[Any],
+        await db.execute(
+            delete(ReviewEvent).where(
+                ReviewEvent.reviewed_at < datetime.combine(cutoff, time.min, UTC)
+            )
+        ),
+    )
+    return dropped, result.rowcount
+
+
+# ============================================================================
+# Rollups
+# ============================================================================
+
+
+async def rollup_review_events(db: AsyncSession, since: date, until: date) -> int:
+    """
+    Recompute review_daily_rollups for the UTC days in [since, until).
+
+    Idempotent: existing rollups in the range are replaced, so late events
+    are picked up by simply rolling the same days up again.
+
+    Returns:
+        Number of rollup rows written
+    """
+    await db.execute(
+        delete(ReviewDailyRollup).where(
+            ReviewDailyRollup.day >= since,
+            ReviewDailyRollup.day < until,
+        )
+    )
+
+    day = local_day(
+        ReviewEvent.reviewed_at,
+        literal("UTC", literal_execute=True),
+        literal(0, literal_execute=True),
+    )
+    totals = (
+        select(
+            ReviewEvent.user_id,
+            day,
+            func.count(),
+            func.sum(case((ReviewEvent.quality >= 3, 1), else_=0)),
+            func.sum(ReviewEvent.quality),
+            func.count(ReviewEvent.response_ms),
+            func.coalesce(func.sum(ReviewEvent.response_ms), 0),
+        )
+        .where(
+            ReviewEvent.reviewed_at >= datetime.combine(since, time.min, UTC),
+            ReviewEvent.reviewed_at < datetime.combine(until, time.min, UTC),
+        )
+        .group_by(ReviewEvent.user_id, day)
+    )
+    result = cast(
+        CursorResult[Any],
+        await db.execute(
+            insert(ReviewDailyRollup).from_select(
+                [
+                    "user_id",
+                    "day",
+                    "reviews",
+                    "correct",
+                    "quality_sum",
+                    "timed_reviews",
+                    "response_ms_sum",
+                ],
+                totals,
+            )
+        ),
+    )
+    return result.rowcount
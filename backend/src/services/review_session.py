@@ -0,0 +1,272 @@
+"""
+Server-side review sessions.
+
+Starting a session snapshots the user's ordered due queue (overdue cards with
+new cards interleaved) into the review-session cache. Cards are then handed
+out in small prefetch windows, answers only move the session cursor, and
+ending the session writes every SRS update at once via submit_reviews_batch.
+
+Answers to one session may arrive concurrently (double taps, several tabs).
+Changes are serialized per session within a process and saved with a
+compare-and-set on the whole session, so an update made meanwhile by another
+worker is retried instead of overwritten. The default "memory" backend keeps
+sessions per process: with several workers, review_session_backend must be a
+shared backend ("sqlite" on a single host).
+"""
+
+import uuid
+import weakref
+from asyncio import Lock
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from copy import deepcopy
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from typing import Any, TypeVar
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.cache import create_cache_backend
+from src.core.config import get_settings
+from src.core.exceptions import BadRequestException, ConflictException, NotFoundException
+from src.models.word import UserWord, Word
+from src.schemas.word import (
+    ReviewBatchItem,
+    ReviewCard,
+    ReviewResponse,
+    ReviewSessionCreate,
+    ReviewSessionProgress,
+    ReviewSessionResponse,
+)
+from src.services.scheduler import Scheduler
+from src.services.vocabulary import submit_reviews_batch
+
+settings = get_settings()
+
+T = TypeVar("T")
+
+# One new card is shown after every NEW_CARD_SPACING overdue cards
+NEW_CARD_SPACING = 4
+# A failed card (quality < 3) comes back this many cards later in the session
+REQUEUE_GAP = 3
+# Compare-and-set attempts before an answer is rejected as conflicting
+UPDATE_ATTEMPTS = 5
+
+CARD_COLUMNS = (
+    UserWord.id.label("user_word_id"),
+    UserWord.word_id,
+    Word.swedish,
+    Word.english,
+    Word.pronunciation,
+    Word.part_of_speech,
+    Word.gender,
+    Word.example_sv,
+    Word.example_en,
+    UserWord.status,
+    UserWord.interval_days,
+)
+
+review_sessions = create_cache_backend(
+    settings.review_session_backend,
+    max_entries=settings.review_session_max_entries,
+    ttl_seconds=settings.review_session_ttl_seconds,
+    namespace="review_sessions",
+)
+# Per-process locks of the sessions being updated, dropped once unused
+_session_locks: weakref.WeakValueDictionary[str, Lock] = weakref.WeakValueDictionary()
+
+
+@dataclass
+class ReviewSession:
+    """Snapshot of a review session; plain data so shared backends can serialize it."""
+
+    id: str
+    user_id: int
+    window: int
+    cards: dict[str, dict[str, Any]]  # card payloads keyed by str(user_word_id)
+    queue: list[int]  # user_word_ids still to show, in order
+    answers: list[dict[str, Any]] = field(default_factory=list)
+    # Bumped on every save
+    version: int = 0
+    # Set while the session's answers are being written
+    ended: bool = False
+
+    def next_window(self) -> list[ReviewCard]:
+        """The next `window` cards of the queue."""
+        return [ReviewCard(**self.cards[str(card_id)]) for card_id in self.queue[: self.window]]
+
+    def to_response(self) -> ReviewSessionResponse:
+        """Session summary with the next prefetch window."""
+        return ReviewSessionResponse(
+            session_id=self.id,
+            total_cards=len(self.cards),
+            answered=len(self.answers),
+            remaining=len(self.queue),
+            cards=self.next_window(),
+        )
+
+
+def _session_key(session_id: str) -> str:
+    return f"review-session:{session_id}"
+
+
+def interleave_new_cards(overdue: list[int], new: list[int], spacing: int) -> list[int]:
+    """Insert one new card after every `spacing` overdue cards; leftovers go last."""
+    queue: list[int] = []
+    new_cards = iter(new)
+    for position, card_id in enumerate(overdue, start=1):
+        queue.append(card_id)
+        if position % spacing == 0:
+            next_new = next(new_cards, None)
+            if next_new is not None:
+                queue.append(next_new)
+    queue.extend(new_cards)
+    return queue
+
+
+async def start_review_session(
+    db: AsyncSession, user_id: int, options: ReviewSessionCreate
+) -> ReviewSession:
+    """Snapshot the user's due queue into a new session."""
+    now = datetime.now(UTC)
+
+    # Both queries are range scans on ix_user_words_user_id_next_review
+    overdue_result = await db.execute(
+        select(*CARD_COLUMNS)
+        .join(Word, UserWord.word_id == Word.id)
+        .where(UserWord.user_id == user_id, UserWord.next_review <= now)
+        .order_by(UserWord.next_review, UserWord.id)
+        .limit(options.limit)
+    )
+    overdue = [row._asdict() for row in overdue_result.all()]
+
+    new: list[dict[str, Any]] = []
+    if options.new_limit:
+        new_result = await db.execute(
+            select(*CARD_COLUMNS)
+            .join(Word, UserWord.word_id == Word.id)
+            .where(UserWord.user_id == user_id, UserWord.next_review.is_(None))
+            .order_by(UserWord.id)
+            .limit(options.new_limit)
+        )
+        new = [row._asdict() for row in new_result.all()]
+
+    session = ReviewSession(
+        id=uuid.uuid4().hex,
+        user_id=user_id,
+        window=options.window,
+        cards={str(card["user_word_id"]): card for card in overdue + new},
+        queue=interleave_new_cards(
+            [card["user_word_id"] for card in overdue],
+            [card["user_word_id"] for card in new],
+            NEW_CARD_SPACING,
+        ),
+    )
+    await _save(session)
+    return session
+
+
+async def get_review_session(user_id: int, session_id: str) -> ReviewSession:
+    """Load a session owned by the user."""
+    return _owned(await review_sessions.get(_session_key(session_id)), user_id)
+
+
+async def answer_review_card(
+    user_id: int, session_id: str, answer: ReviewBatchItem
+) -> ReviewSessionProgress:
+    """
+    Record an answer in the session without touching the database.
+
+    The card leaves the queue; a failed card is queued again REQUEUE_GAP
+    cards later so it is practised before the session ends.
+    """
+    answered_at = answer.answered_at or datetime.now(UTC)
+
+    def record(session: ReviewSession) -> bool:
+        try:
+            session.queue.remove(answer.user_word_id)
+        except ValueError:
+            raise BadRequestException("Card is not pending in this review session")
+        session.answers.append(
+            {
+                "user_word_id": answer.user_word_id,
+                "quality": answer.quality,
+                "response_ms": answer.response_ms,
+                "answered_at": answered_at.isoformat(),
+            }
+        )
+        requeued = answer.quality < 3
+        if requeued:
+            session.queue.insert(min(REQUEUE_GAP, len(session.queue)), answer.user_word_id)
+        return requeued
+
+    session, requeued = await _update(user_id, session_id, record)
+    return ReviewSessionProgress(
+        answered=len(session.answers),
+        remaining=len(session.queue),
+        requeued=requeued,
+    )
+
+
+async def end_review_session(
+    db: AsyncSession, user_id: int, session_id: str, scheduler: Scheduler | None = None
+) -> list[ReviewResponse]:
+    """Write every answer of the session with one batch update and discard it."""
+
+    def mark_ended(session: ReviewSession) -> None:
+        session.ended = True
+
+    # Claim the session first: answers arriving from now on are refused, not lost
+    session, _ = await _update(user_id, session_id, mark_ended)
+    key = _session_key(session_id)
+    responses = []
+    if session.answers:
+        answers = [ReviewBatchItem.model_validate(answer) for answer in session.answers]
+        try:
+            responses = await submit_reviews_batch(db, user_id, answers, scheduler)
+        except Exception:
+            # Nothing was written: hand the session back so ending can be retried
+            claimed = asdict(session)
+            session.ended = False
+            session.version += 1
+            await review_sessions.replace(key, claimed, asdict(session))
+            raise
+    await review_sessions.delete(key)
+    return responses
+
+
+def _owned(data: dict[str, Any] | None, user_id: int) -> ReviewSession:
+    if data is None or data["user_id"] != user_id or data.get("ended"):
+        raise NotFoundException("Review session not found or expired")
+    # A copy: the memory backend hands out the stored object itself
+    return ReviewSession(**deepcopy(data))
+
+
+@asynccontextmanager
+async def _session_lock(session_id: str) -> AsyncIterator[None]:
+    lock = _session_locks.get(session_id)
+    if lock is None:
+        lock = _session_locks[session_id] = Lock()
+    async with lock:
+        yield
+
+
+async def _update(
+    user_id: int, session_id: str, change: Callable[[ReviewSession], T]
+) -> tuple[ReviewSession, T]:
+    """Apply change to the stored session and save it unless it changed meanwhile."""
+    key = _session_key(session_id)
+    async with _session_lock(session_id):
+        for _ in range(UPDATE_ATTEMPTS):
+            stored = await review_sessions.get(key)
+            session = _owned(stored, user_id)
+            result = change(session)
+            session.version += 1
+            if await review_sessions.replace(key, stored, asdict(session)):
+                return session, result
+    raise ConflictException("Review session was changed concurrently, try again")
+
+
+async def _save(session: ReviewSession) -> None:
+    await review_sessions.set(_session_key(session.id), asdict(session))
@@ -0,0 +1,246 @@
+"""
+Pluggable review schedulers.
+
+A Scheduler turns answers into new SRS state for a batch of cards. SM-2 is
+the classic ease-factor algorithm from services/srs.py; FSRS tracks
+stability and difficulty per card (services/fsrs.py) and schedules the next
+review for when recall is predicted to drop to the desired retention, which
+typically needs fewer reviews for the same retention.
+
+The active scheduler is settings.scheduler unless a user picked their own
+(User.scheduler); fitted per-user FSRS weights live in User.scheduler_weights.
+
+Every scheduler keeps ease_factor, interval_days, repetition_number and
+status up to date, so queues, statistics and forecasts work unchanged.
+"""
+
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import numpy as np
+
+from src.core.config import get_settings
+from src.models.user import User
+from src.services.fsrs import (
+    AGAIN,
+    DEFAULT_WEIGHTS,
+    WEIGHT_COUNT,
+    fsrs_step,
+    next_interval,
+    quality_to_rating,
+    seed_from_sm2,
+)
+from src.services.srs import (
+    STATUS_DTYPE,
+    SRSBatchResult,
+    SRSResult,
+    calculate_sm2,
+    calculate_sm2_batch,
+    determine_status_batch,
+    to_datetime64,
+)
+
+settings = get_settings()
+
+
+@dataclass
+class CardStates:
+    """Columnar scheduling state of a batch of cards (one element per card)."""
+
+    ease_factor: np.ndarray  # float64
+    interval_days: np.ndarray  # int64
+    repetition_number: np.ndarray  # int64
+    stability: np.ndarray  # float64, NaN = not tracked yet
+    difficulty: np.ndarray  # float64, NaN = not tracked yet
+    last_reviewed: np.ndarray  # datetime64[us] naive UTC, NaT = never
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Any]) -> "CardStates":
+        """Build from UserWord rows or mappings with the SRS columns."""
+
+        def column(name: str) -> list[Any]:
+            return [row[name] if isinstance(row, dict) else getattr(row, name) for row in rows]
+
+        return cls(
+            ease_factor=np.array(column("ease_factor"), dtype=np.float64),
+            interval_days=np.array(column("interval_days"), dtype=np.int64),
+            repetition_number=np.array(column("repetition_number"), dtype=np.int64),
+            stability=np.array(
+                [np.nan if value is None else value for value in column("stability")],
+                dtype=np.float64,
+            ),
+            difficulty=np.array(
+                [np.nan if value is None else value for value in column("difficulty")],
+                dtype=np.float64,
+            ),
+            last_reviewed=np.array(
+                [
+                    np.datetime64("NaT") if value is None else to_datetime64(value)
+                    for value in column("last_reviewed")
+                ],
+                dtype="datetime64[us]",
+            ),
+        )
+
+    def take(self, indices: np.ndarray) -> "CardStates":
+        """A copy holding only the cards at `indices`."""
+        return CardStates(
+            **{name: getattr(self, name)[indices] for name in self.__dataclass_fields__}
+        )
+
+
+class Scheduler(ABC):
+    """Computes the next SRS state of cards from answer qualities (0-5)."""
+
+    name: str
+
+    @abstractmethod
+    def __init__(self, weights: Sequence[float] | None = None):
+        """Create a scheduler; `weights` are fitted parameters, if it has any."""
+
+    @abstractmethod
+    def review_batch(
+        self,
+        quality: np.ndarray,
+        cards: CardStates,
+        reviewed_at: datetime | np.ndarray | None = None,
+    ) -> SRSBatchResult:
+        """Vectorized review of a batch of cards."""
+
+    def review(self, quality: int, card: Any, reviewed_at: datetime | None = None) -> SRSResult:
+        """Review a single card (a UserWord or a mapping of its SRS columns)."""
+        reviewed_at = reviewed_at or datetime.now(UTC)
+        result = self.review_batch(np.array([quality]), CardStates.from_rows([card]), reviewed_at)
+        return SRSResult(
+            ease_factor=float(result.ease_factor[0]),
+            interval_days=int(result.interval_days[0]),
+            repetition_number=int(result.repetition_number[0]),
+            next_review=reviewed_at + timedelta(days=int(result.interval_days[0])),
+            status=str(result.status[0]),
+            stability=_optional_float(result.stability),
+            difficulty=_optional_float(result.difficulty),
+        )
+
+
+class SM2Scheduler(Scheduler):
+    """Classic SM-2; clears any FSRS state so a later switch re-seeds it."""
+
+    name = "sm2"
+
+    def __init__(self, weights: Sequence[float] | None = None):
+        pass  # SM-2 has no fitted parameters
+
+    def review_batch(
+        self,
+        quality: np.ndarray,
+        cards: CardStates,
+        reviewed_at: datetime | np.ndarray | None = None,
+    ) -> SRSBatchResult:
+        result = calculate_sm2_batch(
+            quality,
+            cards.ease_factor,
+            cards.interval_days,
+            cards.repetition_number,
+            reviewed_at=reviewed_at,
+        )
+        result.stability = np.full(len(result.interval_days), np.nan)
+        result.difficulty = np.full(len(result.interval_days), np.nan)
+        return result
+
+    def review(self, quality: int, card: Any, reviewed_at: datetime | None = None) -> SRSResult:
+        # The scalar SM-2 path is cheaper than a one-element batch
+        def value(name: str) -> Any:
+            return card[name] if isinstance(card, dict) else getattr(card, name)
+
+        return calculate_sm2(
+            quality=quality,
+            ease_factor=value("ease_factor"),
+            interval_days=value("interval_days"),
+            repetition_number=value("repetition_number"),
+            reviewed_at=reviewed_at,
+        )
+
+
+class FSRSScheduler(Scheduler):
+    """Memory-model scheduler targeting a desired recall probability."""
+
+    name = "fsrs"
+
+    def __init__(self, weights: Sequence[float] | None = None):
+        if weights is None or len(weights) != WEIGHT_COUNT:
+            weights = settings.fsrs_weights or DEFAULT_WEIGHTS
+        self.weights = np.array(weights, dtype=np.float64)
+        self.desired_retention = settings.fsrs_desired_retention
+
+    def review_batch(
+        self,
+        quality: np.ndarray,
+        cards: CardStates,
+        reviewed_at: datetime | np.ndarray | None = None,
+    ) -> SRSBatchResult:
+        quality = np.clip(np.asarray(quality, dtype=np.int64), 0, 5)
+        reviewed64 = to_datetime64(reviewed_at)
+        rating = quality_to_rating(quality)
+
+        # Cards with SM-2 history but no memory state start from their SM-2 interval,
+        # including lapsed ones whose repetition_number went back to 0
+        stability, difficulty = cards.stability.copy(), cards.difficulty.copy()
+        unseeded = np.isnan(stability) & ~np.isnat(cards.last_reviewed)
+        if unseeded.any():
+            stability[unseeded], difficulty[unseeded] = seed_from_sm2(
+                cards.ease_factor[unseeded], cards.interval_days[unseeded]
+            )
+
+        elapsed = np.divide(reviewed64 - cards.last_reviewed, np.timedelta64(1, "D"))
+        elapsed = np.where(np.isnat(cards.last_reviewed), 0.0, elapsed)
+        stability, difficulty, _ = fsrs_step(self.weights, stability, difficulty, elapsed, rating)
+
+        successful = rating > AGAIN
+        new_interval = next_interval(stability, self.desired_retention)
+        new_repetition = np.where(successful, cards.repetition_number + 1, 0)
+        status = np.where(
+            successful,
+            determine_status_batch(new_repetition, quality),
+            "review_needed",
+        ).astype(STATUS_DTYPE)
+
+        return SRSBatchResult(
+            ease_factor=cards.ease_factor.copy(),
+            interval_days=new_interval,
+            repetition_number=new_repetition,
+            next_review=reviewed64 + new_interval.astype("timedelta64[D]"),
+            status=status,
+            stability=stability,
+            difficulty=difficulty,
+        )
+
+
+SCHEDULERS: dict[str, type[Scheduler]] = {
+    SM2Scheduler.name: SM2Scheduler,
+    FSRSScheduler.name: FSRSScheduler,
+}
+
+
+def create_scheduler(name: str, weights: list[float] | None = None) -> Scheduler:
+    """Instantiate a registered scheduler by name."""
+    try:
+        scheduler_class = SCHEDULERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown scheduler: {name!r}")
+    return scheduler_class(weights)
+
+
+def scheduler_for_user(user: User | None) -> Scheduler:
+    """The user's chosen scheduler (with their fitted weights), else the default."""
+    if user is None:
+        return create_scheduler(settings.scheduler)
+    return create_scheduler(user.scheduler or settings.scheduler, user.scheduler_weights)
+
+
+def _optional_float(values: np.ndarray | None) -> float | None:
+    if values is None or np.isnan(values[0]):
+        return None
+    return float(values[0])
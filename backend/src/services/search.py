@@ -0,0 +1,65 @@
+"""
+Dictionary search with Swedish diacritic folding and ranking.
+
+On PostgreSQL, substring matches on the folded Swedish/English columns are
+served by pg_trgm GIN indexes and ties are broken by trigram similarity.
+Other dialects (SQLite in tests) run the same folded LIKE + CASE ranking
+without the extension.
+"""
+
+from typing import TypeVarTuple
+
+from sqlalchemy import ColumnElement, Select, case, func, or_
+
+from src.db.functions import fold_text, folded
+from src.models.word import Word
+
+# Match quality ranks (lower is better)
+RANK_EXACT_SWEDISH = 0
+RANK_EXACT_ENGLISH = 1
+RANK_PREFIX_SWEDISH = 2
+RANK_PREFIX_ENGLISH = 3
+RANK_SUBSTRING = 4
+
+Columns = TypeVarTuple("Columns")
+
+
+def word_search_filter(search: str) -> ColumnElement[bool]:
+    """Filter words whose folded Swedish or English text contains the search."""
+    term = fold_text(search)
+    return or_(
+        folded(Word.swedish).contains(term, autoescape=True),
+        folded(Word.english).contains(term, autoescape=True),
+    )
+
+
+def word_search_rank(search: str) -> ColumnElement[int]:
+    """Rank matches: exact before prefix before substring, Swedish before English."""
+    term = fold_text(search)
+    swedish = folded(Word.swedish)
+    english = folded(Word.english)
+    return case(
+        (swedish == term, RANK_EXACT_SWEDISH),
+        (english == term, RANK_EXACT_ENGLISH),
+        (swedish.startswith(term, autoescape=True), RANK_PREFIX_SWEDISH),
+        (english.startswith(term, autoescape=True), RANK_PREFIX_ENGLISH),
+        else_=RANK_SUBSTRING,
+    )
+
+
+def apply_word_search(query: Select[*Columns], search: str, dialect_name: str) -> Select[*Columns]:
+    """
+    Restrict a query that selects from Word to search matches, best first.
+
+    Call before adding the query's own ORDER BY, which then breaks ties.
+    """
+    query = query.where(word_search_filter(search)).order_by(word_search_rank(search))
+    if dialect_name == "postgresql":
+        term = fold_text(search)
+        query = query.order_by(
+            func.greatest(
+                func.similarity(folded(Word.swedish), term),
+                func.similarity(folded(Word.english), term),
+            ).desc()
+        )
+    return query
@@ -17,7 +17,16 @@ Quality ratings:
 """
 
 from dataclasses import dataclass
-from datetime import datetime, timedelta, timezone
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+
+# Statuses as produced by _determine_status (fixed-width for NumPy string arrays)
+STATUS_DTYPE = "<U13"
+
+# Distance from an exact .xx5 tie below which NumPy's decimal rounding may
+# disagree with Python's correctly rounded round(x, 2)
+_ROUNDING_TIE_TOLERANCE = 1e-6
 
 
 @dataclass
@@ -29,6 +38,9 @@ class SRSResult:
     repetition_number: int
     next_review: datetime
     status: str
+    # Memory-model state; only set by schedulers that track it (FSRS)
+    stability: float | None = None
+    difficulty: float | None = None
 
 
 def calculate_sm2(
@@ -36,6 +48,7 @@ def calculate_sm2(
     ease_factor: float = 2.5,
     interval_days: int = 1,
     repetition_number: int = 0,
+    reviewed_at: datetime | None = None,
 ) -> SRSResult:
     """
     Calculate next review interval using SM-2 algorithm.
@@ -45,6 +58,7 @@ def calculate_sm2(
         ease_factor: Current ease factor (default 2.5)
         interval_days: Current interval in days
         repetition_number: Current repetition count
+        reviewed_at: When the answer was given (defaults to now)
 
     Returns:
         SRSResult with updated SRS values
@@ -76,7 +90,8 @@ def calculate_sm2(
         status = "review_needed"
 
     # Calculate next review date
-    next_review = datetime.now(timezone.utc) + timedelta(days=new_interval)
+    reviewed_at = reviewed_at or datetime.now(UTC)
+    next_review = reviewed_at + timedelta(days=new_interval)
 
     return SRSResult(
         ease_factor=round(new_ef, 2),
@@ -87,6 +102,111 @@ def calculate_sm2(
     )
 
 
+@dataclass
+class SRSBatchResult:
+    """Columnar result of a vectorized SRS calculation (one element per card)."""
+
+    ease_factor: np.ndarray  # float64
+    interval_days: np.ndarray  # int64
+    repetition_number: np.ndarray  # int64
+    next_review: np.ndarray  # datetime64[us], naive UTC
+    status: np.ndarray  # str
+    stability: np.ndarray | None = None  # float64, FSRS only
+    difficulty: np.ndarray | None = None  # float64, FSRS only
+
+
+def calculate_sm2_batch(
+    quality: np.ndarray,
+    ease_factor: np.ndarray,
+    interval_days: np.ndarray,
+    repetition_number: np.ndarray,
+    reviewed_at: datetime | np.ndarray | None = None,
+) -> SRSBatchResult:
+    """
+    Vectorized SM-2 over whole columns of cards.
+
+    Produces exactly the same values as calling calculate_sm2 once per card,
+    without any per-row Python work.
+
+    Args:
+        quality: Answer qualities (0-5)
+        ease_factor: Current ease factors
+        interval_days: Current intervals in days
+        repetition_number: Current repetition counts
+        reviewed_at: Review time, either one datetime for all cards or a
+            datetime64 array (UTC); defaults to now
+
+    Returns:
+        SRSBatchResult with updated SRS columns
+    """
+    quality = np.clip(np.asarray(quality, dtype=np.int64), 0, 5)
+    ease_factor = np.asarray(ease_factor, dtype=np.float64)
+    interval_days = np.asarray(interval_days, dtype=np.int64)
+    repetition_number = np.asarray(repetition_number, dtype=np.int64)
+
+    # Same operation order as calculate_sm2 so floating point results match
+    lapse = 5 - quality
+    new_ef = np.maximum(1.3, ease_factor + (0.1 - lapse * (0.08 + lapse * 0.02)))
+
+    successful = quality >= 3
+    grown_interval = np.rint(interval_days * new_ef).astype(np.int64)
+    new_interval = np.where(
+        successful,
+        np.select([repetition_number == 0, repetition_number == 1], [1, 6], grown_interval),
+        1,
+    )
+    new_repetition = np.where(successful, repetition_number + 1, 0)
+    status = np.where(
+        successful,
+        determine_status_batch(new_repetition, quality),
+        "review_needed",
+    ).astype(STATUS_DTYPE)
+
+    return SRSBatchResult(
+        ease_factor=_round_ease_factor(new_ef),
+        interval_days=new_interval,
+        repetition_number=new_repetition,
+        next_review=to_datetime64(reviewed_at) + new_interval.astype("timedelta64[D]"),
+        status=status,
+    )
+
+
+def _round_ease_factor(values: np.ndarray) -> np.ndarray:
+    """Round to 2 decimals exactly like Python's round(x, 2)."""
+    rounded = np.round(values, 2)
+    scaled = values * 100
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < _ROUNDING_TIE_TOLERANCE
+    if near_tie.any():
+        # Only values sitting on a .xx5 boundary need the exact decimal path
+        rounded[near_tie] = [round(value, 2) for value in values[near_tie].tolist()]
+    return rounded
+
+
+def to_datetime64(reviewed_at: datetime | np.ndarray | None) -> np.datetime64 | np.ndarray:
+    """Convert review time(s) to naive-UTC datetime64[us] (a scalar for one datetime)."""
+    if reviewed_at is None:
+        reviewed_at = datetime.now(UTC)
+    if isinstance(reviewed_at, datetime):
+        if reviewed_at.tzinfo is not None:
+            reviewed_at = reviewed_at.astimezone(UTC).replace(tzinfo=None)
+        return np.datetime64(reviewed_at, "us")
+    return np.asarray(reviewed_at, dtype="datetime64[us]")
+
+
+def determine_status_batch(repetition_number: np.ndarray, quality: np.ndarray) -> np.ndarray:
+    """Vectorized _determine_status."""
+    return np.select(
+        [
+            repetition_number == 0,
+            repetition_number <= 2,
+            repetition_number <= 5,
+            quality >= 4,
+        ],
+        ["new", "learning", "familiar", "mastered"],
+        "familiar",
+    )
+
+
 def _determine_status(repetition_number: int, quality: int) -> str:
     """Determine word status based on repetition count and quality."""
     if repetition_number == 0:
@@ -116,7 +236,7 @@ def get_due_cards_query_filter(user_id: int):
 
     from src.models.word import UserWord
 
-    now = datetime.now(timezone.utc)
+    now = datetime.now(UTC)
 
     return or_(
         UserWord.next_review.is_(None),  # Never reviewed
@@ -0,0 +1,156 @@
+"""
+Per-user vocabulary counters (user_vocab_counters).
+
+Every code path that inserts, deletes or changes the status of a user_words
+row adjusts the matching counters in the same transaction, so statistics can
+be read without aggregating user_words.
+"""
+
+from collections import Counter
+from collections.abc import Iterable
+from typing import Any, cast
+
+from sqlalchemy import CursorResult, Select, and_, delete, func, insert, literal, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db.session import get_dialect_name
+from src.db.upsert import dialect_insert
+from src.models.word import UserVocabCounter, UserWord
+
+
+async def adjust_vocab_counters(db: AsyncSession, user_id: int, deltas: dict[str, int]) -> None:
+    """
+    Atomically add deltas (status -> change in word count) to a user's counters.
+
+    Uses INSERT ... ON CONFLICT DO UPDATE, so concurrent adjustments for the
+    same user serialize on the counter row instead of losing updates.
+    """
+    # Sorted so concurrent transactions lock counter rows in the same order
+    rows = [
+        {"user_id": user_id, "status": status, "word_count": delta}
+        for status, delta in sorted(deltas.items())
+        if delta
+    ]
+    if not rows:
+        return
+
+    stmt = dialect_insert(get_dialect_name(db), UserVocabCounter).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[UserVocabCounter.user_id, UserVocabCounter.status],
+        set_={"word_count": UserVocabCounter.word_count + stmt.excluded.word_count},
+    )
+    await db.execute(stmt)
+
+
+def status_change_deltas(changes: Iterable[tuple[str, str]]) -> dict[str, int]:
+    """Counter deltas for (old_status, new_status) transitions."""
+    deltas: Counter[str] = Counter()
+    for old_status, new_status in changes:
+        if old_status != new_status:
+            deltas[old_status] -= 1
+            deltas[new_status] += 1
+    return dict(deltas)
+
+
+async def get_vocab_counts(db: AsyncSession, user_id: int) -> dict[str, int]:
+    """Word count per status for a user, read from the counters table."""
+    result = await db.execute(
+        select(UserVocabCounter.status, UserVocabCounter.word_count).where(
+            UserVocabCounter.user_id == user_id
+        )
+    )
+    return dict(result.all())
+
+
+def _live_counts_query(user_ids: list[int] | None = None) -> Select[int, str, int]:
+    query = select(
+        UserWord.user_id,
+        UserWord.status,
+        func.count().label("word_count"),
+    ).group_by(UserWord.user_id, UserWord.status)
+    if user_ids is not None:
+        query = query.where(UserWord.user_id.in_(user_ids))
+    return query
+
+
+async def rebuild_vocab_counters(db: AsyncSession, user_ids: list[int] | None = None) -> int:
+    """
+    Recompute counters from user_words in bulk (all users, or only user_ids).
+
+    Returns:
+        Number of counter rows written
+    """
+    clear = delete(UserVocabCounter)
+    if user_ids is not None:
+        clear = clear.where(UserVocabCounter.user_id.in_(user_ids))
+    await db.execute(clear)
+
+    result = cast(
+        CursorResult[Any],
+        await db.execute(
+            insert(UserVocabCounter).from_select(
+                ["user_id", "status", "word_count"], _live_counts_query(user_ids)
+            )
+        ),
+    )
+    return result.rowcount
+
+
+async def find_counter_mismatches(
+    db: AsyncSession, user_ids: list[int] | None = None
+) -> list[tuple[int, str, int, int]]:
+    """
+    Compare counters against a live aggregate of user_words.
+
+    Returns:
+        (user_id, status, counter value, live count) for every difference;
+        missing rows count as zero
+    """
+    live = _live_counts_query(user_ids).subquery()
+
+    # Live groups whose counter is missing or different
+    stale_or_missing = (
+        select(
+            live.c.user_id,
+            live.c.status,
+            func.coalesce(UserVocabCounter.word_count, 0),
+            live.c.word_count,
+        )
+        .outerjoin(
+            UserVocabCounter,
+            and_(
+                UserVocabCounter.user_id == live.c.user_id,
+                UserVocabCounter.status == live.c.status,
+            ),
+        )
+        .where(
+            or_(
+                UserVocabCounter.word_count.is_(None),
+                UserVocabCounter.word_count != live.c.word_count,
+            )
+        )
+    )
+
+    # Non-zero counters with no user_words behind them
+    orphaned = select(
+        UserVocabCounter.user_id,
+        UserVocabCounter.status,
+        UserVocabCounter.word_count,
+        literal(0),
+    ).where(
+        UserVocabCounter.word_count != 0,
+        ~select(live.c.user_id)
+        .where(
+            live.c.user_id == UserVocabCounter.user_id,
+            live.c.status == UserVocabCounter.status,
+        )
+        .exists(),
+    )
+    if user_ids is not None:
+        orphaned = orphaned.where(UserVocabCounter.user_id.in_(user_ids))
+
+    mismatches: list[tuple[int, str, int, int]] = []
+    for query in (stale_or_missing, orphaned):
+        result = await db.execute(query)
+        mismatches.extend(tuple(row) for row in result.all())
+    return sorted(mismatches)
@@ -2,23 +2,46 @@
 Vocabulary service for word management and SRS reviews.
 """
 
-from datetime import datetime, timezone
+import base64
+import json
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any, cast
 
-from sqlalchemy import func, or_, select
+from sqlalchemy import CursorResult, Select, and_, func, literal, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from src.core.exceptions import NotFoundException
-from src.models.word import UserWord, Word, WordStatus
+from src.core.exceptions import BadRequestException, NotFoundException
+from src.core.prometheus import WORDS_ADDED
+from src.db.session import get_dialect_name
+from src.db.upsert import dialect_insert
+from src.models.word import PartOfSpeech, UserWord, Word, WordStatus
 from src.schemas.word import (
     ReviewAnswer,
+    ReviewBatchItem,
     ReviewResponse,
+    UserWordBulkCreate,
     UserWordCreate,
     VocabularyStats,
     WordCreate,
+    WordSuggestion,
+)
+from src.services.dictionary_index import (
+    DictionaryEntry,
+    ensure_dictionary_index,
+    queue_dictionary_update,
+)
+from src.services.forecast import invalidate_review_forecast
+from src.services.review_events import queue_review_events
+from src.services.scheduler import Scheduler, scheduler_for_user
+from src.services.search import apply_word_search
+from src.services.srs import SRSResult
+from src.services.vocab_counters import (
+    adjust_vocab_counters,
+    get_vocab_counts,
+    status_change_deltas,
 )
-from src.services.srs import calculate_sm2
-
 
 # ============================================================================
 # Word CRUD (admin operations)
@@ -31,6 +54,7 @@ async def create_word(db: AsyncSession, word_data: WordCreate) -> Word:
     db.add(word)
     await db.flush()
     await db.refresh(word)
+    queue_dictionary_update(db, [word])
     return word
 
 
@@ -56,24 +80,41 @@ async def get_words(
     if part_of_speech:
         query = query.where(Word.part_of_speech == part_of_speech)
     if search:
-        search_pattern = f"%{search}%"
-        query = query.where(
-            or_(
-                Word.swedish.ilike(search_pattern),
-                Word.english.ilike(search_pattern),
-            )
-        )
+        query = apply_word_search(query, search, get_dialect_name(db))
 
     query = query.order_by(Word.frequency_rank.asc().nulls_last()).offset(offset).limit(limit)
     result = await db.execute(query)
     return list(result.scalars().all())
 
 
+async def autocomplete_words(db: AsyncSession, term: str, limit: int = 10) -> list[WordSuggestion]:
+    """
+    Prefix suggestions from the in-process dictionary index.
+
+    While the index is first being built, the database word search answers.
+    """
+    index = ensure_dictionary_index()
+    if index is None:
+        return [_suggestion(word) for word in await get_words(db, search=term, limit=limit)]
+    return [_suggestion(entry) for entry in index.prefix(term, limit=limit)]
+
+
+def _suggestion(source: Word | DictionaryEntry) -> WordSuggestion:
+    return WordSuggestion(
+        id=source.id if isinstance(source, Word) else source.word_id,
+        swedish=source.swedish,
+        english=source.english,
+        part_of_speech=PartOfSpeech(source.part_of_speech) if source.part_of_speech else None,
+        cefr_level=source.cefr_level,
+    )
+
+
 async def bulk_create_words(db: AsyncSession, words_data: list[WordCreate]) -> int:
     """Bulk create words. Returns count of created words."""
     words = [Word(**word_data.model_dump()) for word_data in words_data]
     db.add_all(words)
     await db.flush()
+    queue_dictionary_update(db, words)
     return len(words)
 
 
@@ -108,10 +149,48 @@ async def add_word_to_user(
     )
     db.add(user_word)
     await db.flush()
+    await adjust_vocab_counters(db, user_id, {WordStatus.NEW.value: 1})
+    invalidate_review_forecast(db, user_id)
+    WORDS_ADDED.labels("single").inc()
     await db.refresh(user_word, ["word"])
     return user_word
 
 
+async def add_words_to_user_by_filter(
+    db: AsyncSession, user_id: int, filters: UserWordBulkCreate
+) -> int:
+    """
+    Add every dictionary word matching the filters to a user's vocabulary.
+
+    Runs as one INSERT ... SELECT ... ON CONFLICT DO NOTHING, so words the
+    user already has are skipped by the unique (user_id, word_id) constraint.
+
+    Returns:
+        Number of words actually added
+    """
+    words = select(literal(user_id), Word.id, literal(WordStatus.NEW.value))
+    if filters.cefr_level:
+        words = words.where(Word.cefr_level == filters.cefr_level)
+    if filters.part_of_speech:
+        words = words.where(Word.part_of_speech == filters.part_of_speech.value)
+    if filters.min_frequency_rank is not None:
+        words = words.where(Word.frequency_rank >= filters.min_frequency_rank)
+    if filters.max_frequency_rank is not None:
+        words = words.where(Word.frequency_rank <= filters.max_frequency_rank)
+
+    stmt = (
+        dialect_insert(get_dialect_name(db), UserWord)
+        .from_select(["user_id", "word_id", "status"], words, include_defaults=True)
+        .on_conflict_do_nothing(index_elements=[UserWord.user_id, UserWord.word_id])
+    )
+    result = cast(CursorResult[Any], await db.execute(stmt))
+    added = result.rowcount
+    await adjust_vocab_counters(db, user_id, {WordStatus.NEW.value: added})
+    invalidate_review_forecast(db, user_id)
+    WORDS_ADDED.labels("bulk").inc(added)
+    return added
+
+
 async def get_user_vocabulary(
     db: AsyncSession,
     user_id: int,
@@ -136,13 +215,7 @@ async def get_user_vocabulary(
         if cefr_level:
             query = query.where(Word.cefr_level == cefr_level)
         if search:
-            search_pattern = f"%{search}%"
-            query = query.where(
-                or_(
-                    Word.swedish.ilike(search_pattern),
-                    Word.english.ilike(search_pattern),
-                )
-            )
+            query = apply_word_search(query, search, get_dialect_name(db))
 
     query = query.order_by(UserWord.created_at.desc()).offset(offset).limit(limit)
     result = await db.execute(query)
@@ -171,6 +244,8 @@ async def remove_user_word(db: AsyncSession, user_id: int, user_word_id: int) ->
         return False
     await db.delete(user_word)
     await db.flush()
+    await adjust_vocab_counters(db, user_id, {user_word.status: -1})
+    invalidate_review_forecast(db, user_id)
     return True
 
 
@@ -179,14 +254,46 @@ async def remove_user_word(db: AsyncSession, user_id: int, user_word_id: int) ->
 # ============================================================================
 
 
-async def get_due_reviews(
-    db: AsyncSession,
+@dataclass(frozen=True)
+class DueReviewCursor:
+    """Keyset position in the due-review queue (last card already returned)."""
+
+    next_review: datetime | None
+    user_word_id: int
+
+    def encode(self) -> str:
+        """Encode as an opaque, URL-safe cursor string."""
+        raw = json.dumps(
+            {
+                "n": self.next_review.isoformat() if self.next_review else None,
+                "i": self.user_word_id,
+            }
+        )
+        return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+    @classmethod
+    def decode(cls, cursor: str) -> "DueReviewCursor":
+        """Decode a cursor produced by encode()."""
+        try:
+            raw = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+            next_review = datetime.fromisoformat(raw["n"]) if raw["n"] else None
+            return cls(next_review=next_review, user_word_id=int(raw["i"]))
+        except (ValueError, KeyError, TypeError):
+            raise BadRequestException("Invalid review cursor")
+
+
+def build_due_reviews_query(
     user_id: int,
+    now: datetime,
     limit: int = 20,
-) -> list[UserWord]:
-    """Get words due for review."""
-    now = datetime.now(timezone.utc)
-
+    after: DueReviewCursor | None = None,
+) -> Select[UserWord]:
+    """
+    Build the due-review query.
+
+    Ordered by (next_review ASC NULLS LAST, id) so it can be served from
+    ix_user_words_user_id_next_review and paged with a keyset cursor.
+    """
     query = (
         select(UserWord)
         .options(selectinload(UserWord.word))
@@ -197,14 +304,43 @@ async def get_due_reviews(
                 UserWord.next_review <= now,  # Due for review
             ),
         )
-        .order_by(
-            # Prioritize: overdue > new > by next_review date
-            UserWord.next_review.asc().nulls_last()
-        )
-        .limit(limit)
     )
 
-    result = await db.execute(query)
+    if after is not None:
+        if after.next_review is None:
+            # Already inside the trailing block of never-reviewed cards
+            query = query.where(
+                UserWord.next_review.is_(None),
+                UserWord.id > after.user_word_id,
+            )
+        else:
+            query = query.where(
+                or_(
+                    UserWord.next_review > after.next_review,
+                    and_(
+                        UserWord.next_review == after.next_review,
+                        UserWord.id > after.user_word_id,
+                    ),
+                    UserWord.next_review.is_(None),
+                )
+            )
+
+    return query.order_by(
+        # Prioritize: overdue > new > by next_review date
+        UserWord.next_review.asc().nulls_last(),
+        UserWord.id.asc(),
+    ).limit(limit)
+
+
+async def get_due_reviews(
+    db: AsyncSession,
+    user_id: int,
+    limit: int = 20,
+    after: DueReviewCursor | None = None,
+) -> list[UserWord]:
+    """Get words due for review, optionally continuing after a cursor."""
+    now = datetime.now(UTC)
+    result = await db.execute(build_due_reviews_query(user_id, now, limit=limit, after=after))
     return list(result.scalars().all())
 
 
@@ -213,26 +349,41 @@ async def submit_review(
     user_id: int,
     user_word_id: int,
     answer: ReviewAnswer,
+    scheduler: Scheduler | None = None,
 ) -> ReviewResponse:
-    """Submit a review answer and update SRS values."""
+    """Submit a review answer and update SRS values (default scheduler unless given)."""
     user_word = await get_user_word(db, user_id, user_word_id)
     if not user_word:
         raise NotFoundException(f"UserWord with id {user_word_id} not found")
 
     # Calculate new SRS values
-    srs_result = calculate_sm2(
-        quality=answer.quality,
-        ease_factor=user_word.ease_factor,
-        interval_days=user_word.interval_days,
-        repetition_number=user_word.repetition_number,
+    now = datetime.now(UTC)
+    scheduler = scheduler or scheduler_for_user(None)
+    srs_result = scheduler.review(answer.quality, user_word, reviewed_at=now)
+
+    previous_status = user_word.status
+    review_event = _review_event(
+        user_id,
+        user_word.word_id,
+        answer,
+        now,
+        {
+            "status": user_word.status,
+            "ease_factor": user_word.ease_factor,
+            "interval_days": user_word.interval_days,
+            "repetition_number": user_word.repetition_number,
+        },
+        srs_result,
     )
 
     # Update user word
     user_word.ease_factor = srs_result.ease_factor
     user_word.interval_days = srs_result.interval_days
     user_word.repetition_number = srs_result.repetition_number
+    user_word.stability = srs_result.stability
+    user_word.difficulty = srs_result.difficulty
     user_word.next_review = srs_result.next_review
-    user_word.last_reviewed = datetime.now(timezone.utc)
+    user_word.last_reviewed = now
     user_word.status = srs_result.status
     user_word.times_seen += 1
 
@@ -242,6 +393,11 @@ async def submit_review(
         user_word.times_incorrect += 1
 
     await db.flush()
+    await adjust_vocab_counters(
+        db, user_id, status_change_deltas([(previous_status, user_word.status)])
+    )
+    invalidate_review_forecast(db, user_id)
+    queue_review_events(db, [review_event])
     await db.refresh(user_word)
 
     return ReviewResponse(
@@ -252,22 +408,167 @@ async def submit_review(
     )
 
 
+async def submit_reviews_batch(
+    db: AsyncSession,
+    user_id: int,
+    answers: list[ReviewBatchItem],
+    scheduler: Scheduler | None = None,
+) -> list[ReviewResponse]:
+    """
+    Submit several review answers at once and update SRS values.
+
+    Every affected card is loaded with a single query, the scheduler runs in memory
+    (answers for the same card are applied in ``answered_at`` order) and the
+    results are written back with one bulk UPDATE.
+
+    Returns:
+        One ReviewResponse per answer, in submission order
+    """
+    now = datetime.now(UTC)
+    scheduler = scheduler or scheduler_for_user(None)
+    user_word_ids = {answer.user_word_id for answer in answers}
+
+    result = await db.execute(
+        select(
+            UserWord.id,
+            UserWord.word_id,
+            UserWord.ease_factor,
+            UserWord.interval_days,
+            UserWord.repetition_number,
+            UserWord.stability,
+            UserWord.difficulty,
+            UserWord.last_reviewed,
+            UserWord.status,
+            UserWord.times_seen,
+            UserWord.times_correct,
+            UserWord.times_incorrect,
+        ).where(
+            UserWord.user_id == user_id,
+            UserWord.id.in_(user_word_ids),
+        )
+    )
+    rows = result.all()
+    # word_id is only needed for the event log, not for the UPDATE
+    word_ids = {row.id: row.word_id for row in rows}
+    cards = {row.id: row._asdict() for row in rows}
+    for card in cards.values():
+        del card["word_id"]
+
+    missing_ids = user_word_ids - cards.keys()
+    if missing_ids:
+        raise NotFoundException(f"UserWord with id {min(missing_ids)} not found")
+
+    previous_status = {card_id: card["status"] for card_id, card in cards.items()}
+    answered_at = [_normalize_answered_at(answer.answered_at, now) for answer in answers]
+    responses: dict[int, ReviewResponse] = {}
+    review_events = []
+
+    # sorted() is stable, so answers with equal timestamps keep submission order
+    for index in sorted(range(len(answers)), key=answered_at.__getitem__):
+        answer = answers[index]
+        card = cards[answer.user_word_id]
+        srs_result = scheduler.review(answer.quality, card, reviewed_at=answered_at[index])
+        review_events.append(
+            _review_event(
+                user_id,
+                word_ids[answer.user_word_id],
+                answer,
+                answered_at[index],
+                card,
+                srs_result,
+            )
+        )
+
+        card.update(
+            ease_factor=srs_result.ease_factor,
+            interval_days=srs_result.interval_days,
+            repetition_number=srs_result.repetition_number,
+            stability=srs_result.stability,
+            difficulty=srs_result.difficulty,
+            next_review=srs_result.next_review,
+            last_reviewed=answered_at[index],
+            status=srs_result.status,
+            times_seen=card["times_seen"] + 1,
+        )
+        if answer.quality >= 3:
+            card["times_correct"] += 1
+        else:
+            card["times_incorrect"] += 1
+
+        responses[index] = ReviewResponse(
+            user_word_id=answer.user_word_id,
+            new_status=WordStatus(srs_result.status),
+            next_review=srs_result.next_review,
+            interval_days=srs_result.interval_days,
+        )
+
+    # ORM bulk UPDATE by primary key: a single executemany for all cards
+    await db.execute(update(UserWord), list(cards.values()))
+    await adjust_vocab_counters(
+        db,
+        user_id,
+        status_change_deltas(
+            (previous_status[card_id], card["status"]) for card_id, card in cards.items()
+        ),
+    )
+    invalidate_review_forecast(db, user_id)
+    queue_review_events(db, review_events)
+
+    return [responses[index] for index in range(len(answers))]
+
+
+def _review_event(
+    user_id: int,
+    word_id: int,
+    answer: ReviewAnswer,
+    reviewed_at: datetime,
+    previous: dict[str, Any],
+    srs_result: SRSResult,
+) -> dict[str, Any]:
+    """review_events row for one answer; `previous` holds the SRS state before it."""
+    return {
+        "user_id": user_id,
+        "word_id": word_id,
+        "reviewed_at": reviewed_at,
+        "quality": answer.quality,
+        "response_ms": answer.response_ms,
+        "prev_status": previous["status"],
+        "prev_ease_factor": previous["ease_factor"],
+        "prev_interval_days": previous["interval_days"],
+        "prev_repetition_number": previous["repetition_number"],
+        "status": srs_result.status,
+        "ease_factor": srs_result.ease_factor,
+        "interval_days": srs_result.interval_days,
+        "repetition_number": srs_result.repetition_number,
+    }
+
+
+def _normalize_answered_at(answered_at: datetime | None, now: datetime) -> datetime:
+    """Treat naive timestamps as UTC and never schedule from the future."""
+    if answered_at is None:
+        return now
+    if answered_at.tzinfo is None:
+        answered_at = answered_at.replace(tzinfo=UTC)
+    return min(answered_at, now)
+
+
 # ============================================================================
 # Statistics
 # ============================================================================
 
 
 async def get_vocabulary_stats(db: AsyncSession, user_id: int) -> VocabularyStats:
-    """Get vocabulary statistics for a user."""
-    now = datetime.now(timezone.utc)
+    """
+    Get vocabulary statistics for a user.
 
-    # Count by status
-    status_counts = await db.execute(
-        select(UserWord.status, func.count(UserWord.id))
-        .where(UserWord.user_id == user_id)
-        .group_by(UserWord.status)
-    )
-    counts = {row[0]: row[1] for row in status_counts.all()}
+    Status counts come from user_vocab_counters. The due count is not kept
+    there: it depends on the current time, so every call still runs a range
+    count on ix_user_words_user_id_next_review whose cost grows with the
+    number of due words.
+    """
+    now = datetime.now(UTC)
+
+    counts = await get_vocab_counts(db, user_id)
 
     # Count due for review
     due_count_result = await db.execute(
@@ -0,0 +1,163 @@
+"""
+Throughput and tail latency of the AI provider layer against the local stub.
+
+Starts tests/benchmarks/stub_ai_server.py in-process and sends --requests
+replies through ClaudeProvider or OpenAIProvider, at most --concurrency at a
+time. Requests cycle through --unique-prompts conversations, so with fewer
+prompts than requests overlapping duplicates are coalesced into one upstream
+call. Reports time to first token, total time, throughput, and how many
+calls reached the stub (including rejected ones when --failure-rate > 0).
+
+The stub speaks plain HTTP, so connections are HTTP/1.1 here; against the
+real APIs (TLS) the pool negotiates HTTP/2.
+
+Run from backend/:
+    python -m tests.benchmarks.bench_ai_providers [--provider openai] [--unique-prompts 500]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import socket
+import statistics
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REQUESTS = 1000
+DEFAULT_CONCURRENCY = 200
+DEFAULT_UNIQUE_PROMPTS = 100
+
+
+def free_port() -> int:
+    """An unused local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def percentile(values: list[float], share: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(share * len(ordered)))]
+
+
+async def run(args: argparse.Namespace, port: int) -> None:
+    """Serve the stub and drive the provider against it."""
+    import uvicorn
+
+    from src.services.ai_client import AIProviderError, close_provider_pools, create_ai_provider
+    from tests.benchmarks.stub_ai_server import StubConfig, create_stub_app
+
+    stub = create_stub_app(
+        StubConfig(args.first_token_ms, args.token_ms, args.reply_tokens, args.failure_rate)
+    )
+    server = uvicorn.Server(
+        uvicorn.Config(stub, host="127.0.0.1", port=port, log_level="warning", backlog=4096)
+    )
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+
+    provider = create_ai_provider(args.provider)
+    gate = asyncio.Semaphore(args.concurrency)
+    first_token_times: list[float] = []
+    total_times: list[float] = []
+    failures = 0
+
+    async def one_reply(index: int) -> None:
+        nonlocal failures
+        messages = [
+            {"role": "user", "content": f"Översätt mening nummer {index % args.unique_prompts}"}
+        ]
+        async with gate:
+            started = time.perf_counter()
+            first_token_at = None
+            try:
+                async for _ in provider.stream_reply("Du är en översättare.", messages):
+                    if first_token_at is None:
+                        first_token_at = time.perf_counter()
+            except AIProviderError:
+                failures += 1
+                return
+            finished_at = time.perf_counter()
+        if first_token_at is None:
+            failures += 1
+            return
+        first_token_times.append(first_token_at - started)
+        total_times.append(finished_at - started)
+
+    try:
+        started = time.perf_counter()
+        await asyncio.gather(*(one_reply(index) for index in range(args.requests)))
+        elapsed = time.perf_counter() - started
+    finally:
+        await close_provider_pools()
+        server.should_exit = True
+        await serving
+
+    upstream = stub.state.requests
+    logger.info(
+        "%s: %d requests, concurrency %d, %d unique prompts",
+        args.provider,
+        args.requests,
+        args.concurrency,
+        args.unique_prompts,
+    )
+    logger.info(
+        "upstream calls: %d (%d rejected), failed replies: %d",
+        upstream[args.stub_name],
+        upstream[f"{args.stub_name}_rejected"],
+        failures,
+    )
+    logger.info("throughput: %.1f replies/s", len(total_times) / elapsed)
+    for label, values in (("first token", first_token_times), ("total", total_times)):
+        if values:
+            logger.info(
+                "%-11s  p50 %7.1f ms  p95 %7.1f ms  p99 %7.1f ms  max %7.1f ms",
+                label,
+                statistics.median(values) * 1000,
+                percentile(values, 0.95) * 1000,
+                percentile(values, 0.99) * 1000,
+                max(values) * 1000,
+            )
+
+
+def main() -> None:
+    """Parse CLI arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description="AI provider pool benchmark")
+    parser.add_argument("--provider", choices=["claude", "openai"], default="claude")
+    parser.add_argument("--requests", type=int, default=DEFAULT_REQUESTS)
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--unique-prompts", type=int, default=DEFAULT_UNIQUE_PROMPTS)
+    parser.add_argument(
+        "--max-concurrency", type=int, default=32, help="Provider concurrency limit"
+    )
+    parser.add_argument("--tokens-per-minute", type=int, default=0)
+    parser.add_argument("--first-token-ms", type=float, default=200.0)
+    parser.add_argument("--token-ms", type=float, default=10.0)
+    parser.add_argument("--reply-tokens", type=int, default=50)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    args = parser.parse_args()
+    args.stub_name = "anthropic" if args.provider == "claude" else "openai"
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    # Settings are read at import time
+    port = free_port()
+    prefix = args.stub_name.upper()
+    os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+    os.environ.setdefault("JWT_SECRET_KEY", "bench-secret")
+    os.environ[f"{prefix}_API_KEY"] = "stub-key"
+    os.environ[f"{prefix}_BASE_URL"] = f"http://127.0.0.1:{port}"
+    os.environ[f"{prefix}_MAX_CONCURRENCY"] = str(args.max_concurrency)
+    os.environ[f"{prefix}_TOKENS_PER_MINUTE"] = str(args.tokens_per_minute)
+    os.environ["AI_RETRY_BASE_SECONDS"] = "0.05"
+
+    asyncio.run(run(args, port))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,388 @@
+"""
+Load test and latency benchmark for the FastAPI app.
+
+Boots src.main:create_app in-process (httpx ASGI transport, lifespan
+included) against a local database, seeds --users users, --words dictionary
+words and --cards-per-user user_words each, then runs --concurrency virtual
+users for --duration seconds. Each virtual user logs in once and then picks
+requests from a weighted mix:
+
+    login, review_fetch, review_submit, my_words, search, stats
+
+Latency percentiles (p50/p95/p99) and requests per second are reported per
+endpoint and written as JSON; --compare prints the change against an
+earlier result file, so runs can be compared between commits.
+
+The database comes from --database-url (default: a throwaway SQLite file).
+PostgreSQL runs should point at a scratch database: tables are created if
+missing and the seed is reused when its users already exist.
+
+Run from backend/:
+    python -m tests.benchmarks.bench_api_load --output load.json [--compare baseline.json]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import subprocess
+import tempfile
+import time
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USERS = 50
+DEFAULT_WORDS = 5_000
+DEFAULT_CARDS_PER_USER = 500
+DEFAULT_CONCURRENCY = 20
+DEFAULT_DURATION_SECONDS = 30.0
+DEFAULT_WARMUP_SECONDS = 3.0
+SEED = 42
+
+BENCH_PASSWORD = "bench-password"
+SEED_CHUNK_SIZE = 5_000
+SEARCH_TERMS = ("ord1", "word2", "ord33", "hus", "word45")
+
+# Relative weight of each request type in the mix
+DEFAULT_MIX = {
+    "login": 2,
+    "review_fetch": 30,
+    "review_submit": 30,
+    "my_words": 15,
+    "search": 15,
+    "stats": 8,
+}
+
+
+def bench_email(index: int) -> str:
+    return f"bench{index}@example.com"
+
+
+@dataclass
+class Recorder:
+    """Latencies (ms) and error counts per endpoint, ignoring the warm-up."""
+
+    measure_from: float
+    latencies: dict[str, list[float]] = field(default_factory=dict)
+    errors: dict[str, int] = field(default_factory=dict)
+    started: float | None = None
+    finished: float | None = None
+
+    def record(self, endpoint: str, started: float, ok: bool) -> None:
+        """Store one request that began at `started` (perf_counter)."""
+        finished = time.perf_counter()
+        if started < self.measure_from:
+            return
+        self.started = started if self.started is None else min(self.started, started)
+        self.finished = finished if self.finished is None else max(self.finished, finished)
+        self.latencies.setdefault(endpoint, []).append((finished - started) * 1000)
+        if not ok:
+            self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+    def summary(self) -> dict:
+        """Per-endpoint and overall statistics."""
+        window = (self.finished - self.started) if self.started is not None else 0.0
+
+        def stats(values: list[float], errors: int) -> dict:
+            array = np.array(values)
+            return {
+                "requests": len(values),
+                "errors": errors,
+                "rps": len(values) / window if window else 0.0,
+                "mean_ms": float(array.mean()),
+                "p50_ms": float(np.percentile(array, 50)),
+                "p95_ms": float(np.percentile(array, 95)),
+                "p99_ms": float(np.percentile(array, 99)),
+                "max_ms": float(array.max()),
+            }
+
+        endpoints = {
+            name: stats(values, self.errors.get(name, 0))
+            for name, values in sorted(self.latencies.items())
+        }
+        every = [value for values in self.latencies.values() for value in values]
+        return {
+            "window_seconds": window,
+            "endpoints": endpoints,
+            "total": stats(every, sum(self.errors.values())) if every else {},
+        }
+
+
+async def seed_database(users: int, words: int, cards_per_user: int) -> None:
+    """Create tables and seed users, words and user_words unless already seeded."""
+    from sqlalchemy import insert, select
+
+    from src.core.security import hash_password
+    from src.db.session import Base, async_session_maker, engine
+    from src.models.user import User
+    from src.models.word import UserWord, Word
+    from src.services.vocab_counters import rebuild_vocab_counters
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with async_session_maker() as session:
+        existing = await session.scalar(select(User.id).where(User.email == bench_email(0)))
+        if existing is not None:
+            logger.info("Reusing existing seed")
+            return
+
+        started = time.perf_counter()
+        rng = np.random.default_rng(SEED)
+        word_rows = [
+            {
+                "swedish": f"ord{index}",
+                "english": f"word{index}",
+                "cefr_level": "A1" if index % 3 else "A2",
+                "frequency_rank": index + 1,
+            }
+            for index in range(words)
+        ]
+        for offset in range(0, words, SEED_CHUNK_SIZE):
+            await session.execute(insert(Word), word_rows[offset : offset + SEED_CHUNK_SIZE])
+        word_ids = np.array((await session.scalars(select(Word.id).order_by(Word.id))).all())
+
+        # One bcrypt hash for everyone: login cost is measured, not seeding cost
+        hashed_password = hash_password(BENCH_PASSWORD)
+        user_ids = (
+            await session.scalars(
+                insert(User).returning(User.id),
+                [
+                    {"email": bench_email(index), "hashed_password": hashed_password}
+                    for index in range(users)
+                ],
+            )
+        ).all()
+
+        now = datetime.now(UTC)
+        card_rows = []
+        for user_id in user_ids:
+            chosen = rng.choice(word_ids, size=min(cards_per_user, len(word_ids)), replace=False)
+            # ~10% never reviewed, the rest due within +/- 30 days
+            offsets = rng.uniform(-30, 30, size=len(chosen))
+            for word_id, offset in zip(chosen.tolist(), offsets.tolist(), strict=True):
+                reviewed = rng.random() >= 0.1
+                card_rows.append(
+                    {
+                        "user_id": user_id,
+                        "word_id": word_id,
+                        "status": "learning" if reviewed else "new",
+                        "repetition_number": 1 if reviewed else 0,
+                        "times_seen": 1 if reviewed else 0,
+                        "next_review": now + timedelta(days=offset) if reviewed else None,
+                    }
+                )
+        for offset in range(0, len(card_rows), SEED_CHUNK_SIZE):
+            await session.execute(insert(UserWord), card_rows[offset : offset + SEED_CHUNK_SIZE])
+        await rebuild_vocab_counters(session)
+        await session.commit()
+
+    logger.info(
+        "Seeded %d users, %d words, %d user_words in %.1fs",
+        users,
+        words,
+        len(card_rows),
+        time.perf_counter() - started,
+    )
+
+
+async def virtual_user(
+    client, index: int, mix: dict[str, int], deadline: float, recorder: Recorder
+) -> None:
+    """Log in, then issue weighted random requests until the deadline."""
+    rng = random.Random(SEED + index)
+    credentials = {"email": bench_email(index), "password": BENCH_PASSWORD}
+    api = "/api/v1"
+
+    async def login() -> dict:
+        started = time.perf_counter()
+        response = await client.post(f"{api}/auth/login", json=credentials)
+        recorder.record("login", started, response.status_code == 200)
+        response.raise_for_status()
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    headers = await login()
+    due_ids: list[int] = []
+    names, weights = list(mix), list(mix.values())
+
+    while time.perf_counter() < deadline:
+        endpoint = rng.choices(names, weights)[0]
+        if endpoint == "login":
+            headers = await login()
+            continue
+        if endpoint == "review_submit" and not due_ids:
+            endpoint = "review_fetch"
+
+        started = time.perf_counter()
+        if endpoint == "review_fetch":
+            response = await client.get(f"{api}/vocabulary/review?limit=20", headers=headers)
+            if response.status_code == 200:
+                due_ids = [card["id"] for card in response.json()]
+        elif endpoint == "review_submit":
+            response = await client.post(
+                f"{api}/vocabulary/review/{due_ids.pop()}",
+                json={
+                    "quality": rng.choice((1, 3, 4, 4, 5)),
+                    "response_ms": rng.randint(800, 9000),
+                },
+                headers=headers,
+            )
+        elif endpoint == "my_words":
+            response = await client.get(
+                f"{api}/vocabulary/my-words?limit=50&offset={rng.randrange(0, 200, 50)}",
+                headers=headers,
+            )
+        elif endpoint == "search":
+            response = await client.get(
+                f"{api}/vocabulary/words?search={rng.choice(SEARCH_TERMS)}&limit=20"
+            )
+        else:
+            response = await client.get(f"{api}/vocabulary/stats", headers=headers)
+        recorder.record(endpoint, started, response.status_code < 400)
+
+
+async def run_load(args: argparse.Namespace) -> dict:
+    """Seed, boot the app and drive the load; returns the JSON report."""
+    import httpx
+
+    from src.core.config import get_settings
+    from src.main import create_app
+
+    settings = get_settings()
+    await seed_database(args.users, args.words, args.cards_per_user)
+
+    mix = {**DEFAULT_MIX, **args.mix}
+    app = create_app()
+    concurrency = min(args.concurrency, args.users)
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            now = time.perf_counter()
+            recorder = Recorder(measure_from=now + args.warmup)
+            deadline = now + args.warmup + args.duration
+            await asyncio.gather(
+                *(
+                    virtual_user(client, index, mix, deadline, recorder)
+                    for index in range(concurrency)
+                )
+            )
+
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.now(UTC).isoformat(),
+            "database": settings.async_database_url.split("://", 1)[0],
+            "users": args.users,
+            "words": args.words,
+            "cards_per_user": args.cards_per_user,
+            "concurrency": concurrency,
+            "duration_seconds": args.duration,
+            "mix": mix,
+        },
+        **recorder.summary(),
+    }
+
+
+def log_report(report: dict, baseline: dict | None = None) -> None:
+    """Log a table of the results, with changes against a baseline if given."""
+    logger.info(
+        "%-14s %8s %7s %9s %9s %9s %9s",
+        "endpoint",
+        "requests",
+        "errors",
+        "rps",
+        "p50 ms",
+        "p95 ms",
+        "p99 ms",
+    )
+    rows = {**report["endpoints"], "TOTAL": report["total"]}
+    for name, stats in rows.items():
+        line = (
+            f"{name:<14} {stats['requests']:8d} {stats['errors']:7d} {stats['rps']:9.1f} "
+            f"{stats['p50_ms']:9.2f} {stats['p95_ms']:9.2f} {stats['p99_ms']:9.2f}"
+        )
+        before = None
+        if baseline:
+            before = baseline["total"] if name == "TOTAL" else baseline["endpoints"].get(name)
+        if before:
+            p95_change = (stats["p95_ms"] / before["p95_ms"] - 1) * 100
+            rps_change = (stats["rps"] / before["rps"] - 1) * 100
+            line += f"   p95 {p95_change:+6.1f}%  rps {rps_change:+6.1f}%"
+        logger.info(line)
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _parse_mix(value: str) -> dict[str, int]:
+    """'review_fetch=50,stats=0' -> {"review_fetch": 50, "stats": 0}."""
+    mix = {}
+    for item in filter(None, value.split(",")):
+        name, _, weight = item.partition("=")
+        if name not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"unknown endpoint {name!r}")
+        mix[name] = int(weight)
+    return mix
+
+
+def main() -> None:
+    """Parse CLI arguments and run the load test."""
+    parser = argparse.ArgumentParser(description="API load test")
+    parser.add_argument("--database-url", help="Defaults to a temporary SQLite file")
+    parser.add_argument("--users", type=int, default=DEFAULT_USERS)
+    parser.add_argument("--words", type=int, default=DEFAULT_WORDS)
+    parser.add_argument("--cards-per-user", type=int, default=DEFAULT_CARDS_PER_USER)
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION_SECONDS)
+    parser.add_argument("--warmup", type=float, default=DEFAULT_WARMUP_SECONDS)
+    parser.add_argument(
+        "--mix", type=_parse_mix, default={}, help="Weight overrides, e.g. search=0,stats=20"
+    )
+    parser.add_argument("--output", type=Path, help="Write the JSON report here")
+    parser.add_argument("--compare", type=Path, help="Earlier JSON report to compare against")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    # Settings are read at import time, so configure them before importing src
+    scratch_dir = None
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    else:
+        scratch_dir = tempfile.TemporaryDirectory(prefix="bench_api_load_")
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{scratch_dir.name}/bench.db"
+    os.environ.setdefault("JWT_SECRET_KEY", "bench-secret")
+    os.environ.setdefault("DEBUG", "false")
+
+    try:
+        report = asyncio.run(run_load(args))
+    finally:
+        if scratch_dir is not None:
+            scratch_dir.cleanup()
+
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    log_report(report, baseline)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+        logger.info("Wrote %s", args.output)
+
+
+if __name__ == "__main__":
+    main()
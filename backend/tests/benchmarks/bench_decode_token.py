@@ -0,0 +1,65 @@
+"""
+Microbenchmark for JWT access-token decoding.
+
+Compares decode throughput of each JWT backend without the verified-token
+cache against decode_token with the cache warm.
+
+Run from backend/:
+    python -m tests.benchmarks.bench_decode_token [--iterations 20000]
+"""
+
+import argparse
+import logging
+import time
+from collections.abc import Callable
+
+from src.core.security import (
+    JWT_DECODERS,
+    create_access_token,
+    decode_token,
+    get_jwt_decoder,
+    verified_token_cache,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ITERATIONS = 20_000
+
+
+def measure(label: str, decode: Callable[[str], dict | None], token: str, iterations: int) -> float:
+    """Log and return decodes per second for a decode function."""
+    assert decode(token) is not None, f"{label} failed to decode the token"
+    started = time.perf_counter()
+    for _ in range(iterations):
+        decode(token)
+    elapsed = time.perf_counter() - started
+    rate = iterations / elapsed
+    logger.info("%-28s %10.0f decodes/s  %7.2f us/decode", label, rate, elapsed / iterations * 1e6)
+    return rate
+
+
+def main() -> None:
+    """Run the benchmark for every backend."""
+    parser = argparse.ArgumentParser(description="JWT decode microbenchmark")
+    parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    token = create_access_token({"sub": "1", "email": "bench@example.com"})
+
+    for backend in JWT_DECODERS:
+        measure(f"{backend} (no cache)", get_jwt_decoder(backend), token, args.iterations)
+
+    verified_token_cache.clear()
+    uncached = measure(
+        "decode_token (use_cache=False)",
+        lambda encoded: decode_token(encoded, use_cache=False),
+        token,
+        args.iterations,
+    )
+    cached = measure("decode_token (cache warm)", decode_token, token, args.iterations)
+    logger.info("Cache speedup: %.1fx  (%s)", cached / uncached, verified_token_cache.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+Benchmark for the due-review queue query.
+
+Seeds a throwaway PostgreSQL schema with USERS x CARDS_PER_USER user_words,
+then reports EXPLAIN ANALYZE plans and timings for get_due_reviews without
+and with ix_user_words_user_id_next_review, plus deep OFFSET paging versus
+keyset (cursor) paging.
+
+Requires PostgreSQL; the schema is dropped afterwards. Run from backend/:
+    python -m tests.benchmarks.bench_due_reviews --database-url postgresql+asyncpg://...
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+from datetime import UTC, datetime
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, async_sessionmaker, create_async_engine
+
+from src.db.session import Base
+from src.models.user import User
+from src.models.word import UserWord, Word
+from src.services.vocabulary import DueReviewCursor, build_due_reviews_query, get_due_reviews
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = "bench_due_reviews"
+INDEX_NAME = "ix_user_words_user_id_next_review"
+DEFAULT_USERS = 3
+DEFAULT_CARDS_PER_USER = 100_000
+DEFAULT_WORDS = 20_000
+PAGE_SIZE = 20
+DEEP_PAGE_OFFSET = 20_000
+TIMING_RUNS = 50
+
+SEED_SQL = [
+    """
+    INSERT INTO users (email, hashed_password, reading_level, writing_level,
+                       listening_level, speaking_level, preferred_ai_provider,
+                       timezone, is_active)
+    SELECT 'bench' || g || '@example.com', 'x', 'A1', 'A1', 'A1', 'A1', 'claude',
+           'Europe/Stockholm', true
+    FROM generate_series(1, :users) AS g
+    """,
+    """
+    INSERT INTO words (swedish, english, cefr_level, frequency_rank)
+    SELECT 'ord' || g, 'word' || g, 'A1', g
+    FROM generate_series(1, :words) AS g
+    """,
+    # ~10% never reviewed, the rest spread over +/- 30 days around now
+    """
+    INSERT INTO user_words (user_id, word_id, status, times_seen, times_correct,
+                            times_incorrect, ease_factor, interval_days,
+                            repetition_number, next_review)
+    SELECT u.id, (g % :words) + 1, 'learning', 1, 1, 0, 2.5, 1, 1,
+           CASE WHEN g % 10 = 0 THEN NULL
+                ELSE now() + (random() * 60 - 30) * interval '1 day' END
+    FROM users AS u CROSS JOIN generate_series(1, :cards) AS g
+    """,
+]
+
+
+async def explain(conn: AsyncConnection, statement) -> str:
+    """Return the EXPLAIN (ANALYZE, BUFFERS) plan of a statement."""
+    sql = statement.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True})
+    result = await conn.execute(text(f"EXPLAIN (ANALYZE, BUFFERS) {sql}"))
+    return "\n".join(row[0] for row in result)
+
+
+async def time_query(session_maker, run) -> dict[str, float]:
+    """Time repeated executions of an async callable taking a session."""
+    durations = []
+    async with session_maker() as session:
+        for _ in range(TIMING_RUNS):
+            started = time.perf_counter()
+            await run(session)
+            durations.append((time.perf_counter() - started) * 1000)
+            session.expunge_all()
+    return {
+        "p50_ms": statistics.median(durations),
+        "p95_ms": statistics.quantiles(durations, n=20)[-1],
+    }
+
+
+async def report(engine, session_maker, label: str) -> None:
+    """Log plans and timings for the first page and a deep page."""
+    now = datetime.now(UTC)
+    async with engine.connect() as conn:
+        first_page = build_due_reviews_query(1, now, limit=PAGE_SIZE)
+        logger.info("=== %s: first page plan\n%s", label, await explain(conn, first_page))
+
+        deep_offset = build_due_reviews_query(1, now, limit=PAGE_SIZE).offset(DEEP_PAGE_OFFSET)
+        logger.info(
+            "=== %s: OFFSET %d plan\n%s", label, DEEP_PAGE_OFFSET, await explain(conn, deep_offset)
+        )
+
+        boundary = await conn.execute(
+            build_due_reviews_query(1, now, limit=1)
+            .with_only_columns(UserWord.next_review, UserWord.id)
+            .offset(DEEP_PAGE_OFFSET - 1)
+        )
+        boundary_row = boundary.one()
+        cursor = DueReviewCursor(next_review=boundary_row.next_review, user_word_id=boundary_row.id)
+        deep_keyset = build_due_reviews_query(1, now, limit=PAGE_SIZE, after=cursor)
+        logger.info("=== %s: keyset deep page plan\n%s", label, await explain(conn, deep_keyset))
+
+    first_timing = await time_query(
+        session_maker, lambda session: get_due_reviews(session, 1, limit=PAGE_SIZE)
+    )
+    keyset_timing = await time_query(
+        session_maker, lambda session: get_due_reviews(session, 1, limit=PAGE_SIZE, after=cursor)
+    )
+    logger.info("=== %s: first page %s", label, first_timing)
+    logger.info("=== %s: keyset deep page %s", label, keyset_timing)
+
+
+async def run_benchmark(database_url: str, users: int, cards_per_user: int, words: int) -> None:
+    """Seed, measure without and with the composite index, and clean up."""
+    engine = create_async_engine(
+        database_url, connect_args={"server_settings": {"search_path": SCHEMA}}
+    )
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    tables = [User.__table__, Word.__table__, UserWord.__table__]
+
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+            await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+            await conn.run_sync(
+                lambda sync_conn: Base.metadata.create_all(sync_conn, tables=tables)
+            )
+            await conn.execute(text(f"DROP INDEX {INDEX_NAME}"))
+
+            started = time.perf_counter()
+            params = {"users": users, "words": words, "cards": cards_per_user}
+            for statement in SEED_SQL:
+                await conn.execute(text(statement), params)
+            logger.info(
+                "Seeded %d users x %d cards in %.1fs",
+                users,
+                cards_per_user,
+                time.perf_counter() - started,
+            )
+
+        async with engine.connect() as conn:
+            await conn.execute(text("ANALYZE"))
+            await conn.commit()
+        await report(engine, session_maker, "before (ix_user_words_user_id only)")
+
+        async with engine.begin() as conn:
+            await conn.execute(
+                text(f"CREATE INDEX {INDEX_NAME} ON user_words (user_id, next_review, id)")
+            )
+            await conn.execute(text("ANALYZE user_words"))
+        await report(engine, session_maker, f"after ({INDEX_NAME})")
+    finally:
+        async with engine.begin() as conn:
+            await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        await engine.dispose()
+
+
+def main() -> None:
+    """Parse CLI arguments and run the benchmark."""
+    from src.core.config import get_settings
+
+    parser = argparse.ArgumentParser(description="Due-review queue benchmark")
+    parser.add_argument("--database-url", default=None, help="Defaults to DATABASE_URL")
+    parser.add_argument("--users", type=int, default=DEFAULT_USERS)
+    parser.add_argument("--cards-per-user", type=int, default=DEFAULT_CARDS_PER_USER)
+    parser.add_argument("--words", type=int, default=DEFAULT_WORDS)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    database_url = args.database_url or get_settings().async_database_url
+    asyncio.run(run_benchmark(database_url, args.users, args.cards_per_user, args.words))
+
+
+if __name__ == "__main__":
+    main()
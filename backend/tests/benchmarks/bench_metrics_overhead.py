@@ -0,0 +1,142 @@
+"""
+Overhead of the Prometheus instrumentation on the review submission path.
+
+Measures two things:
+
+1. The metric updates one POST /vocabulary/review/{id} performs (in-progress
+   gauge, latency and DB-time histograms, request counter, review counter),
+   repeated --iterations times in a tight loop.
+2. The end-to-end latency of that request through the ASGI app (middleware
+   included) on a throwaway SQLite database, over --reviews requests.
+
+The overhead is (1) as a share of (2). With --multiprocess the metrics are
+backed by memory-mapped files as in a multi-worker deployment, which is the
+slower of the two modes.
+
+Run from backend/:
+    python -m tests.benchmarks.bench_metrics_overhead [--multiprocess]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import tempfile
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ITERATIONS = 100_000
+DEFAULT_REVIEWS = 500
+REVIEW_ROUTE = "/api/v1/vocabulary/review/{user_word_id}"
+
+
+def measure_metric_updates(iterations: int) -> float:
+    """Seconds spent on the metric updates of one review request."""
+    from src.core.prometheus import REQUESTS_IN_PROGRESS, observe_request, record_reviews
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        REQUESTS_IN_PROGRESS.inc()
+        record_reviews((4,))
+        REQUESTS_IN_PROGRESS.dec()
+        observe_request("POST", REVIEW_ROUTE, 200, 0.004, 0.001)
+    return (time.perf_counter() - started) / iterations
+
+
+async def measure_review_requests(reviews: int) -> list[float]:
+    """Latencies (seconds) of sequential review submissions through the app."""
+    import httpx
+    from sqlalchemy import insert
+
+    from src.db.session import Base, async_session_maker, engine
+    from src.main import create_app
+    from src.models.word import UserWord, Word
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_session_maker() as session:
+        word_ids = (
+            await session.scalars(
+                insert(Word).returning(Word.id),
+                [{"swedish": f"ord{index}", "english": f"word{index}"} for index in range(reviews)],
+            )
+        ).all()
+
+    app = create_app()
+    latencies = []
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            response = await client.post(
+                "/api/v1/auth/register",
+                json={"email": "bench@example.com", "password": "bench-password"},
+            )
+            response.raise_for_status()
+            headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+            user_id = (await client.get("/api/v1/auth/me", headers=headers)).json()["id"]
+
+            async with async_session_maker() as session:
+                user_word_ids = (
+                    await session.scalars(
+                        insert(UserWord).returning(UserWord.id),
+                        [{"user_id": user_id, "word_id": word_id} for word_id in word_ids],
+                    )
+                ).all()
+                await session.commit()
+
+            for user_word_id in user_word_ids:
+                started = time.perf_counter()
+                response = await client.post(
+                    f"/api/v1/vocabulary/review/{user_word_id}",
+                    json={"quality": 4, "response_ms": 2500},
+                    headers=headers,
+                )
+                latencies.append(time.perf_counter() - started)
+                response.raise_for_status()
+    return latencies
+
+
+def main() -> None:
+    """Parse CLI arguments and report the instrumentation overhead."""
+    parser = argparse.ArgumentParser(description="Metrics overhead microbenchmark")
+    parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS)
+    parser.add_argument("--reviews", type=int, default=DEFAULT_REVIEWS)
+    parser.add_argument(
+        "--multiprocess", action="store_true", help="Use multiprocess (mmap-backed) metrics"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    # Settings and the metric value class are chosen at import time
+    scratch_dir = tempfile.TemporaryDirectory(prefix="bench_metrics_")
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{scratch_dir.name}/bench.db"
+    os.environ.setdefault("JWT_SECRET_KEY", "bench-secret")
+    os.environ.setdefault("DEBUG", "false")
+    if args.multiprocess:
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = scratch_dir.name
+    else:
+        os.environ.pop("PROMETHEUS_MULTIPROC_DIR", None)
+
+    try:
+        per_request = measure_metric_updates(args.iterations)
+        latencies = asyncio.run(measure_review_requests(args.reviews))
+    finally:
+        scratch_dir.cleanup()
+
+    mean_latency = statistics.fmean(latencies)
+    logger.info("mode: %s", "multiprocess" if args.multiprocess else "single process")
+    logger.info("metric updates per review request: %.2f us", per_request * 1e6)
+    logger.info(
+        "review request latency: mean %.2f ms, median %.2f ms",
+        mean_latency * 1000,
+        statistics.median(latencies) * 1000,
+    )
+    logger.info("instrumentation overhead: %.3f%% of the mean", per_request / mean_latency * 100)
+
+
+if __name__ == "__main__":
+    main()
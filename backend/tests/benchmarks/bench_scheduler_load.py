@@ -0,0 +1,145 @@
+"""
+Review-load comparison of the SM-2 and FSRS schedulers.
+
+Simulates a synthetic population of learners day by day. Every learner adds
+NEW_CARDS_PER_DAY cards until they have --cards, and reviews whatever their
+scheduler says is due. Recall is drawn from a ground-truth forgetting curve
+that neither scheduler sees:
+
+    p(recall) = exp(-elapsed / true_stability)
+
+true_stability grows by a card-specific factor after each successful
+recall and falls back to about a day after a lapse. Recalled answers get
+quality 3-5 depending on how easy the recall was; lapses get quality 1.
+
+Both schedulers run against the same population and random seed. The report
+covers total reviews (database writes), reviews per learner per day,
+observed recall at review time, and mean retention at the end (the average
+recall probability over every introduced card).
+
+Run from backend/:
+    python -m tests.benchmarks.bench_scheduler_load [--learners 500] [--cards 300] [--days 180]
+"""
+
+import argparse
+import logging
+import time
+
+import numpy as np
+
+from src.services.scheduler import SCHEDULERS, CardStates, create_scheduler
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEARNERS = 500
+DEFAULT_CARDS = 300
+DEFAULT_DAYS = 180
+NEW_CARDS_PER_DAY = 10
+SEED = 7
+
+START = np.datetime64("2026-01-01T08:00:00", "us")
+ONE_DAY = np.timedelta64(1, "D")
+
+
+def simulate(scheduler_name: str, learners: int, cards: int, days: int) -> dict[str, float]:
+    """Run one scheduler over the synthetic population and return load figures."""
+    rng = np.random.default_rng(SEED)
+    scheduler = create_scheduler(scheduler_name)
+    total = learners * cards
+
+    # Ground truth, identical for every scheduler thanks to the fixed seed
+    growth = rng.lognormal(mean=np.log(2.5), sigma=0.35, size=total)
+    true_stability = rng.lognormal(mean=np.log(1.5), sigma=0.5, size=total)
+    introduced_on = np.tile(np.arange(cards) // NEW_CARDS_PER_DAY, learners)
+
+    state = CardStates(
+        ease_factor=np.full(total, 2.5),
+        interval_days=np.ones(total, dtype=np.int64),
+        repetition_number=np.zeros(total, dtype=np.int64),
+        stability=np.full(total, np.nan),
+        difficulty=np.full(total, np.nan),
+        last_reviewed=np.full(total, np.datetime64("NaT"), dtype="datetime64[us]"),
+    )
+    next_review = START + introduced_on * ONE_DAY
+
+    reviews = 0
+    recalled_total = 0
+    for day in range(days):
+        now = START + day * ONE_DAY
+        due = np.flatnonzero(next_review <= now)
+        if not due.size:
+            continue
+
+        elapsed = (now - state.last_reviewed[due]) / ONE_DAY
+        first_review = np.isnat(state.last_reviewed[due])
+        probability = np.where(
+            first_review, 0.5, np.exp(-np.nan_to_num(elapsed) / true_stability[due])
+        )
+        recalled = rng.random(due.size) < probability
+        quality = np.where(
+            recalled, np.select([probability > 0.95, probability > 0.8], [5, 4], 3), 1
+        )
+
+        true_stability[due] = np.where(
+            recalled, true_stability[due] * growth[due], np.maximum(true_stability[due] * 0.3, 1.0)
+        )
+
+        result = scheduler.review_batch(quality, state.take(due), reviewed_at=now)
+        state.ease_factor[due] = result.ease_factor
+        state.interval_days[due] = result.interval_days
+        state.repetition_number[due] = result.repetition_number
+        state.stability[due] = result.stability
+        state.difficulty[due] = result.difficulty
+        state.last_reviewed[due] = now
+        next_review[due] = result.next_review
+
+        reviews += due.size
+        recalled_total += int(recalled[~first_review].sum())
+
+    end = START + days * ONE_DAY
+    seen = ~np.isnat(state.last_reviewed)
+    retention = np.exp(-((end - state.last_reviewed[seen]) / ONE_DAY) / true_stability[seen])
+    repeat_reviews = reviews - int(seen.sum())
+
+    return {
+        "reviews": reviews,
+        "reviews_per_learner_day": reviews / (learners * days),
+        "recall_at_review": recalled_total / max(repeat_reviews, 1),
+        "retention_at_end": float(retention.mean()),
+    }
+
+
+def main() -> None:
+    """Parse CLI arguments and compare every registered scheduler."""
+    parser = argparse.ArgumentParser(description="Scheduler review-load benchmark")
+    parser.add_argument("--learners", type=int, default=DEFAULT_LEARNERS)
+    parser.add_argument("--cards", type=int, default=DEFAULT_CARDS)
+    parser.add_argument("--days", type=int, default=DEFAULT_DAYS)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logger.info("%d learners x %d cards over %d days", args.learners, args.cards, args.days)
+    results = {}
+    for name in SCHEDULERS:
+        started = time.perf_counter()
+        results[name] = simulate(name, args.learners, args.cards, args.days)
+        logger.info(
+            "%-5s %10d reviews  %6.2f reviews/learner/day  recall %.3f  retention %.3f  (%.1fs)",
+            name,
+            results[name]["reviews"],
+            results[name]["reviews_per_learner_day"],
+            results[name]["recall_at_review"],
+            results[name]["retention_at_end"],
+            time.perf_counter() - started,
+        )
+
+    baseline, candidate = results["sm2"], results["fsrs"]
+    logger.info(
+        "fsrs vs sm2: %+.1f%% reviews, %+.3f retention at end",
+        (candidate["reviews"] / baseline["reviews"] - 1) * 100,
+        candidate["retention_at_end"] - baseline["retention_at_end"],
+    )
+
+
+if __name__ == "__main__":
+    main()
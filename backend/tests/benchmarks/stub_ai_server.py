@@ -0,0 +1,128 @@
+"""
+Local stand-in for the Anthropic and OpenAI streaming APIs.
+
+Serves POST /v1/messages and POST /v1/chat/completions with the providers'
+event formats. Replies have a configurable time to first token, per-token
+delay and length. A share of requests can be rejected with 429 (and a
+Retry-After header) or 529 to exercise retries. GET /stats returns the
+request counts.
+
+Point the backend at it with ANTHROPIC_BASE_URL / OPENAI_BASE_URL (any API
+keys will do). Run from backend/:
+    python -m tests.benchmarks.stub_ai_server [--port 8900] [--failure-rate 0.05]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+from collections import Counter
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+DEFAULT_PORT = 8900
+STUB_REPLY = "Hej! Det här är ett svar från en lokal testserver som låtsas vara en AI."
+
+
+@dataclass
+class StubConfig:
+    """Timing and failure behaviour of the stub."""
+
+    first_token_ms: float = 200.0
+    token_ms: float = 10.0
+    reply_tokens: int = 50
+    failure_rate: float = 0.0
+
+
+def reply_tokens(config: StubConfig) -> list[str]:
+    """Tokens of the canned reply."""
+    words = STUB_REPLY.split()
+    return [f"{words[index % len(words)]} " for index in range(config.reply_tokens)]
+
+
+def create_stub_app(config: StubConfig | None = None) -> FastAPI:
+    """The stub API; request counts are kept in app.state.requests."""
+    config = config or StubConfig()
+    app = FastAPI(title="AI provider stub")
+    app.state.config = config
+    app.state.requests = Counter()
+
+    def rejection(provider: str) -> Response | None:
+        app.state.requests[provider] += 1
+        if random.random() >= config.failure_rate:
+            return None
+        app.state.requests[f"{provider}_rejected"] += 1
+        if random.random() < 0.5:
+            return JSONResponse(
+                {"error": {"type": "rate_limit_error"}},
+                status_code=429,
+                headers={"Retry-After": "0"},
+            )
+        return JSONResponse({"error": {"type": "overloaded_error"}}, status_code=529)
+
+    async def paced_tokens() -> AsyncIterator[str]:
+        await asyncio.sleep(config.first_token_ms / 1000)
+        for index, token in enumerate(reply_tokens(config)):
+            if index:
+                await asyncio.sleep(config.token_ms / 1000)
+            yield token
+
+    @app.post("/v1/messages")
+    async def anthropic_messages(request: Request) -> Response:
+        await request.json()
+        if (response := rejection("anthropic")) is not None:
+            return response
+
+        async def events() -> AsyncIterator[str]:
+            yield 'event: message_start\ndata: {"type": "message_start"}\n\n'
+            async for token in paced_tokens():
+                delta = {"type": "content_block_delta", "index": 0, "delta": {"text": token}}
+                yield f"event: content_block_delta\ndata: {json.dumps(delta)}\n\n"
+            yield 'event: message_stop\ndata: {"type": "message_stop"}\n\n'
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.post("/v1/chat/completions")
+    async def openai_chat_completions(request: Request) -> Response:
+        await request.json()
+        if (response := rejection("openai")) is not None:
+            return response
+
+        async def events() -> AsyncIterator[str]:
+            async for token in paced_tokens():
+                chunk = {"choices": [{"index": 0, "delta": {"content": token}}]}
+                yield f"data: {json.dumps(chunk)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.get("/stats")
+    async def stats() -> dict[str, int]:
+        return dict(app.state.requests)
+
+    return app
+
+
+def main() -> None:
+    """Parse CLI arguments and serve the stub."""
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Stub Anthropic/OpenAI streaming APIs")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--first-token-ms", type=float, default=StubConfig.first_token_ms)
+    parser.add_argument("--token-ms", type=float, default=StubConfig.token_ms)
+    parser.add_argument("--reply-tokens", type=int, default=StubConfig.reply_tokens)
+    parser.add_argument(
+        "--failure-rate", type=float, default=0.0, help="Share of requests answered 429/529"
+    )
+    args = parser.parse_args()
+
+    config = StubConfig(args.first_token_ms, args.token_ms, args.reply_tokens, args.failure_rate)
+    uvicorn.run(create_stub_app(config), host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Fixtures for tests that drive the app against a throwaway SQLite database.
+
+Settings are read when src is first imported, so the environment is set up
+here before any src import.
+"""
+
+import os
+import tempfile
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+_TMP_DIR = Path(tempfile.mkdtemp(prefix="svenska-lara-tests-"))
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_TMP_DIR / 'test.db'}"
+os.environ["JWT_SECRET_KEY"] = "integration-test-secret"
+os.environ["DEBUG"] = "false"
+os.environ["DICTIONARY_INDEX_DIR"] = str(_TMP_DIR / "dictionary_index")
+os.environ["CACHE_DIR"] = str(_TMP_DIR / "cache")
+# Per-process caches would outlive the database each test recreates
+os.environ["USER_CACHE_TTL_SECONDS"] = "0"
+os.environ["FORECAST_CACHE_TTL_SECONDS"] = "0"
+
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
+
+from src.core.config import get_settings  # noqa: E402
+from src.db.session import Base, async_session_maker, engine  # noqa: E402
+from src.models.word import Word  # noqa: E402
+
+# PostgreSQL-only column types
+SQLITE_SKIPPED_TABLES = {"skill_assessments", "writing_submissions"}
+WORD_COUNT = 30
+# Statements a request may issue under strict_query_budget: well below
+# WORD_COUNT, so a query per row fails the test
+QUERY_BUDGET = 12
+
+
+@pytest.fixture
+async def database() -> AsyncIterator[None]:
+    """Fresh schema with WORD_COUNT dictionary words (ranks 1..WORD_COUNT, A1 and A2)."""
+    tables = [
+        table for table in Base.metadata.sorted_tables if table.name not in SQLITE_SKIPPED_TABLES
+    ]
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda sync_conn: Base.metadata.drop_all(sync_conn, tables=tables))
+        await conn.run_sync(lambda sync_conn: Base.metadata.create_all(sync_conn, tables=tables))
+    async with async_session_maker() as session:
+        session.add_all(
+            Word(
+                swedish=f"ord{number}",
+                english=f"word {number}",
+                part_of_speech="noun",
+                cefr_level="A1" if number % 2 else "A2",
+                frequency_rank=number,
+            )
+            for number in range(1, WORD_COUNT + 1)
+        )
+        await session.commit()
+    yield
+    await engine.dispose()
+
+
+@pytest.fixture
+async def db(database: None) -> AsyncIterator[AsyncSession]:  # noqa: ARG001
+    """A session on the test database."""
+    async with async_session_maker() as session:
+        yield session
+
+
+@pytest.fixture
+async def client(database: None) -> AsyncIterator[httpx.AsyncClient]:  # noqa: ARG001
+    """HTTP client for the app, with its lifespan running."""
+    from src.main import create_app
+
+    app = create_app()
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            yield http
+
+
+@pytest.fixture
+async def auth_headers(client: httpx.AsyncClient, test_user_data: dict) -> dict[str, str]:
+    """Authorization header of a freshly registered user."""
+    response = await client.post("/api/v1/auth/register", json=test_user_data)
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+def strict_query_budget(monkeypatch: pytest.MonkeyPatch) -> int:
+    """Fail requests (with QueryBudgetExceededError) past QUERY_BUDGET statements."""
+    settings = get_settings()
+    monkeypatch.setattr(settings, "request_query_budget", QUERY_BUDGET)
+    monkeypatch.setattr(settings, "request_query_budget_strict", True)
+    return QUERY_BUDGET
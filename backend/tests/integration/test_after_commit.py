@@ -0,0 +1,27 @@
+"""
+Cache invalidation registered with run_after_commit runs only once the
+transaction commits.
+"""
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db.session import run_after_commit, wait_after_commit_actions
+
+
+async def test_actions_run_after_commit_only(db: AsyncSession) -> None:
+    ran: list[str] = []
+
+    async def record(name: str) -> None:
+        ran.append(name)
+
+    await db.execute(text("SELECT 1"))
+    run_after_commit(db, lambda: record("rolled back"))
+    await db.rollback()
+    await db.execute(text("SELECT 1"))
+    run_after_commit(db, lambda: record("committed"))
+    assert ran == []
+
+    await db.commit()
+    await wait_after_commit_actions(db)
+    assert ran == ["committed"]
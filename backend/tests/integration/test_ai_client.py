@@ -0,0 +1,168 @@
+"""
+Provider pools: request coalescing, retries and the tokens-per-minute bucket,
+against an in-process stand-in for the OpenAI streaming API.
+"""
+
+import asyncio
+import json
+import time
+from collections.abc import AsyncIterator, Callable
+
+import httpx
+import pytest
+
+from src.services import ai_client
+from src.services.ai_client import AIProviderError, OpenAIProvider, ProviderPool, TokenBucket
+
+REPLY = ["Hej ", "och ", "välkommen!"]
+
+
+def _sse(tokens: list[str], delay: float = 0.0, fail_after: int | None = None) -> httpx.Response:
+    """A streamed chat completion, optionally dropping the connection midway."""
+
+    async def lines() -> AsyncIterator[bytes]:
+        for index, token in enumerate(tokens):
+            if index == fail_after:
+                raise httpx.ReadError("connection reset")
+            await asyncio.sleep(delay)
+            chunk = {"choices": [{"delta": {"content": token}}]}
+            yield f"data: {json.dumps(chunk)}\n\n".encode()
+        yield b"data: [DONE]\n\n"
+
+    return httpx.Response(200, content=lines(), headers={"content-type": "text/event-stream"})
+
+
+class StubAPI:
+    """Answers requests with the next scripted response and records them."""
+
+    def __init__(self, responses: list[Callable[[], httpx.Response]]):
+        self.responses = responses
+        self.requests: list[dict] = []
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(json.loads(request.content))
+        respond = self.responses[min(len(self.requests), len(self.responses)) - 1]
+        return respond()
+
+
+@pytest.fixture
+async def install_api(
+    monkeypatch: pytest.MonkeyPatch,
+) -> AsyncIterator[Callable[[StubAPI], None]]:
+    """Route the OpenAI provider's pool to a StubAPI."""
+    monkeypatch.setattr(ai_client.settings, "openai_api_key", "test-key")
+    monkeypatch.setattr(ai_client.settings, "ai_max_retries", 2)
+    monkeypatch.setattr(ai_client.settings, "ai_retry_base_seconds", 0.01)
+    monkeypatch.setattr(ai_client.settings, "ai_retry_max_seconds", 0.02)
+
+    pools: list[ProviderPool] = []
+
+    def install(api: StubAPI) -> None:
+        pool = ProviderPool("http://openai.test", max_concurrency=4)
+        pool.client = httpx.AsyncClient(
+            base_url="http://openai.test", transport=httpx.MockTransport(api)
+        )
+        ai_client._pools[OpenAIProvider.name] = pool
+        pools.append(pool)
+
+    yield install
+    ai_client._pools.pop(OpenAIProvider.name, None)
+    for pool in pools:
+        await pool.close()
+
+
+async def _reply(content: str = "Hej!") -> str:
+    messages = [{"role": "user", "content": content}]
+    return "".join([token async for token in OpenAIProvider().stream_reply("System", messages)])
+
+
+async def test_identical_requests_share_one_upstream_call(
+    install_api: Callable[[StubAPI], None],
+) -> None:
+    api = StubAPI([lambda: _sse(REPLY, delay=0.02)])
+    install_api(api)
+
+    replies = await asyncio.gather(_reply(), _reply(), _reply("Något annat"))
+
+    assert replies[0] == replies[1] == replies[2] == "".join(REPLY)
+    assert [request["messages"][-1]["content"] for request in api.requests] == [
+        "Hej!",
+        "Något annat",
+    ]
+    assert ai_client._pools[OpenAIProvider.name].in_flight == {}
+
+
+async def test_retryable_failures_are_retried(install_api: Callable[[StubAPI], None]) -> None:
+    api = StubAPI(
+        [
+            lambda: httpx.Response(429, headers={"retry-after": "0"}),
+            lambda: _sse(REPLY, fail_after=0),
+            lambda: _sse(REPLY),
+        ]
+    )
+    install_api(api)
+
+    assert await _reply() == "".join(REPLY)
+    assert len(api.requests) == 3
+
+
+async def test_retries_stop_at_the_limit_or_a_client_error(
+    install_api: Callable[[StubAPI], None],
+) -> None:
+    unavailable = StubAPI([lambda: httpx.Response(503)])
+    install_api(unavailable)
+    with pytest.raises(AIProviderError, match="503"):
+        await _reply()
+    assert len(unavailable.requests) == 3
+
+    rejected = StubAPI([lambda: httpx.Response(400)])
+    install_api(rejected)
+    with pytest.raises(AIProviderError, match="400"):
+        await _reply()
+    assert len(rejected.requests) == 1
+
+
+async def test_no_retry_once_tokens_were_delivered(
+    install_api: Callable[[StubAPI], None],
+) -> None:
+    api = StubAPI([lambda: _sse(REPLY, fail_after=2)])
+    install_api(api)
+    received: list[str] = []
+
+    with pytest.raises(AIProviderError, match="connection reset"):
+        async for token in OpenAIProvider().stream_reply(
+            "System", [{"role": "user", "content": "Hej!"}]
+        ):
+            received.append(token)
+
+    # A retry would have sent the first two tokens again
+    assert received == REPLY[:2]
+    assert len(api.requests) == 1
+
+
+async def test_token_bucket_waits_for_the_refill() -> None:
+    # 100 tokens per second
+    bucket = TokenBucket(tokens_per_minute=6000)
+    started = time.monotonic()
+    await bucket.acquire(6000)
+    assert time.monotonic() - started < 0.05
+
+    finished: list[str] = []
+
+    async def acquire(name: str, tokens: int) -> None:
+        await bucket.acquire(tokens)
+        finished.append(name)
+
+    await asyncio.gather(acquire("first", 10), acquire("second", 5))
+
+    # 15 tokens at 100 per second, granted in arrival order
+    assert time.monotonic() - started >= 0.14
+    assert finished == ["first", "second"]
+
+
+async def test_oversized_request_waits_for_a_full_bucket_only() -> None:
+    bucket = TokenBucket(tokens_per_minute=600)
+    started = time.monotonic()
+    await bucket.acquire(10_000)
+    assert time.monotonic() - started < 0.05
+    assert bucket.tokens == pytest.approx(0, abs=1)
@@ -0,0 +1,60 @@
+"""
+build_context: the latest messages within the token budget, older ones
+folded into the session summary.
+"""
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.chat import BotType, ChatMessage, ChatSession, MessageRole
+from src.models.user import User
+from src.services import chat_context
+from src.services.chat_context import build_context, estimate_tokens
+
+SYSTEM = "Du är en vänlig samtalspartner."
+
+
+@pytest.fixture
+async def long_session(db: AsyncSession, monkeypatch: pytest.MonkeyPatch) -> ChatSession:
+    """A session with 40 messages, far more than the context window holds."""
+    monkeypatch.setattr(chat_context.settings, "chat_context_tokens", 300)
+    monkeypatch.setattr(chat_context.settings, "chat_summary_tokens", 60)
+    monkeypatch.setattr(chat_context.settings, "chat_context_messages", 20)
+    user = User(email="context@example.com", hashed_password="not-a-hash")
+    db.add(user)
+    await db.flush()
+    session = ChatSession(user_id=user.id, bot_type=BotType.CONVERSATION.value)
+    db.add(session)
+    await db.flush()
+    db.add_all(
+        ChatMessage(
+            session_id=session.id,
+            role=MessageRole.USER.value if number % 2 == 0 else MessageRole.ASSISTANT.value,
+            content=f"Meddelande nummer {number} handlar om vädret i Stockholm idag.",
+        )
+        for number in range(40)
+    )
+    await db.commit()
+    await db.refresh(session)
+    return session
+
+
+async def test_window_fits_the_budget_and_summarizes_the_rest(
+    db: AsyncSession, long_session: ChatSession
+) -> None:
+    context = await build_context(db, long_session, SYSTEM, "Hur är vädret imorgon?")
+
+    assert context.tokens <= chat_context.settings.chat_context_tokens
+    assert context.tokens >= estimate_tokens(context.system)
+    assert context.messages[-1] == {"role": "user", "content": "Hur är vädret imorgon?"}
+    history = context.messages[:-1]
+    assert history, "the newest messages fit"
+    assert history[-1]["content"].startswith("Meddelande nummer 39 ")
+
+    # Everything older than the window is in the summary, newest line last
+    assert long_session.summary is not None
+    assert long_session.summary_through_id is not None
+    assert "Earlier in this conversation:" in context.system
+    first_in_window = int(history[0]["content"].split()[2])
+    last_line = long_session.summary.splitlines()[-1]
+    assert f": Meddelande nummer {first_in_window - 1} " in last_line
@@ -0,0 +1,114 @@
+"""
+Keyset paging of chat sessions and chat history through the API.
+"""
+
+from datetime import UTC, datetime, timedelta
+
+import httpx
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.chat import BotType, ChatMessage, ChatSession, MessageRole
+from src.models.user import User
+
+STARTED_AT = datetime(2026, 10, 17, 9, tzinfo=UTC)
+
+
+async def _current_user_id(db: AsyncSession, email: str) -> int:
+    user_id = await db.scalar(select(User.id).where(User.email == email))
+    assert user_id is not None
+    return user_id
+
+
+async def _pages(
+    client: httpx.AsyncClient, url: str, headers: dict[str, str], limit: int
+) -> list[list[dict]]:
+    """Every page of a newest-first listing, following X-Next-Cursor."""
+    pages: list[list[dict]] = []
+    params: dict[str, str | int] = {"limit": limit}
+    while True:
+        response = await client.get(url, headers=headers, params=params)
+        assert response.status_code == 200, response.text
+        pages.append(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return pages
+        params["cursor"] = cursor
+
+
+async def test_messages_are_paged_newest_first_across_timestamp_ties(
+    client: httpx.AsyncClient,
+    db: AsyncSession,
+    auth_headers: dict[str, str],
+    test_user_data: dict,
+) -> None:
+    user_id = await _current_user_id(db, test_user_data["email"])
+    chat_session = ChatSession(user_id=user_id, bot_type=BotType.CONVERSATION.value)
+    db.add(chat_session)
+    await db.flush()
+    # Three messages share every timestamp, so pages break inside a tie
+    messages = [
+        ChatMessage(
+            session_id=chat_session.id,
+            role=MessageRole.USER.value,
+            content=f"meddelande {number}",
+            created_at=STARTED_AT + timedelta(minutes=number // 3),
+        )
+        for number in range(11)
+    ]
+    # A reply still being generated
+    messages.append(
+        ChatMessage(
+            session_id=chat_session.id,
+            role=MessageRole.ASSISTANT.value,
+            content="",
+            created_at=STARTED_AT + timedelta(hours=1),
+        )
+    )
+    db.add_all(messages)
+    await db.commit()
+
+    pages = await _pages(
+        client, f"/api/v1/chat/sessions/{chat_session.id}/messages", auth_headers, limit=4
+    )
+
+    assert [len(page) for page in pages] == [4, 4, 3]
+    contents = [message["content"] for page in pages for message in page]
+    assert contents == [f"meddelande {number}" for number in reversed(range(11))]
+
+
+async def test_sessions_are_paged_by_last_activity(
+    client: httpx.AsyncClient,
+    db: AsyncSession,
+    auth_headers: dict[str, str],
+    test_user_data: dict,
+) -> None:
+    user_id = await _current_user_id(db, test_user_data["email"])
+    other = User(email="other@example.com", hashed_password="not-a-hash")
+    db.add(other)
+    await db.flush()
+    sessions = [
+        ChatSession(
+            user_id=user_id,
+            bot_type=BotType.CONVERSATION.value,
+            updated_at=STARTED_AT + timedelta(minutes=number // 2),
+        )
+        for number in range(5)
+    ]
+    db.add_all([*sessions, ChatSession(user_id=other.id, bot_type=BotType.CONVERSATION.value)])
+    await db.commit()
+
+    pages = await _pages(client, "/api/v1/chat/sessions", auth_headers, limit=2)
+
+    assert [len(page) for page in pages] == [2, 2, 1]
+    listed = [chat_session["id"] for page in pages for chat_session in page]
+    assert listed == [chat_session.id for chat_session in reversed(sessions)]
+
+
+async def test_malformed_cursor_is_rejected(
+    client: httpx.AsyncClient, auth_headers: dict[str, str]
+) -> None:
+    response = await client.get(
+        "/api/v1/chat/sessions", headers=auth_headers, params={"cursor": "not-a-cursor"}
+    )
+    assert response.status_code == 400
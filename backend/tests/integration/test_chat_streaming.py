@@ -0,0 +1,170 @@
+"""
+stream_chat_reply against FakeChatProvider: event order, coalesced writes,
+session counters, and what a client disconnect leaves behind.
+"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.chat import BotType, ChatMessage, ChatSession, MessageRole
+from src.models.user import User
+from src.services import chat
+from src.services.ai_client import FakeChatProvider
+
+REPLY_WORDS = 60
+
+
+@pytest.fixture
+async def chat_session(db: AsyncSession) -> ChatSession:
+    """A conversation session (not reply-cached) of a new user."""
+    user = User(email="chat@example.com", hashed_password="not-a-hash")
+    db.add(user)
+    await db.flush()
+    chat_session = ChatSession(user_id=user.id, bot_type=BotType.CONVERSATION.value)
+    db.add(chat_session)
+    await db.commit()
+    await db.refresh(chat_session)
+    return chat_session
+
+
+@pytest.fixture
+def save_calls(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """Content of every coalesced _save_content write, in order."""
+    calls: list[str] = []
+    save_content = chat._save_content
+
+    async def counting_save(session_maker, message_id: int, content: str) -> None:
+        calls.append(content)
+        await save_content(session_maker, message_id, content)
+
+    monkeypatch.setattr(chat, "_save_content", counting_save)
+    # A write every ~50 characters, never on time alone
+    monkeypatch.setattr(chat.settings, "chat_persist_chars", 50)
+    monkeypatch.setattr(chat.settings, "chat_persist_seconds", 3600.0)
+    return calls
+
+
+async def stored_messages(db: AsyncSession, session_id: int) -> list[ChatMessage]:
+    result = await db.execute(
+        select(ChatMessage)
+        .where(ChatMessage.session_id == session_id)
+        .order_by(ChatMessage.id)
+        .execution_options(populate_existing=True)
+    )
+    return list(result.scalars().all())
+
+
+async def message_count(db: AsyncSession, session_id: int) -> int:
+    return (
+        await db.execute(select(ChatSession.message_count).where(ChatSession.id == session_id))
+    ).scalar_one()
+
+
+async def test_reply_events_and_persistence(
+    db: AsyncSession, chat_session: ChatSession, save_calls: list[str]
+) -> None:
+    user = await db.get(User, chat_session.user_id)
+    provider = FakeChatProvider(first_token_ms=0, token_ms=0, reply_words=REPLY_WORDS)
+
+    events = [
+        event async for event in chat.stream_chat_reply(user, chat_session.id, "Hej!", provider)
+    ]
+
+    names = [event.event for event in events]
+    assert names == ["start"] + ["token"] * REPLY_WORDS + ["done"]
+    reply = "".join(event.data["text"] for event in events if event.event == "token")
+    assert events[-1].data["content"] == reply
+    assert events[-1].data["id"] == events[0].data["assistant_message_id"]
+
+    # Coalesced: a handful of growing snapshots, not one write per token
+    assert 0 < len(save_calls) < REPLY_WORDS
+    assert all(reply.startswith(content) for content in save_calls)
+
+    messages = await stored_messages(db, chat_session.id)
+    assert [(message.role, message.content) for message in messages] == [
+        (MessageRole.USER.value, "Hej!"),
+        (MessageRole.ASSISTANT.value, reply),
+    ]
+    assert await message_count(db, chat_session.id) == 2
+
+    async for _ in chat.stream_chat_reply(user, chat_session.id, "Och nu?", provider):
+        pass
+    assert await message_count(db, chat_session.id) == 4
+
+
+async def test_disconnect_keeps_partial_reply(
+    db: AsyncSession, chat_session: ChatSession, save_calls: list[str]
+) -> None:
+    user = await db.get(User, chat_session.user_id)
+    provider = FakeChatProvider(first_token_ms=0, token_ms=5, reply_words=REPLY_WORDS)
+    received: list[str] = []
+    enough = asyncio.Event()
+
+    async def client() -> None:
+        async for event in chat.stream_chat_reply(user, chat_session.id, "Hej!", provider):
+            if event.event == "token":
+                received.append(event.data["text"])
+                if len(received) == REPLY_WORDS // 2:
+                    enough.set()
+
+    streaming = asyncio.create_task(client())
+    await enough.wait()
+    streaming.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await streaming
+    # The final write runs detached from the cancelled stream
+    await asyncio.gather(*chat._pending_writes)
+
+    messages = await stored_messages(db, chat_session.id)
+    assert len(messages) == 2
+    partial = messages[1].content
+    assert partial == "".join(received)
+    assert 0 < len(received) < REPLY_WORDS
+    assert save_calls
+    assert await message_count(db, chat_session.id) == 2
+
+
+class RecordingProvider(FakeChatProvider):
+    """FakeChatProvider that keeps the conversations it was asked to answer."""
+
+    def __init__(self) -> None:
+        super().__init__(first_token_ms=0, token_ms=0, reply_words=5)
+        self.conversations: list[list[dict[str, str]]] = []
+
+    async def stream_reply(self, system: str, messages: list[dict[str, str]]):
+        self.conversations.append(messages)
+        async for token in super().stream_reply(system, messages):
+            yield token
+
+
+async def test_cached_bot_keeps_history(db: AsyncSession, chat_session: ChatSession) -> None:
+    user = await db.get(User, chat_session.user_id)
+    sessions = [ChatSession(user_id=user.id, bot_type=BotType.TRANSLATOR.value) for _ in range(2)]
+    db.add_all(sessions)
+    await db.commit()
+    first, second = [session.id for session in sessions]
+    provider = RecordingProvider()
+
+    async def reply(session_id: int, content: str) -> str:
+        events = [
+            event async for event in chat.stream_chat_reply(user, session_id, content, provider)
+        ]
+        return events[-1].data["content"]
+
+    # An opening question is answered once and then served from the cache
+    opening = await reply(first, "Vad betyder lagom?")
+    assert await reply(second, "vad betyder  LAGOM") == opening
+    assert len(provider.conversations) == 1
+
+    # Follow-ups are asked with the conversation so far, and never cached
+    await reply(first, "Och fika?")
+    await reply(second, "Och fika?")
+    assert len(provider.conversations) == 3
+    assert [message["content"] for message in provider.conversations[1]] == [
+        "Vad betyder lagom?",
+        opening,
+        "Och fika?",
+    ]
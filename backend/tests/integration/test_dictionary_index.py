@@ -0,0 +1,128 @@
+"""
+The memory-mapped dictionary index: lookups, generations and the writer lock.
+"""
+
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from src.services import dictionary_index
+from src.services.dictionary_index import DictionaryEntry, DictionaryIndex, _directory_lock
+
+
+def test_writer_lock_is_held_for_the_whole_write(tmp_path: Path) -> None:
+    events: list[str] = []
+    first_holds = threading.Event()
+
+    def slow_writer() -> None:
+        with _directory_lock(tmp_path):
+            first_holds.set()
+            events.append("first start")
+            # Far longer than any mtime-based staleness check would allow
+            time.sleep(0.3)
+            events.append("first end")
+
+    def second_writer() -> None:
+        first_holds.wait()
+        with _directory_lock(tmp_path):
+            events.append("second")
+
+    threads = [threading.Thread(target=slow_writer), threading.Thread(target=second_writer)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert events == ["first start", "first end", "second"]
+    # The lock file stays; only the flock is released
+    assert (tmp_path / dictionary_index.LOCK_FILE).exists()
+    with _directory_lock(tmp_path):
+        pass
+
+
+def test_lock_is_released_when_the_write_fails(tmp_path: Path) -> None:
+    index = DictionaryIndex(tmp_path)
+
+    def broken_entries() -> Iterator[DictionaryEntry]:
+        raise RuntimeError("database went away")
+        yield
+
+    with pytest.raises(RuntimeError):
+        index.rebuild(broken_entries())
+    acquired = threading.Event()
+
+    def writer() -> None:
+        with _directory_lock(tmp_path):
+            acquired.set()
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    thread.join(timeout=2)
+    assert acquired.is_set()
+
+
+def _entry(word_id: int, swedish: str, english: str, rank: int | None) -> DictionaryEntry:
+    return DictionaryEntry(
+        word_id=word_id,
+        swedish=swedish,
+        english=english,
+        part_of_speech="verb",
+        cefr_level="A1",
+        frequency_rank=rank,
+    )
+
+
+def test_prefix_ranks_exact_then_frequency(tmp_path: Path) -> None:
+    index = DictionaryIndex(tmp_path)
+    index.rebuild(
+        [
+            _entry(1, "gå", "to go, to walk", 40),
+            _entry(2, "gås", "goose", 900),
+            _entry(3, "gata", "street", 120),
+            _entry(4, "gammal", "old", None),
+            _entry(5, "åka", "to go, to ride", 60),
+            # Many frequent words behind the prefix, beyond the overscan window
+            *(_entry(100 + n, f"ga{n:03d}", f"filler {n}", n) for n in range(1, 60)),
+        ]
+    )
+
+    # Folded: "ga" matches gå and gås; exact matches first, then by rank
+    assert [entry.word_id for entry in index.prefix("gå", limit=3)] == [1, 101, 102]
+    # English glosses match with and without "to "; a word matching
+    # through two keys is listed once
+    assert [entry.word_id for entry in index.prefix("go", limit=5)] == [1, 5, 2]
+    assert [entry.word_id for entry in index.exact("to walk")] == [1]
+    # Unranked words come last even when the range is sorted in full
+    assert [entry.word_id for entry in index.prefix("ga", limit=100)][-1] == 4
+    entry = index.prefix("gammal")[0]
+    assert (entry.swedish, entry.english, entry.frequency_rank) == ("gammal", "old", None)
+
+
+def test_writes_publish_new_generations(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    index = DictionaryIndex(tmp_path)
+    # Another worker with the first generation mapped
+    reader = DictionaryIndex(tmp_path)
+    index.rebuild([_entry(1, "hund", "dog", 10)])
+    assert [entry.word_id for entry in reader.prefix("hu")] == [1]
+
+    index.add_entries([_entry(2, "hus", "house", 5), _entry(1, "hund", "dog", 10)])
+    # Readers re-check CURRENT at most once per RELOAD_CHECK_INTERVAL_SECONDS
+    assert [entry.word_id for entry in reader.prefix("hu")] == [1]
+    reader._next_check = 0.0
+    assert [entry.word_id for entry in reader.prefix("hu")] == [2, 1]
+    assert (tmp_path / dictionary_index.CURRENT_FILE).read_text() == "2"
+
+    # A rebuild numbers above every file on disk, even ones CURRENT moved past
+    (tmp_path / dictionary_index.CURRENT_FILE).write_text("1")
+    monkeypatch.setattr(dictionary_index, "GENERATION_GRACE_SECONDS", 0.0)
+    time.sleep(0.01)
+    index.rebuild([_entry(3, "katt", "cat", 20)])
+    assert (tmp_path / dictionary_index.CURRENT_FILE).read_text() == "3"
+    assert sorted(path.name for path in tmp_path.glob("words.*")) == ["words.3.idx"]
+    # The superseded, deleted generation stays readable where it is mapped
+    assert [entry.word_id for entry in reader.prefix("hu")] == [2, 1]
+    reader._next_check = 0.0
+    assert [entry.word_id for entry in reader.prefix("ka")] == [3]
@@ -0,0 +1,113 @@
+"""
+Review forecast: local-day histogram, simulated reviews and the forecast cache.
+"""
+
+from datetime import UTC, datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.cache import CacheBackend, create_cache_backend
+from src.db.session import wait_after_commit_actions
+from src.models.user import User
+from src.models.word import UserWord, Word
+from src.schemas.word import ReviewAnswer
+from src.services import forecast
+from src.services.forecast import get_review_forecast
+from src.services.vocabulary import submit_review
+
+# No daylight saving time, so the UTC offset is the same on every day
+TOKYO = ZoneInfo("Asia/Tokyo")
+
+
+def _local(days: int, hour: int, minute: int = 0) -> datetime:
+    """A time on the `days`-th local day from today in Tokyo, as UTC."""
+    today = datetime.now(TOKYO).date()
+    local = datetime.combine(today + timedelta(days=days), time(hour, minute), TOKYO)
+    return local.astimezone(UTC)
+
+
+async def _user_with_cards(db: AsyncSession, next_reviews: list[datetime | None]) -> User:
+    user = User(email="forecast@example.com", hashed_password="not-a-hash", timezone="Asia/Tokyo")
+    db.add(user)
+    await db.flush()
+    word_ids = (await db.scalars(select(Word.id).limit(len(next_reviews)))).all()
+    db.add_all(
+        UserWord(user_id=user.id, word_id=word_id, next_review=next_review)
+        for word_id, next_review in zip(word_ids, next_reviews, strict=True)
+    )
+    await db.commit()
+    return user
+
+
+async def test_histogram_counts_by_local_day(db: AsyncSession) -> None:
+    user = await _user_with_cards(
+        db,
+        [
+            datetime.now(UTC) - timedelta(days=3),  # Overdue: today
+            _local(1, 0, 30),  # Still the previous day in UTC
+            _local(1, 23, 30),
+            _local(3, 8),
+            _local(7, 0, 30),  # Past the horizon
+            None,
+            None,
+        ],
+    )
+
+    result = await get_review_forecast(db, user, days=7)
+
+    assert result.timezone == "Asia/Tokyo"
+    assert not result.simulated
+    assert result.new_cards == 2
+    today = datetime.now(TOKYO).date()
+    assert [day.day for day in result.days] == [today + timedelta(days=n) for n in range(7)]
+    assert [day.due for day in result.days] == [1, 2, 0, 1, 0, 0, 0]
+
+
+async def test_simulation_replays_future_reviews(db: AsyncSession) -> None:
+    # A fresh card: SM-2 with quality 4 gives intervals of 1, 6 and 15 days
+    user = await _user_with_cards(db, [_local(1, 10), None])
+
+    histogram = await get_review_forecast(db, user, days=30)
+    simulated = await get_review_forecast(db, user, days=30, simulate=True, assumed_quality=4)
+
+    assert simulated.simulated
+    assert simulated.new_cards == histogram.new_cards == 1
+    due_days = [offset for offset, day in enumerate(simulated.days) for _ in range(day.due)]
+    assert due_days == [1, 2, 8, 23]
+    # The first review of every card is where the histogram has it
+    assert all(
+        simulated_day.due >= day.due
+        for simulated_day, day in zip(simulated.days, histogram.days, strict=True)
+    )
+
+
+@pytest.fixture
+def forecast_cache(monkeypatch: pytest.MonkeyPatch) -> CacheBackend:
+    """A forecast cache that keeps entries (the test environment disables it)."""
+    monkeypatch.setattr(forecast.settings, "forecast_cache_ttl_seconds", 600)
+    backend = create_cache_backend("memory", max_entries=100, ttl_seconds=600)
+    monkeypatch.setattr(forecast, "forecast_cache", backend)
+    return backend
+
+
+async def test_reviews_invalidate_cached_forecasts(
+    db: AsyncSession, forecast_cache: CacheBackend
+) -> None:
+    user = await _user_with_cards(db, [datetime.now(UTC) - timedelta(hours=1)])
+    first = await get_review_forecast(db, user, days=7)
+    assert await get_review_forecast(db, user, days=7) == first
+    assert forecast_cache.stats().hits == 1
+    assert first.days[0].due == 1
+
+    user_word_id = await db.scalar(select(UserWord.id).where(UserWord.user_id == user.id))
+    assert user_word_id is not None
+    await submit_review(db, user.id, user_word_id, ReviewAnswer(quality=5))
+    await db.commit()
+    await wait_after_commit_actions(db)
+
+    after = await get_review_forecast(db, user, days=7)
+    assert after.days[0].due == 0
+    assert sum(day.due for day in after.days) == 1
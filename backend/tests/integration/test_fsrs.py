@@ -0,0 +1,137 @@
+"""
+FSRS memory model: single review steps, seeding from SM-2 state and the
+weight optimizer.
+"""
+
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+
+from src.services.fsrs import (
+    AGAIN,
+    DEFAULT_WEIGHTS,
+    EASY,
+    GOOD,
+    WEIGHT_BOUNDS,
+    ReviewHistory,
+    fit_fsrs_weights,
+    fsrs_log_loss,
+    fsrs_step,
+    initial_difficulty,
+    next_interval,
+    retrievability,
+    seed_from_sm2,
+)
+from src.services.scheduler import CardStates, FSRSScheduler
+
+WEIGHTS = np.array(DEFAULT_WEIGHTS)
+NOW = datetime(2026, 10, 17, 12, tzinfo=UTC)
+
+
+def _cards(**columns: list) -> CardStates:
+    count = len(next(iter(columns.values())))
+    rows = [
+        {
+            "ease_factor": 2.5,
+            "interval_days": 1,
+            "repetition_number": 0,
+            "stability": None,
+            "difficulty": None,
+            "last_reviewed": None,
+        }
+        for _ in range(count)
+    ]
+    for name, values in columns.items():
+        for row, value in zip(rows, values, strict=True):
+            row[name] = value
+    return CardStates.from_rows(rows)
+
+
+def test_recall_is_ninety_percent_after_stability_days() -> None:
+    stability = np.array([0.5, 3.0, 40.0])
+    assert np.allclose(retrievability(stability, stability), 0.9)
+    assert np.array_equal(next_interval(stability, 0.9), np.array([1, 3, 40]))
+    # Higher retention targets mean shorter intervals
+    assert (next_interval(stability, 0.95) <= next_interval(stability, 0.9)).all()
+
+
+def test_first_review_initializes_the_memory_state() -> None:
+    rating = np.array([AGAIN, GOOD, EASY])
+    nan = np.full(3, np.nan)
+
+    stability, difficulty, recall = fsrs_step(WEIGHTS, nan, nan, np.zeros(3), rating)
+
+    assert np.allclose(stability, WEIGHTS[rating - 1])
+    assert np.allclose(difficulty, initial_difficulty(WEIGHTS, rating))
+    assert np.isnan(recall).all()
+
+
+def test_success_grows_stability_and_a_lapse_shrinks_it() -> None:
+    stability = np.full(3, 10.0)
+    difficulty = np.full(3, 5.0)
+    rating = np.array([AGAIN, GOOD, EASY])
+
+    new_stability, new_difficulty, recall = fsrs_step(
+        WEIGHTS, stability, difficulty, np.full(3, 10.0), rating
+    )
+
+    assert np.allclose(recall, 0.9)
+    assert new_stability[0] < 10.0 < new_stability[1] < new_stability[2]
+    assert new_difficulty[0] > 5.0 > new_difficulty[2]
+
+
+def test_cards_with_sm2_history_are_seeded() -> None:
+    last_reviewed = NOW - timedelta(days=3)
+    cards = _cards(
+        ease_factor=[2.5, 1.7, 2.2],
+        interval_days=[1, 1, 6],
+        repetition_number=[0, 0, 2],
+        # New card; lapsed card (repetition reset, but reviewed before); learning card
+        last_reviewed=[None, last_reviewed, last_reviewed],
+    )
+
+    result = FSRSScheduler().review_batch(np.array([4, 4, 4]), cards, NOW)
+
+    assert result.stability[0] == WEIGHTS[GOOD - 1]
+    seeded_stability, seeded_difficulty = seed_from_sm2(np.array([1.7, 2.2]), np.array([1, 6]))
+    expected, _, _ = fsrs_step(
+        WEIGHTS, seeded_stability, seeded_difficulty, np.full(2, 3.0), np.full(2, GOOD)
+    )
+    assert np.allclose(result.stability[1:], expected)
+    assert result.stability[1] != WEIGHTS[GOOD - 1]
+
+
+def _simulated_history(weights: np.ndarray, cards: int, reviews: int) -> ReviewHistory:
+    """Answers drawn from the recall probabilities of a model with the given weights."""
+    rng = np.random.default_rng(17)
+    stability = np.full(cards, np.nan)
+    difficulty = np.full(cards, np.nan)
+    ratings = np.empty((cards, reviews), dtype=np.int64)
+    elapsed = np.zeros((cards, reviews))
+    for review in range(reviews):
+        if review:
+            elapsed[:, review] = rng.uniform(1, 30, cards)
+        recall = retrievability(elapsed[:, review], np.nan_to_num(stability, nan=1.0))
+        recalled = (review == 0) | (rng.random(cards) < recall)
+        ratings[:, review] = np.where(recalled, GOOD, AGAIN)
+        stability, difficulty, _ = fsrs_step(
+            weights, stability, difficulty, elapsed[:, review], ratings[:, review]
+        )
+    return ReviewHistory(
+        card=np.repeat(np.arange(cards), reviews),
+        rating=ratings.ravel(),
+        elapsed_days=elapsed.ravel(),
+    )
+
+
+def test_optimizer_moves_towards_the_generating_weights() -> None:
+    true_weights = WEIGHTS.copy()
+    # Learners who forget much faster than the defaults assume
+    true_weights[:4] *= 0.2
+    history = _simulated_history(true_weights, cards=400, reviews=5)
+
+    fitted, loss = fit_fsrs_weights(history, epochs=20)
+
+    assert loss < fsrs_log_loss(WEIGHTS, history)
+    assert fitted[GOOD - 1] < WEIGHTS[GOOD - 1]
+    assert ((fitted >= WEIGHT_BOUNDS[:, 0]) & (fitted <= WEIGHT_BOUNDS[:, 1])).all()
@@ -0,0 +1,62 @@
+"""
+Streaming word import: upserts, checkpoints and the dictionary index rebuild.
+"""
+
+from pathlib import Path
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.word import Word
+from src.scripts import import_words as importer
+
+WORDS_TSV = "swedish\tenglish\tcefr_level\nhund\tdog\tA1\nkatt\tcat\tA1\nhund\thound\tA2\n"
+
+
+@pytest.fixture
+def rebuilds(monkeypatch: pytest.MonkeyPatch) -> list[AsyncSession]:
+    calls: list[AsyncSession] = []
+
+    async def record_rebuild(session: AsyncSession) -> None:
+        calls.append(session)
+
+    monkeypatch.setattr(importer, "rebuild_dictionary_index", record_rebuild)
+    return calls
+
+
+async def _count(db: AsyncSession, swedish: str) -> int:
+    return await db.scalar(select(func.count()).where(Word.swedish == swedish)) or 0
+
+
+async def test_import_upserts_and_rebuilds(
+    db: AsyncSession, tmp_path: Path, rebuilds: list[AsyncSession]
+) -> None:
+    words = tmp_path / "words.tsv"
+    words.write_text(WORDS_TSV)
+
+    stats = await importer.import_words(words, batch_size=2)
+
+    assert (stats.read, stats.rejected) == (3, 0)
+    assert await _count(db, "hund") == 1
+    english = await db.scalar(select(Word.english).where(Word.swedish == "hund"))
+    assert english == "hound"
+    assert len(rebuilds) == 1
+    assert not (tmp_path / "words.tsv.checkpoint").exists()
+
+
+async def test_resumed_import_rebuilds_the_index(
+    db: AsyncSession, tmp_path: Path, rebuilds: list[AsyncSession]
+) -> None:
+    # The previous run committed every batch, then died before its rebuild
+    words = tmp_path / "words.tsv"
+    words.write_text(WORDS_TSV)
+    checkpoint = tmp_path / "words.tsv.checkpoint"
+    importer.write_checkpoint(checkpoint, words, words.stat().st_size)
+
+    stats = await importer.import_words(words)
+
+    assert (stats.read, stats.written) == (0, 0)
+    assert len(rebuilds) == 1
+    assert not checkpoint.exists()
+    assert await _count(db, "hund") == 0
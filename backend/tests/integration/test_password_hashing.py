@@ -0,0 +1,71 @@
+"""
+bcrypt off the event loop: the bounded hashing pool and cost upgrades at login.
+"""
+
+import asyncio
+import threading
+
+import bcrypt
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core import security
+from src.core.exceptions import CredentialsException, ServiceUnavailableException
+from src.core.security import PasswordHashPool, verify_password
+from src.models.user import User
+from src.services.auth import authenticate_user
+
+PASSWORD = "correct horse battery"
+
+
+async def test_pool_rejects_work_beyond_max_pending() -> None:
+    pool = PasswordHashPool(workers=1, max_pending=2)
+    release = threading.Event()
+    running: list[str] = []
+
+    def blocking_hash() -> str:
+        running.append(threading.current_thread().name)
+        release.wait(timeout=5)
+        return "hashed"
+
+    jobs = [asyncio.create_task(pool.run(blocking_hash)) for _ in range(2)]
+    await asyncio.sleep(0)
+    assert pool.queue_depth == 2
+
+    with pytest.raises(ServiceUnavailableException) as rejected:
+        await pool.run(blocking_hash)
+    assert rejected.value.status_code == 503
+    assert rejected.value.headers == {"Retry-After": "1"}
+
+    release.set()
+    assert await asyncio.gather(*jobs) == ["hashed", "hashed"]
+    assert pool.queue_depth == 0
+    # One worker thread, never the event loop's
+    assert len(set(running)) == 1
+    assert running[0].startswith("password-hash")
+    pool.shutdown()
+
+
+@pytest.fixture
+async def user_with_old_cost(db: AsyncSession, monkeypatch: pytest.MonkeyPatch) -> User:
+    """A user whose hash was made at cost 4 while the configured cost is 5."""
+    monkeypatch.setattr(security.settings, "bcrypt_rounds", 5)
+    hashed = bcrypt.hashpw(PASSWORD.encode(), bcrypt.gensalt(rounds=4)).decode()
+    user = User(email="old-cost@example.com", hashed_password=hashed)
+    db.add(user)
+    await db.commit()
+    return user
+
+
+async def test_login_upgrades_an_outdated_hash(db: AsyncSession, user_with_old_cost: User) -> None:
+    old_hash = user_with_old_cost.hashed_password
+
+    with pytest.raises(CredentialsException):
+        await authenticate_user(db, user_with_old_cost.email, "wrong password")
+    assert user_with_old_cost.hashed_password == old_hash
+
+    user = await authenticate_user(db, user_with_old_cost.email, PASSWORD)
+
+    assert user.hashed_password.startswith("$2b$05$")
+    assert verify_password(PASSWORD, user.hashed_password)
+    assert not security.password_needs_rehash(user.hashed_password)
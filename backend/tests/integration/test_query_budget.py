@@ -0,0 +1,116 @@
+"""
+List and review endpoints stay within a fixed SQL statement budget however
+many words are involved, and routes are reported by their template.
+"""
+
+import httpx
+import pytest
+
+from src.api.middleware import route_metrics
+from src.db.query_stats import QueryBudgetExceededError
+from tests.integration.conftest import WORD_COUNT
+
+VOCABULARY = "/api/v1/vocabulary"
+
+
+@pytest.fixture
+async def vocabulary(client: httpx.AsyncClient, auth_headers: dict[str, str]) -> list[int]:
+    """Ids of the user's words: the whole dictionary, added in bulk."""
+    for level in ("A1", "A2"):
+        response = await client.post(
+            f"{VOCABULARY}/my-words/bulk", json={"cefr_level": level}, headers=auth_headers
+        )
+        assert response.status_code == 200, response.text
+    response = await client.get(f"{VOCABULARY}/my-words?limit=100", headers=auth_headers)
+    assert response.status_code == 200, response.text
+    return [user_word["id"] for user_word in response.json()]
+
+
+@pytest.mark.usefixtures("strict_query_budget")
+async def test_list_endpoints_within_budget(
+    client: httpx.AsyncClient, auth_headers: dict[str, str], vocabulary: list[int]
+) -> None:
+    assert len(vocabulary) == WORD_COUNT
+    for path in (
+        "/words?limit=50",
+        "/words?search=ord",
+        "/words/autocomplete?q=ord",
+        "/my-words?limit=100",
+        "/review?limit=50",
+        "/stats",
+        "/forecast",
+    ):
+        response = await client.get(f"{VOCABULARY}{path}", headers=auth_headers)
+        assert response.status_code == 200, f"{path}: {response.text}"
+
+
+@pytest.mark.usefixtures("strict_query_budget")
+async def test_review_endpoints_within_budget(
+    client: httpx.AsyncClient, auth_headers: dict[str, str], vocabulary: list[int]
+) -> None:
+    response = await client.post(
+        f"{VOCABULARY}/review/{vocabulary[0]}", json={"quality": 4}, headers=auth_headers
+    )
+    assert response.status_code == 200, response.text
+
+    reviews = [{"user_word_id": user_word_id, "quality": 5} for user_word_id in vocabulary[1:]]
+    response = await client.post(
+        f"{VOCABULARY}/review/batch", json={"reviews": reviews}, headers=auth_headers
+    )
+    assert response.status_code == 200, response.text
+    assert len(response.json()) == WORD_COUNT - 1
+
+
+@pytest.mark.usefixtures("strict_query_budget")
+async def test_review_session_within_budget(
+    client: httpx.AsyncClient, auth_headers: dict[str, str], vocabulary: list[int]
+) -> None:
+    response = await client.post(
+        f"{VOCABULARY}/review-sessions",
+        json={"limit": 100, "new_limit": 50, "window": 20},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200, response.text
+    session = response.json()
+    assert session["total_cards"] == len(vocabulary)
+
+    answers = f"{VOCABULARY}/review-sessions/{session['session_id']}/answers"
+    for user_word_id in vocabulary:
+        response = await client.post(
+            answers, json={"user_word_id": user_word_id, "quality": 4}, headers=auth_headers
+        )
+        assert response.status_code == 200, response.text
+
+    response = await client.post(
+        f"{VOCABULARY}/review-sessions/{session['session_id']}/end", headers=auth_headers
+    )
+    assert response.status_code == 200, response.text
+    assert len(response.json()) == len(vocabulary)
+
+
+async def test_strict_budget_fails_the_request(
+    client: httpx.AsyncClient,
+    auth_headers: dict[str, str],
+    vocabulary: list[int],  # noqa: ARG001
+    monkeypatch: pytest.MonkeyPatch,
+    strict_query_budget: int,  # noqa: ARG001
+) -> None:
+    from src.core.config import get_settings
+
+    monkeypatch.setattr(get_settings(), "request_query_budget", 1)
+    with pytest.raises(QueryBudgetExceededError):
+        await client.get(f"{VOCABULARY}/my-words", headers=auth_headers)
+
+
+async def test_routes_reported_by_template(
+    client: httpx.AsyncClient, auth_headers: dict[str, str]
+) -> None:
+    route_metrics.clear()
+    # A parameter value equal to a static segment of the path
+    await client.get(f"{VOCABULARY}/review-sessions/vocabulary", headers=auth_headers)
+    await client.get(f"{VOCABULARY}/my-words/1", headers=auth_headers)
+
+    assert set(route_metrics.report()) == {
+        "GET /api/v1/vocabulary/review-sessions/{session_id}",
+        "GET /api/v1/vocabulary/my-words/{user_word_id}",
+    }
@@ -0,0 +1,104 @@
+"""
+The chatbot reply cache and the byte-capped backends it is stored in.
+"""
+
+import uuid
+from collections.abc import AsyncIterator
+
+import pytest
+
+from src.core.cache import CacheBackend, SQLiteCacheBackend, create_cache_backend
+from src.services.reply_cache import ReplyCache, normalize_message
+
+BACKENDS = ["memory", "sqlite"]
+SYSTEM = "Översätt mellan svenska och engelska."
+
+
+def _backend(name: str, max_bytes: int = 0, namespace: str | None = None) -> CacheBackend:
+    return create_cache_backend(
+        name,
+        max_entries=100,
+        ttl_seconds=60,
+        max_bytes=max_bytes,
+        namespace=namespace or f"replies-{uuid.uuid4().hex}",
+    )
+
+
+async def _tokens(*tokens: str) -> AsyncIterator[str]:
+    for token in tokens:
+        yield token
+
+
+async def _failing() -> AsyncIterator[str]:
+    yield "Lagom "
+    raise ConnectionError("provider went away")
+
+
+def test_messages_are_normalized() -> None:
+    assert normalize_message("  Vad betyder\tLAGOM?! ") == "vad betyder lagom"
+    # NFKC: the ligature and the decomposed å become their composed forms
+    assert normalize_message("\ufb01ka pa\u030a") == "fika p\u00e5"
+
+
+@pytest.mark.parametrize("backend_name", BACKENDS)
+async def test_complete_replies_are_served_from_the_cache(backend_name: str) -> None:
+    cache = ReplyCache(_backend(backend_name), ["translator"])
+    key = cache.key("translator", SYSTEM, "Vad betyder lagom?")
+
+    streamed = [token async for token in cache.stream(key, 400, _tokens("Lagom ", "betyder..."))]
+    assert streamed == ["Lagom ", "betyder..."]
+    assert cache.savings.tokens == 0
+
+    # A hit is one chunk and never touches the provider stream
+    hit = [token async for token in cache.stream(key, 400, _failing())]
+    assert hit == ["Lagom betyder..."]
+    assert cache.savings.tokens == (400 + len("Lagom betyder...")) // 4
+    assert cache.stats().hits == 1
+    # The bot and the system prompt are part of the key
+    assert cache.key("vocabulary", SYSTEM, "vad betyder lagom") != key
+    assert cache.key("translator", SYSTEM + " ", "vad betyder lagom") != key
+    assert cache.key("translator", SYSTEM, "vad betyder  LAGOM") == key
+
+
+@pytest.mark.parametrize("backend_name", BACKENDS)
+async def test_interrupted_replies_are_not_stored(backend_name: str) -> None:
+    cache = ReplyCache(_backend(backend_name), ["translator"])
+    key = cache.key("translator", SYSTEM, "Vad betyder lagom?")
+
+    with pytest.raises(ConnectionError):
+        async for _ in cache.stream(key, 400, _failing()):
+            pass
+
+    assert await cache.backend.get(key) is None
+
+
+@pytest.mark.parametrize("backend_name", BACKENDS)
+async def test_byte_cap_evicts_least_recently_used(backend_name: str) -> None:
+    # Each value below is 10 bytes of JSON; room for three
+    backend = _backend(backend_name, max_bytes=35)
+    for key in ("a", "b", "c"):
+        await backend.set(key, {"v": key})
+    assert await backend.get("a") is not None
+
+    await backend.set("d", {"v": "d"})
+    await backend.set("huge", {"v": "x" * 100})
+
+    assert await backend.get("b") is None
+    assert await backend.get("huge") is None
+    assert [await backend.get(key) is not None for key in ("a", "c", "d")] == [True] * 3
+    stats = backend.stats()
+    assert (stats.size, stats.evictions) == (3, 1)
+    assert stats.bytes == 30
+
+
+async def test_sqlite_entries_are_shared_between_workers() -> None:
+    namespace = f"replies-{uuid.uuid4().hex}"
+    first = _backend("sqlite", namespace=namespace)
+    second = _backend("sqlite", namespace=namespace)
+    assert isinstance(second, SQLiteCacheBackend)
+
+    await first.set("reply:1", {"reply": "Hej", "tokens": 3, "seconds": 0.5})
+
+    assert await second.get("reply:1") == {"reply": "Hej", "tokens": 3, "seconds": 0.5}
+    await second.delete("reply:1")
+    assert await first.get("reply:1") is None
@@ -0,0 +1,261 @@
+"""
+Review event log: the batching writer, rollups, retention and partitions.
+
+Partitioning is PostgreSQL-only, so those tests drive the partition code
+against a session that records its statements.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import UTC, date, datetime, timedelta
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db.session import async_session_maker
+from src.models.word import ReviewDailyRollup, ReviewEvent
+from src.services.review_events import (
+    DEFAULT_PARTITION,
+    ReviewEventWriter,
+    apply_review_event_retention,
+    ensure_review_event_partitions,
+    rollup_review_events,
+)
+
+DAY = datetime(2026, 10, 16, tzinfo=UTC)
+
+
+def _event(number: int, user_id: int = 1, at: datetime = DAY, **changes: Any) -> dict:
+    return {
+        "user_id": user_id,
+        "word_id": number,
+        "reviewed_at": at,
+        "quality": 4,
+        "response_ms": None,
+        "prev_status": "new",
+        "prev_ease_factor": 2.5,
+        "prev_interval_days": 1,
+        "prev_repetition_number": 0,
+        "status": "learning",
+        "ease_factor": 2.5,
+        "interval_days": 1,
+        "repetition_number": 1,
+        **changes,
+    }
+
+
+async def _logged_word_ids(db: AsyncSession) -> list[int]:
+    result = await db.scalars(select(ReviewEvent.word_id).order_by(ReviewEvent.word_id))
+    return list(result.all())
+
+
+class FlakySessionMaker:
+    """Session maker whose first `failures` sessions cannot reach the database."""
+
+    def __init__(self, failures: int):
+        self.failures = failures
+
+    @asynccontextmanager
+    async def __call__(self) -> AsyncIterator[AsyncSession]:
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("database unreachable")
+        async with async_session_maker() as session:
+            yield session
+
+
+async def test_writer_flushes_in_batches(db: AsyncSession) -> None:
+    writer = ReviewEventWriter(
+        async_session_maker, batch_size=3, flush_seconds=3600, max_buffered=100
+    )
+    writer.add([_event(number) for number in range(7)])
+
+    assert await writer.flush() == 7
+
+    assert await _logged_word_ids(db) == list(range(7))
+    assert writer.stats() == {"buffered": 0, "written": 7, "dropped": 0}
+
+
+async def test_failed_batches_are_retried_in_order(db: AsyncSession) -> None:
+    writer = ReviewEventWriter(
+        FlakySessionMaker(1), batch_size=3, flush_seconds=3600, max_buffered=5
+    )
+    writer.add([_event(number) for number in range(4)])
+
+    assert await writer.flush() == 0
+    assert writer.stats()["buffered"] == 4
+    # Still unreachable, the buffer keeps only the newest max_buffered events
+    writer.add([_event(number) for number in range(4, 7)])
+    assert writer.stats() == {"buffered": 5, "written": 0, "dropped": 2}
+
+    assert await writer.flush() == 5
+    assert await _logged_word_ids(db) == [2, 3, 4, 5, 6]
+
+
+async def test_full_batch_is_written_without_waiting(db: AsyncSession) -> None:
+    writer = ReviewEventWriter(
+        async_session_maker, batch_size=3, flush_seconds=3600, max_buffered=100
+    )
+    writer.start()
+    try:
+        writer.add([_event(number) for number in range(3)])
+        for _ in range(100):
+            if writer.written:
+                break
+            await asyncio.sleep(0.01)
+        assert writer.written == 3
+        # Below batch_size, events wait for the timer or for stop()
+        writer.add([_event(3)])
+        await asyncio.sleep(0.05)
+        assert writer.stats()["buffered"] == 1
+    finally:
+        await writer.stop()
+    assert await _logged_word_ids(db) == [0, 1, 2, 3]
+
+
+@pytest.fixture
+async def logged_events(db: AsyncSession) -> None:
+    """Two users' events over two UTC days, plus one from the day before."""
+    db.add_all(
+        ReviewEvent(**event)
+        for event in [
+            _event(1, at=DAY + timedelta(hours=1), quality=5, response_ms=1200),
+            _event(2, at=DAY + timedelta(hours=23, minutes=59), quality=2, response_ms=800),
+            _event(3, at=DAY + timedelta(hours=3), quality=3),
+            _event(4, at=DAY + timedelta(days=1, hours=1), quality=1),
+            _event(5, user_id=2, at=DAY + timedelta(hours=12), quality=4, response_ms=500),
+            _event(6, at=DAY - timedelta(hours=1)),
+        ]
+    )
+    await db.commit()
+
+
+async def _rollups(db: AsyncSession) -> list[tuple]:
+    result = await db.execute(
+        select(
+            ReviewDailyRollup.user_id,
+            ReviewDailyRollup.day,
+            ReviewDailyRollup.reviews,
+            ReviewDailyRollup.correct,
+            ReviewDailyRollup.quality_sum,
+            ReviewDailyRollup.timed_reviews,
+            ReviewDailyRollup.response_ms_sum,
+        ).order_by(ReviewDailyRollup.user_id, ReviewDailyRollup.day)
+    )
+    return [tuple(row) for row in result.all()]
+
+
+@pytest.mark.usefixtures("logged_events")
+async def test_rollups_are_recomputed_per_user_and_day(db: AsyncSession) -> None:
+    first, second = DAY.date(), DAY.date() + timedelta(days=1)
+    expected = [
+        (1, first, 3, 2, 10, 2, 2000),
+        (1, second, 1, 0, 1, 0, 0),
+        (2, first, 1, 1, 4, 1, 500),
+    ]
+
+    assert await rollup_review_events(db, first, second + timedelta(days=1)) == 3
+    await db.commit()
+    assert await _rollups(db) == expected
+
+    # Rolling the same days up again picks up late events and replaces rows
+    db.add(ReviewEvent(**_event(7, at=DAY + timedelta(hours=5), quality=0)))
+    await db.commit()
+    await rollup_review_events(db, first, second)
+    await db.commit()
+    expected[0] = (1, first, 4, 2, 10, 2, 2000)
+    assert await _rollups(db) == expected
+
+
+@pytest.mark.usefixtures("logged_events")
+async def test_retention_deletes_whole_months(db: AsyncSession) -> None:
+    # One month kept: everything before October goes
+    db.add(ReviewEvent(**_event(8, at=datetime(2026, 9, 30, 23, tzinfo=UTC))))
+    await db.commit()
+
+    dropped, deleted = await apply_review_event_retention(db, date(2026, 11, 2), months=1)
+    await db.commit()
+
+    assert (dropped, deleted) == ([], 1)
+    assert await db.scalar(select(func.count()).select_from(ReviewEvent)) == 6
+
+
+class FakeResult:
+    def __init__(self, rows: list[Any]):
+        self._rows = rows
+        self.rowcount = len(rows)
+
+    def scalars(self) -> "FakeResult":
+        return self
+
+    def all(self) -> list[Any]:
+        return self._rows
+
+    def first(self) -> Any:
+        return self._rows[0] if self._rows else None
+
+
+class RecordingSession:
+    """PostgreSQL stand-in: records statements and answers the catalog queries."""
+
+    def __init__(self, partitions: list[str], stranded_months: set[date]):
+        self.partitions = partitions
+        self.stranded_months = stranded_months
+        self.statements: list[str] = []
+
+    def get_bind(self) -> SimpleNamespace:
+        return SimpleNamespace(dialect=SimpleNamespace(name="postgresql"))
+
+    async def execute(self, statement: Any, params: dict | None = None) -> FakeResult:
+        sql = " ".join(str(statement).split())
+        self.statements.append(sql)
+        if "FROM pg_inherits" in sql:
+            return FakeResult(self.partitions)
+        if "FROM pg_class" in sql:
+            return FakeResult([1] if DEFAULT_PARTITION in self.partitions else [])
+        if sql.startswith(("SELECT 1 FROM", "INSERT INTO")):
+            stranded = params is not None and params["start"].date() in self.stranded_months
+            return FakeResult([1] if stranded else [])
+        return FakeResult([])
+
+
+async def test_partitions_are_created_ahead() -> None:
+    db = RecordingSession(["review_events_p2026_10", DEFAULT_PARTITION], set())
+
+    created = await ensure_review_event_partitions(db, date(2026, 10, 17), months_ahead=2)
+
+    assert created == ["review_events_p2026_11", "review_events_p2026_12"]
+    ddl = [sql for sql in db.statements if sql.startswith(("CREATE", "ALTER"))]
+    assert ddl == [
+        "CREATE TABLE review_events_p2026_11 PARTITION OF review_events "
+        "FOR VALUES FROM ('2026-11-01T00:00:00+00:00') TO ('2026-12-01T00:00:00+00:00')",
+        "CREATE TABLE review_events_p2026_12 PARTITION OF review_events "
+        "FOR VALUES FROM ('2026-12-01T00:00:00+00:00') TO ('2027-01-01T00:00:00+00:00')",
+    ]
+
+
+async def test_events_in_the_default_partition_are_moved() -> None:
+    # Maintenance missed October: its events landed in the default partition
+    db = RecordingSession([DEFAULT_PARTITION], {date(2026, 10, 1)})
+
+    created = await ensure_review_event_partitions(db, date(2026, 10, 17), months_ahead=1)
+
+    assert created == ["review_events_p2026_10", "review_events_p2026_11"]
+    changes = [
+        sql.split(" WHERE ")[0]
+        for sql in db.statements
+        if sql.startswith(("CREATE", "ALTER", "INSERT", "DELETE"))
+    ]
+    assert [sql.split(" FOR VALUES ")[0] for sql in changes] == [
+        f"ALTER TABLE review_events DETACH PARTITION {DEFAULT_PARTITION}",
+        "CREATE TABLE review_events_p2026_10 PARTITION OF review_events",
+        f"INSERT INTO review_events_p2026_10 SELECT * FROM {DEFAULT_PARTITION}",
+        f"DELETE FROM {DEFAULT_PARTITION}",
+        f"ALTER TABLE review_events ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT",
+        # November has no stranded events: created directly
+        "CREATE TABLE review_events_p2026_11 PARTITION OF review_events",
+    ]
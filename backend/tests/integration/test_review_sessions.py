@@ -0,0 +1,64 @@
+"""
+Concurrent answers to one review session are all kept, on both the
+per-process and the shared cache backend.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from src.core.cache import create_cache_backend
+from src.services import review_session
+
+VOCABULARY = "/api/v1/vocabulary"
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def session_backend(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> str:
+    """Run the test against each review-session backend."""
+    backend = create_cache_backend(
+        request.param, max_entries=100, ttl_seconds=600, namespace="test_review_sessions"
+    )
+    monkeypatch.setattr(review_session, "review_sessions", backend)
+    return request.param
+
+
+@pytest.mark.usefixtures("session_backend")
+async def test_concurrent_answers_are_all_recorded(
+    client: httpx.AsyncClient, auth_headers: dict[str, str]
+) -> None:
+    response = await client.post(
+        f"{VOCABULARY}/my-words/bulk", json={"cefr_level": "A1"}, headers=auth_headers
+    )
+    assert response.status_code == 200, response.text
+    response = await client.post(
+        f"{VOCABULARY}/review-sessions", json={"new_limit": 20}, headers=auth_headers
+    )
+    assert response.status_code == 200, response.text
+    session = response.json()
+    card_ids = [card["user_word_id"] for card in session["cards"]]
+
+    answers = f"{VOCABULARY}/review-sessions/{session['session_id']}/answers"
+    responses = await asyncio.gather(
+        *(
+            client.post(answers, json={"user_word_id": card_id, "quality": 4}, headers=auth_headers)
+            for card_id in card_ids
+        )
+    )
+    assert [response.status_code for response in responses] == [200] * len(card_ids)
+    assert sorted(response.json()["answered"] for response in responses) == list(
+        range(1, len(card_ids) + 1)
+    )
+
+    response = await client.post(
+        f"{VOCABULARY}/review-sessions/{session['session_id']}/end", headers=auth_headers
+    )
+    assert response.status_code == 200, response.text
+    assert len(response.json()) == len(card_ids)
+
+    # Ended sessions take no more answers
+    response = await client.post(
+        answers, json={"user_word_id": card_ids[0], "quality": 4}, headers=auth_headers
+    )
+    assert response.status_code == 404
@@ -0,0 +1,52 @@
+"""
+Dictionary search: diacritic folding and exact > prefix > substring ranking.
+"""
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.word import Word
+from src.services.vocabulary import get_words
+
+# (swedish, english, frequency_rank): the rank decides ties within a match quality
+SEARCH_WORDS = [
+    ("halsband", "necklace", 101),
+    ("hälsa", "health", 102),
+    ("påhälsning", "visit", 103),
+    ("hals", "neck", 104),
+    ("nacke", "hals", 105),
+    ("öl", "beer", 106),
+]
+
+
+@pytest.fixture
+async def search_words(db: AsyncSession) -> None:
+    db.add_all(
+        Word(swedish=swedish, english=english, cefr_level="B1", frequency_rank=rank)
+        for swedish, english, rank in SEARCH_WORDS
+    )
+    await db.commit()
+
+
+async def _search(db: AsyncSession, search: str) -> list[str]:
+    return [word.swedish for word in await get_words(db, search=search)]
+
+
+@pytest.mark.usefixtures("search_words")
+async def test_matches_are_ranked_exact_then_prefix_then_substring(db: AsyncSession) -> None:
+    assert await _search(db, "hals") == [
+        "hals",  # Exact Swedish
+        "nacke",  # Exact English
+        "halsband",  # Swedish prefixes, by frequency rank
+        "hälsa",
+        "påhälsning",  # Substring
+    ]
+
+
+@pytest.mark.usefixtures("search_words")
+async def test_diacritics_and_case_are_folded(db: AsyncSession) -> None:
+    assert await _search(db, "HÄLSA") == ["hälsa"]
+    assert await _search(db, "ol") == ["öl"]
+    assert await _search(db, "  Öl ") == ["öl"]
+    # LIKE wildcards in the search are literal
+    assert await _search(db, "h%a") == []
@@ -0,0 +1,47 @@
+"""
+calculate_sm2_batch against the scalar calculate_sm2 it vectorizes.
+"""
+
+import itertools
+from datetime import UTC, datetime
+
+import numpy as np
+
+from src.services.srs import _round_ease_factor, calculate_sm2, calculate_sm2_batch
+
+REVIEWED_AT = datetime(2026, 10, 17, 8, 30, tzinfo=UTC)
+# Out-of-range qualities are clamped by both
+QUALITIES = range(-1, 7)
+# Steps of 0.005 put many new ease factors on a .xx5 rounding tie
+EASE_FACTORS = [round(1.3 + step * 0.005, 3) for step in range(341)]
+INTERVALS = [0, 1, 2, 6, 15, 365]
+REPETITIONS = range(7)
+
+
+def test_batch_matches_scalar_over_a_grid() -> None:
+    grid = list(itertools.product(QUALITIES, EASE_FACTORS, INTERVALS, REPETITIONS))
+    quality, ease_factor, interval_days, repetition_number = (
+        np.array(column) for column in zip(*grid, strict=True)
+    )
+
+    batch = calculate_sm2_batch(
+        quality, ease_factor, interval_days, repetition_number, reviewed_at=REVIEWED_AT
+    )
+
+    expected = [
+        calculate_sm2(q, ef, interval, repetition, reviewed_at=REVIEWED_AT)
+        for q, ef, interval, repetition in grid
+    ]
+    assert batch.ease_factor.tolist() == [result.ease_factor for result in expected]
+    assert batch.interval_days.tolist() == [result.interval_days for result in expected]
+    assert batch.repetition_number.tolist() == [result.repetition_number for result in expected]
+    assert batch.status.tolist() == [result.status for result in expected]
+    assert batch.next_review.tolist() == [
+        result.next_review.replace(tzinfo=None) for result in expected
+    ]
+
+
+def test_ease_factor_rounding_follows_python_on_ties() -> None:
+    # Binary floats just below or above the decimal tie
+    values = np.array([2.675, 1.005, 2.345, 1.455, 2.5, 1.3, 2.3549999, 2.3550001])
+    assert _round_ease_factor(values).tolist() == [round(value, 2) for value in values.tolist()]
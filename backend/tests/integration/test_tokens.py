@@ -0,0 +1,95 @@
+"""
+JWT decoding: the native HMAC path against python-jose, and the verified
+token cache.
+"""
+
+import base64
+import json
+import time
+from collections.abc import Callable, Iterator
+from datetime import timedelta
+
+import pytest
+from jose import jwt
+
+from src.core import security
+from src.core.security import create_access_token, decode_token, get_jwt_decoder
+
+SECRET = security.settings.jwt_secret_key
+
+
+def _b64(data: dict) -> str:
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).rstrip(b"=").decode()
+
+
+def _tokens() -> dict[str, str]:
+    now = int(time.time())
+    valid = jwt.encode({"sub": "1", "exp": now + 600}, SECRET, algorithm="HS256")
+    header, payload, signature = valid.split(".")
+    return {
+        "valid": valid,
+        "expired": jwt.encode({"sub": "1", "exp": now - 1}, SECRET, algorithm="HS256"),
+        "not yet valid": jwt.encode({"sub": "1", "nbf": now + 600}, SECRET, algorithm="HS256"),
+        "other key": jwt.encode({"sub": "1"}, "another secret", algorithm="HS256"),
+        "other algorithm": jwt.encode({"sub": "1"}, SECRET, algorithm="HS512"),
+        "tampered": f"{header}.{_b64({'sub': '2', 'exp': now + 600})}.{signature}",
+        "unsigned": f"{_b64({'alg': 'none', 'typ': 'JWT'})}.{payload}.",
+        "garbage": "not.a.token",
+    }
+
+
+def test_native_decoder_agrees_with_jose() -> None:
+    jose_decode = get_jwt_decoder("jose")
+    native_decode = get_jwt_decoder("native")
+    for name, token in _tokens().items():
+        expected = jose_decode(token)
+        assert native_decode(token) == expected, name
+        assert (expected is not None) == (name == "valid"), name
+
+
+@pytest.fixture
+def decode_calls(monkeypatch: pytest.MonkeyPatch) -> Iterator[list[str]]:
+    """Tokens that reached the uncached decoder."""
+    calls: list[str] = []
+    uncached: Callable[[str], dict | None] = security._decode_jwt
+
+    def counting_decode(token: str) -> dict | None:
+        calls.append(token)
+        return uncached(token)
+
+    monkeypatch.setattr(security, "_decode_jwt", counting_decode)
+    security.verified_token_cache.clear()
+    yield calls
+    security.verified_token_cache.clear()
+
+
+def test_verified_tokens_are_cached_until_they_expire(decode_calls: list[str]) -> None:
+    token = create_access_token({"sub": "7"})
+    first = decode_token(token)
+    assert first is not None
+    first["sub"] = "changed by the caller"
+
+    second = decode_token(token)
+
+    assert second is not None and second["sub"] == "7"
+    assert decode_calls == [token]
+    # Expiry is the token's own, so a short-lived token drops out of the cache
+    short = create_access_token({"sub": "7"}, expires_delta=timedelta(seconds=1))
+    assert decode_token(short) is not None
+    # python-jose compares exp with whole seconds
+    time.sleep(2.1)
+    assert decode_token(short) is None
+    assert decode_calls == [token, short, short]
+
+
+def test_cached_signature_does_not_vouch_for_another_payload(decode_calls: list[str]) -> None:
+    token = create_access_token({"sub": "7"})
+    assert decode_token(token) is not None
+    header, _, signature = token.split(".")
+    forged = f"{header}.{_b64({'sub': '1', 'type': 'access'})}.{signature}"
+
+    assert decode_token(forged) is None
+    assert decode_calls == [token, forged]
+    # Failed tokens are not cached either
+    assert decode_token(forged) is None
+    assert len(decode_calls) == 3
@@ -0,0 +1,70 @@
+"""
+The authenticated-user cache, on the per-process and the shared backend.
+"""
+
+import uuid
+from collections.abc import Iterator
+from datetime import datetime
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.cache import CacheBackend, create_cache_backend
+from src.db.session import wait_after_commit_actions
+from src.models.user import User
+from src.schemas.user import UserUpdate
+from src.services import auth
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def user_cache(
+    request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch
+) -> Iterator[CacheBackend]:
+    backend = create_cache_backend(
+        request.param, max_entries=100, ttl_seconds=60, namespace=f"users-{uuid.uuid4().hex}"
+    )
+    monkeypatch.setattr(auth, "user_cache", backend)
+    yield backend
+
+
+@pytest.fixture
+async def user(db: AsyncSession) -> User:
+    user = User(email="cached@example.com", hashed_password="not-a-real-hash", display_name="Cache")
+    db.add(user)
+    await db.commit()
+    await db.refresh(user)
+    return user
+
+
+async def test_hit_rebuilds_the_user(
+    db: AsyncSession, user_cache: CacheBackend, user: User
+) -> None:
+    loaded = await auth.get_cached_user(db, str(user.id))
+    cached = await auth.get_cached_user(db, str(user.id))
+
+    assert user_cache.stats().hits == 1
+    assert loaded is not None and cached is not None
+    for column in auth.USER_CACHE_COLUMNS:
+        assert getattr(cached, column) == getattr(loaded, column), column
+    assert isinstance(cached.created_at, datetime)
+    assert isinstance(cached.updated_at, datetime)
+    # The password hash never goes into the cache
+    assert "hashed_password" not in cached.__dict__
+
+
+async def test_update_invalidates_after_commit(
+    db: AsyncSession, user_cache: CacheBackend, user: User
+) -> None:
+    key = f"user:{user.id}"
+    cached = await auth.get_cached_user(db, str(user.id))
+    assert cached is not None
+
+    await auth.update_user(db, cached, UserUpdate(display_name="Renamed"))
+    # Not before the change is visible to other sessions
+    assert await user_cache.get(key) is not None
+
+    await db.commit()
+    await wait_after_commit_actions(db)
+    assert await user_cache.get(key) is None
+    reloaded = await auth.get_cached_user(db, str(user.id))
+    assert reloaded is not None and reloaded.display_name == "Renamed"
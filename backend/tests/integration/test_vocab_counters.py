@@ -0,0 +1,103 @@
+"""
+The per-user vocabulary counters stay equal to a live count of user_words
+through every endpoint that adds, removes or reviews words.
+"""
+
+from datetime import UTC, datetime, timedelta
+
+import httpx
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.services.vocab_counters import find_counter_mismatches
+
+VOCABULARY = "/api/v1/vocabulary"
+
+
+async def add_word(client: httpx.AsyncClient, headers: dict[str, str], word_id: int) -> dict:
+    response = await client.post(
+        f"{VOCABULARY}/my-words", json={"word_id": word_id}, headers=headers
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+async def stats(client: httpx.AsyncClient, headers: dict[str, str]) -> dict:
+    response = await client.get(f"{VOCABULARY}/stats", headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+async def test_counters_match_user_words(
+    client: httpx.AsyncClient, auth_headers: dict[str, str], db: AsyncSession
+) -> None:
+    # Single adds
+    added = [await add_word(client, auth_headers, word_id) for word_id in (1, 2, 3, 4)]
+    assert await find_counter_mismatches(db) == []
+    assert (await stats(client, auth_headers))["total_words"] == 4
+
+    # Remove one
+    response = await client.delete(f"{VOCABULARY}/my-words/{added[3]['id']}", headers=auth_headers)
+    assert response.status_code == 200, response.text
+    assert await find_counter_mismatches(db) == []
+
+    # Single reviews move words between statuses
+    for quality in (5, 5, 5):
+        response = await client.post(
+            f"{VOCABULARY}/review/{added[0]['id']}", json={"quality": quality}, headers=auth_headers
+        )
+        assert response.status_code == 200, response.text
+    response = await client.post(
+        f"{VOCABULARY}/review/{added[1]['id']}", json={"quality": 1}, headers=auth_headers
+    )
+    assert response.status_code == 200, response.text
+    assert await find_counter_mismatches(db) == []
+
+    # A batch, including repeated answers for the same card
+    started = datetime.now(UTC) - timedelta(minutes=5)
+    reviews = [
+        {"user_word_id": added[2]["id"], "quality": 4, "answered_at": started.isoformat()},
+        {
+            "user_word_id": added[2]["id"],
+            "quality": 5,
+            "answered_at": (started + timedelta(minutes=1)).isoformat(),
+        },
+        {
+            "user_word_id": added[1]["id"],
+            "quality": 5,
+            "answered_at": (started + timedelta(minutes=2)).isoformat(),
+        },
+    ]
+    response = await client.post(
+        f"{VOCABULARY}/review/batch", json={"reviews": reviews}, headers=auth_headers
+    )
+    assert response.status_code == 200, response.text
+    assert await find_counter_mismatches(db) == []
+
+    # Bulk add by filter skips words already in the vocabulary
+    response = await client.post(
+        f"{VOCABULARY}/my-words/bulk", json={"cefr_level": "A1"}, headers=auth_headers
+    )
+    assert response.status_code == 200, response.text
+    assert await find_counter_mismatches(db) == []
+
+    totals = await stats(client, auth_headers)
+    by_status = sum(totals[status] for status in ("new", "learning", "familiar", "mastered"))
+    assert totals["total_words"] == 3 + response.json()["added"] == by_status
+
+
+async def test_counters_are_per_user(
+    client: httpx.AsyncClient, auth_headers: dict[str, str], db: AsyncSession
+) -> None:
+    response = await client.post(
+        "/api/v1/auth/register", json={"email": "other@example.com", "password": "otherpassword1"}
+    )
+    assert response.status_code == 200, response.text
+    other_headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    await add_word(client, auth_headers, 1)
+    await add_word(client, other_headers, 1)
+    await add_word(client, other_headers, 2)
+
+    assert await find_counter_mismatches(db) == []
+    assert (await stats(client, auth_headers))["total_words"] == 1
+    assert (await stats(client, other_headers))["total_words"] == 2